@@ -0,0 +1 @@
+"""Headless benchmarks for SwiftClip hot paths."""
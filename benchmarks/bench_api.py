@@ -0,0 +1,75 @@
+"""
+Measure the public API: frames() pacing and encode_batch() scaling.
+
+Drives core.api against a warm CaptureSession over the fake grabber and
+encodes the same frames with one worker and with a pool. First checks
+that frames() stops once captures keep failing.
+
+Usage:
+    python -m benchmarks.bench_api [--count N] [--format png]
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.corpus import CONTENT_TYPES
+from benchmarks.fakes import FakeGrabber, desktop_from_image
+from core import api
+from core.screenshot_capture import CaptureSession
+
+
+class FailingSession:
+    """Capture session whose every grab fails, like one that was closed."""
+
+    def __init__(self):
+        self.grabs = 0
+
+    def grab_frame(self, *region) -> None:
+        self.grabs += 1
+        return None
+
+
+def verify() -> None:
+    """Check frames() gives up on repeated capture failures."""
+    session = FailingSession()
+    frames = list(api.frames((0, 0, 10, 10), fps=1000, session=session, max_failures=3))
+    assert frames == [] and session.grabs == 3
+    print("frames() stops after max_failures failed captures in a row")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=16)
+    parser.add_argument("--fps", type=float, default=20.0)
+    parser.add_argument("--format", choices=api.FORMATS, default="png")
+    args = parser.parse_args()
+
+    verify()
+    width, height = 1920, 1080
+    desktop = desktop_from_image(CONTENT_TYPES["mixed"](width, height))
+    session = CaptureSession(
+        grabber_factory=lambda: FakeGrabber(width, height, desktop=desktop),
+        display_signature=lambda: None
+    )
+    region = (0, 0, 1280, 720)
+
+    start = time.perf_counter()
+    frames = list(api.frames(region, fps=args.fps, count=args.count, session=session))
+    elapsed = time.perf_counter() - start
+    print(f"frames()          {len(frames)} in {elapsed:.2f} s "
+          f"({len(frames) / elapsed:.1f} fps, target {args.fps:g})")
+
+    workers = os.cpu_count() or 2
+    for count in sorted({1, workers}):
+        start = time.perf_counter()
+        total = sum(len(e.data) for e in api.encode_batch(frames, args.format, workers=count))
+        elapsed = time.perf_counter() - start
+        print(f"encode_batch x{count:<3} {len(frames) / elapsed:7.1f} frames/s  ({total} bytes)")
+
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
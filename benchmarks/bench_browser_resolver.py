@@ -0,0 +1,169 @@
+"""
+Verify browser resolution and its cache with a fake file system.
+
+Runs BrowserResolver against an in-memory file system and a recording
+launcher, so it needs no browser and works on any platform. Checks the
+first-run probe, the cache hit on the next run, the fallbacks when the
+cache is stale (a browser updated, removed or failing to start, or a
+corrupt cache file) and the default-browser path when nothing is
+installed, and that the per-user install is skipped without LOCALAPPDATA.
+Then times a probe against a cache hit on the real file system.
+
+Usage:
+    python -m benchmarks.bench_browser_resolver [--repeat N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.browser_resolver import (
+    DEFAULT_BROWSER,
+    BrowserResolver,
+    FileSystem,
+    LaunchCandidate,
+    Launcher,
+    _chrome_paths,
+)
+
+
+CHROME = "C:/Program Files/Google/Chrome/Application/chrome.exe"
+CHROME_X86 = "C:/Program Files (x86)/Google/Chrome/Application/chrome.exe"
+CACHE = "C:/Users/me/AppData/Local/SwiftClip/browsers.json"
+URL = "https://lens.google.com/"
+
+
+class FakeFileSystem(FileSystem):
+    """In-memory files with modification times and a fake PATH."""
+
+    def __init__(self, files: Dict[str, float], path: Optional[Dict[str, str]] = None):
+        self.mtimes = dict(files)
+        self.path = dict(path or {})
+        self.texts: Dict[str, str] = {}
+        self.which_calls = 0
+        self.writes = 0
+
+    def getmtime(self, path: str) -> Optional[float]:
+        return self.mtimes.get(path)
+
+    def which(self, command: str) -> Optional[str]:
+        self.which_calls += 1
+        return self.path.get(command)
+
+    def read_text(self, path: str) -> Optional[str]:
+        return self.texts.get(path)
+
+    def write_text(self, path: str, text: str) -> None:
+        self.writes += 1
+        self.texts[path] = text
+
+
+class FakeLauncher(Launcher):
+    """Records launches; executables in `broken` fail to start."""
+
+    def __init__(self, broken: Tuple[str, ...] = ()):
+        self.broken = broken
+        self.launched: List[str] = []
+
+    def spawn(self, executable: str, url: str) -> None:
+        if executable in self.broken:
+            raise FileNotFoundError(executable)
+        self.launched.append(executable)
+
+    def open_default(self, url: str) -> None:
+        self.launched.append("default")
+
+
+def resolver(fs: FakeFileSystem, launcher: Optional[FakeLauncher] = None) -> BrowserResolver:
+    """A resolver probing the fake file system, as a new app run would."""
+    return BrowserResolver(
+        cache_path=CACHE, paths=[CHROME, CHROME_X86], commands=["chrome"],
+        fs=fs, launcher=launcher or FakeLauncher()
+    )
+
+
+def verify() -> None:
+    """Check probing, cache hits, stale-cache fallbacks and no browser."""
+    fs = FakeFileSystem({CHROME: 100.0}, {"chrome": "C:/tools/chrome.exe"})
+    first = resolver(fs).candidates()
+    assert first == [
+        LaunchCandidate("exe", CHROME),
+        LaunchCandidate("exe", "C:/tools/chrome.exe"),
+        DEFAULT_BROWSER,
+    ], first
+    assert fs.writes == 1 and fs.which_calls == 1
+    print("First run probes installs and PATH and writes the cache")
+
+    assert resolver(fs).candidates() == first
+    assert fs.writes == 1 and fs.which_calls == 1
+    print("Next run uses the cache without probing PATH")
+
+    fs.mtimes[CHROME] = 200.0  # Browser updated
+    assert resolver(fs).candidates() == first
+    assert fs.writes == 2 and fs.which_calls == 2
+    print("An updated browser makes the cache stale and re-probes")
+
+    del fs.mtimes[CHROME]  # Browser uninstalled
+    fs.mtimes[CHROME_X86] = 300.0
+    assert resolver(fs).candidates()[0] == LaunchCandidate("exe", CHROME_X86)
+    print("A removed browser makes the cache stale and re-probes")
+
+    # A cached browser that no longer starts: launch falls back to the next
+    launcher = FakeLauncher(broken=(CHROME_X86,))
+    stale = resolver(fs, launcher)
+    assert stale.launch(URL)
+    assert launcher.launched == ["C:/tools/chrome.exe"]
+    print("A cached browser failing to start falls back to the next one")
+
+    fs.texts[CACHE] = "{not json"
+    assert resolver(fs).candidates()[0] == LaunchCandidate("exe", CHROME_X86)
+    print("A corrupt cache file is replaced by a fresh probe")
+
+    empty = FakeFileSystem({})
+    launcher = FakeLauncher()
+    nothing = resolver(empty, launcher)
+    assert nothing.candidates() == [DEFAULT_BROWSER]
+    assert nothing.launch(URL) and launcher.launched == ["default"]
+    print("Without any browser the default browser is used")
+
+    assert _chrome_paths({}) == [CHROME, CHROME_X86]
+    assert _chrome_paths({"LOCALAPPDATA": ""}) == [CHROME, CHROME_X86]
+    local = _chrome_paths({"LOCALAPPDATA": "C:/Users/me/AppData/Local"})
+    assert local[2].startswith("C:/Users/me/AppData/Local"), local
+    print("The per-user install is probed only when LOCALAPPDATA is set")
+
+
+def bench(repeat: int) -> None:
+    """Time a probe and a cache hit on the real file system."""
+    directory = tempfile.mkdtemp()
+    cache_path = os.path.join(directory, "browsers.json")
+    paths = [os.path.join(directory, f"missing{index}.exe") for index in range(3)]
+
+    def resolve() -> float:
+        start = time.perf_counter()
+        BrowserResolver(cache_path=cache_path, paths=paths).candidates()
+        return (time.perf_counter() - start) * 1000
+
+    probe = []
+    for _ in range(repeat):
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        probe.append(resolve())
+    hit = [resolve() for _ in range(repeat)]
+    print(f"probe {min(probe):.3f} ms, cache hit {min(hit):.3f} ms")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare per-capture latency of a persistent CaptureSession against the
+open-per-call path that creates a new grabber for every capture.
+
+Usage:
+    python -m benchmarks.bench_capture_session [--iterations N]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from benchmarks.fakes import FakeGrabber, synthetic_desktop
+from core.screenshot_capture import CaptureSession, _grab_image, _normalize_region
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    """Time each call of fn in milliseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(name: str, samples: List[float]) -> None:
+    """Print a one-line latency summary."""
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<16} mean {statistics.mean(samples):7.3f} ms  "
+        f"p50 {statistics.median(samples):7.3f} ms  p95 {p95:7.3f} ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--open-delay", type=float, default=0.002,
+        help="simulated grabber setup cost in seconds"
+    )
+    parser.add_argument("--region", type=int, default=400,
+                        help="side of the square capture region")
+    args = parser.parse_args()
+
+    desktop = synthetic_desktop(1920, 1080)
+
+    def factory() -> FakeGrabber:
+        return FakeGrabber(open_delay=args.open_delay, desktop=desktop)
+
+    region = (100, 100, 100 + args.region, 100 + args.region)
+
+    def open_per_call() -> object:
+        with factory() as sct:
+            return _grab_image(sct, _normalize_region(*region))
+
+    session = CaptureSession(grabber_factory=factory, display_signature=lambda: None)
+    session.capture_region(*region)  # Warm up
+
+    _report("open-per-call", _measure(open_per_call, args.iterations))
+    _report("session", _measure(lambda: session.capture_region(*region), args.iterations))
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
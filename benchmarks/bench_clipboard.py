@@ -0,0 +1,128 @@
+"""
+Verify lazy multi-format clipboard publishing and time each format.
+
+Publishes frames to the in-memory clipboard, checks that nothing is
+rendered until a format is pasted, that every format decodes to the
+captured pixels and that repeated pastes come from the cache.
+
+Usage:
+    python -m benchmarks.bench_clipboard [--iterations N]
+"""
+
+import argparse
+import random
+import struct
+import time
+from io import BytesIO
+
+from PIL import Image
+
+from core.frame import Frame
+from utils.clipboard import (
+    CF_DIB,
+    CF_DIBV5,
+    PNG_FORMAT_NAME,
+    MemoryClipboardBackend,
+    copy_frame_to_clipboard,
+    copy_image_to_clipboard,
+)
+
+
+SIZES = [(1, 1), (33, 17), (640, 480), (1920, 1080), (3840, 2160)]
+
+
+def random_frame(width: int, height: int) -> Frame:
+    """Build a frame of random pixels that is a view into a larger buffer."""
+    stride = width * 4 + 16
+    size = stride * (height + 2)
+    buffer = bytearray(random.getrandbits(8) for _ in range(min(size, 1 << 16)))
+    buffer = (buffer * (size // len(buffer) + 1))[:size]
+    return Frame(buffer, 0, 0, width, height, stride, offset=stride)
+
+
+def decode(fmt: int, data: bytes) -> Image.Image:
+    """Decode clipboard data the way a pasting program would."""
+    if fmt in (CF_DIB, CF_DIBV5):
+        # Prepend a BITMAPFILEHEADER so PIL reads the DIB as a BMP file
+        # (both DIBs have their pixels right after the header)
+        offset = 14 + int.from_bytes(data[:4], "little")
+        data = b"BM" + struct.pack("<IHHI", 14 + len(data), 0, 0, offset) + data
+    return Image.open(BytesIO(data))
+
+
+def verify() -> None:
+    """Check rendering on demand, caching and the content of every format."""
+    backend = MemoryClipboardBackend()
+    png = backend.register_format(PNG_FORMAT_NAME)
+    assert backend.register_format(PNG_FORMAT_NAME) == png
+
+    for width, height in SIZES[:3]:
+        frame = random_frame(width, height)
+        expected = frame.to_image()
+
+        renders = []
+        assert copy_frame_to_clipboard(frame, backend, on_render=lambda f, d: renders.append(f))
+        assert backend.available() == [CF_DIB, CF_DIBV5, png]
+        assert backend.content.render_count == 0, "publishing must not render"
+
+        for fmt in (CF_DIB, CF_DIBV5, png):
+            data = backend.get(fmt)
+            assert backend.get(fmt) is data, "repeated pastes must be cached"
+            image = decode(fmt, data)
+            assert image.size == (width, height)
+            assert image.convert("RGB").tobytes() == expected.tobytes()
+        assert renders == [CF_DIB, CF_DIBV5, png]
+
+        rgba = expected.convert("RGBA")
+        rgba.putalpha(128)
+        assert copy_image_to_clipboard(rgba, backend)
+        assert decode(CF_DIBV5, backend.get(CF_DIBV5)).getpixel((0, 0))[3] == 128
+        assert decode(png, backend.get(png)).getpixel((0, 0))[3] == 128
+
+    dib = copy_frame_to_clipboard(frame, backend) and backend.get(CF_DIB)
+    assert copy_frame_to_clipboard(frame, backend, dib=dib)
+    assert backend.get(CF_DIB) is dib and backend.content.render_count == 0
+
+    other = random_frame(frame.width + 1, frame.height)
+    assert copy_frame_to_clipboard(other, backend, dib=dib)
+    assert decode(CF_DIB, backend.get(CF_DIB)).size == other.size
+    print("CF_DIB, CF_DIBV5 and PNG render on demand, once, with the captured pixels")
+
+
+def bench(iterations: int) -> None:
+    """Time publishing against rendering each format."""
+    backend = MemoryClipboardBackend()
+    png = backend.register_format(PNG_FORMAT_NAME)
+    for width, height in SIZES[3:]:
+        frame = random_frame(width, height)
+        timings = {"publish": 0.0, "CF_DIB": 0.0, "CF_DIBV5": 0.0, "PNG": 0.0, "repaste": 0.0}
+
+        for _ in range(iterations):
+            start = time.perf_counter()
+            copy_frame_to_clipboard(frame, backend)
+            timings["publish"] += time.perf_counter() - start
+            for name, fmt in (("CF_DIB", CF_DIB), ("CF_DIBV5", CF_DIBV5), ("PNG", png)):
+                start = time.perf_counter()
+                backend.get(fmt)
+                timings[name] += time.perf_counter() - start
+            start = time.perf_counter()
+            backend.get(CF_DIB)
+            timings["repaste"] += time.perf_counter() - start
+
+        print(f"{width}x{height:<6}" + "".join(
+            f" {name} {total * 1000 / iterations:8.2f} ms" for name, total in timings.items()
+        ))
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Verify the dedup cache and measure key and lookup time.
+
+Checks that identical captures hit and a one-pixel change misses, the
+hit and miss counters, LRU and byte-budget eviction, and attaching a
+payload to a key that was never stored. Then times key() on contiguous
+frames and strided views and lookup() on a full cache.
+
+Usage:
+    python -m benchmarks.bench_dedup [--repeat N]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import ui_screen
+from benchmarks.fakes import desktop_from_image
+from core.dedup_cache import DedupCache
+from core.frame import Frame
+
+
+def capture(width: int = 320, height: int = 200) -> Frame:
+    """A synthetic capture in a buffer of its own."""
+    return Frame(desktop_from_image(ui_screen(width, height)), 0, 0, width, height)
+
+
+def verify() -> None:
+    """Check hits, misses, counters, eviction and add_payload."""
+    cache = DedupCache(max_entries=3, max_bytes=1000)
+    first, again = capture(), capture()
+    assert first.buffer is not again.buffer
+
+    key = cache.key(first)
+    assert cache.lookup(key) is None
+    cache.add_payload(key, "dib", b"x" * 100)  # Never stored before
+    assert cache.lookup(cache.key(again)) == {"dib": b"x" * 100}
+    print("An identical capture hits, add_payload caches a new key")
+
+    changed = bytearray(again.buffer)
+    changed[(100 * again.width + 50) * 4] ^= 1
+    changed = Frame(changed, 0, 0, again.width, again.height)
+    assert cache.lookup(cache.key(changed)) is None
+    view = Frame(desktop_from_image(ui_screen(340, 200)), 0, 0, 340, 200).crop(0, 0, 320, 200)
+    copy = Frame(view.tobytes(), 0, 0, view.width, view.height)
+    assert cache.key(view) == cache.key(copy)
+    print("A one-pixel change misses, a strided view keys like its copy")
+
+    assert (cache.hits, cache.misses) == (1, 2), (cache.hits, cache.misses)
+    assert cache.stats["hit_rate"] == 1 / 3
+    print("Hits and misses are counted")
+
+    for index in range(3):
+        cache.store((1, 1, index), {"dib": b"y" * 100})
+    assert len(cache) == 3 and cache.lookup(key) is None  # Least recent dropped
+    cache.lookup((1, 1, 0))
+    cache.store((1, 1, 3), {"dib": b"y" * 100})
+    assert cache.lookup((1, 1, 0)) is not None and cache.lookup((1, 1, 1)) is None
+    print("The least recently used entry is evicted beyond max_entries")
+
+    cache.add_payload((1, 1, 3), "upload", b"z" * 800)
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.lookup((1, 1, 3)) is not None and len(cache) == 2
+    cache.store((2, 2, 0), {"dib": b"w" * 5000})
+    assert len(cache) == 1 and cache.total_bytes == 5000  # The newest is kept
+    cache.add_payload((2, 2, 0), "dib", b"w" * 10)
+    assert cache.total_bytes == 10
+    print("Byte-budget eviction keeps the running total in step")
+
+
+def bench(repeat: int) -> None:
+    """Time key() and lookup()."""
+    for width, height in ((1920, 1080), (3840, 2160)):
+        frame = capture(width, height)
+        wide = Frame(desktop_from_image(ui_screen(width + 64, height)), 0, 0, width + 64, height)
+        view = wide.crop(0, 0, width, height)
+        cache = DedupCache()
+        for label, source in (("contiguous", frame), ("view", view)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                cache.key(source)
+            elapsed = (time.perf_counter() - start) * 1000 / repeat
+            print(f"key {width}x{height} {label:<10} {elapsed:7.2f} ms")
+
+    cache = DedupCache(max_entries=16)
+    for index in range(16):
+        cache.store((1920, 1080, index), {"dib": b""})
+    start = time.perf_counter()
+    for index in range(10000):
+        cache.lookup((1920, 1080, index % 32))
+    print(f"lookup, 16 entries  {(time.perf_counter() - start) * 100:.3f} us")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Report encode time and output size of each encoding strategy over a
+corpus of synthetic screens.
+
+Usage:
+    python -m benchmarks.bench_encoder [--size WxH] [--iterations N]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import CONTENT_TYPES
+from core.encoder import classify_content, encode_image
+
+
+STRATEGIES = ["png", "png-palette", "jpeg", "webp", "auto"]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="1280x800")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--max-pixels", type=int, default=0)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+
+    print(f"{'content':<8} {'class':<6} {'strategy':<12} {'ms':>8} {'bytes':>10}")
+    for name, make in CONTENT_TYPES.items():
+        image = make(width, height)
+        content = classify_content(image)
+
+        for strategy in STRATEGIES:
+            start = time.perf_counter()
+            for _ in range(args.iterations):
+                encoded = encode_image(image, strategy, max_pixels=args.max_pixels)
+            elapsed = (time.perf_counter() - start) * 1000 / args.iterations
+
+            label = strategy if strategy != "auto" else f"auto:{encoded.format.lower()}"
+            print(
+                f"{name:<8} {content:<6} {label:<12} "
+                f"{elapsed:8.2f} {len(encoded.data):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
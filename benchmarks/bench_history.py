@@ -0,0 +1,80 @@
+"""
+Fill the capture history with many captures and check that the memory it
+holds never exceeds its byte budget.
+
+The traced peak of all Python allocations is checked too. Above the
+budget it may only hold transient frames, each at most the largest
+capture: the caller's frame, the compact copy add() makes before older
+entries are evicted, the frame the compressor is encoding (which may have
+been evicted meanwhile) and the encoder's working buffers, at most an
+RGB copy of it (three quarters of a frame) for formats other than PNG.
+
+Usage:
+    python -m benchmarks.bench_history [--budget-mb N] [--captures N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from core.capture_history import CaptureHistory
+from core.frame import Frame
+from core.png_writer import encode_png
+
+
+# Largest captures held next to the budget at any time, see above
+TRANSIENT_FRAMES = 3.75
+
+
+def main() -> None:
+    """Run the check."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-mb", type=float, default=8.0)
+    parser.add_argument("--captures", type=int, default=200)
+    parser.add_argument("--format", default="PNG")
+    args = parser.parse_args()
+
+    budget = int(args.budget_mb * 1024 * 1024)
+    rng = random.Random(0)
+
+    # Load the encoder (and NumPy) first, so imports are not traced
+    encode_png(Frame(bytearray(64 * 64 * 4), 0, 0, 64, 64))
+
+    tracemalloc.start()
+    history = CaptureHistory(budget, format=args.format)
+
+    start = time.perf_counter()
+    stored = 0
+    largest = 0
+    for _ in range(args.captures):
+        width, height = rng.randint(50, 1200), rng.randint(50, 900)
+        # Noisy rows so compression cannot collapse the payload
+        row = bytearray(rng.getrandbits(8) for _ in range(width * 4))
+        frame = Frame(row * height, 0, 0, width, height)
+        largest = max(largest, width * height * 4)
+        if history.add(frame) is not None:
+            stored += 1
+        assert history.total_bytes <= budget
+        del frame
+    add_time = time.perf_counter() - start
+
+    history.close()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allowance = int(TRANSIENT_FRAMES * largest)
+    assert history.peak_bytes <= budget, (history.peak_bytes, budget)
+    assert traced_peak <= budget + allowance, (traced_peak, budget, allowance)
+    print(f"captures added    {stored}/{args.captures} in {add_time:.2f} s")
+    print(f"entries kept      {len(history)}")
+    print(f"accounted bytes   {history.total_bytes} (peak {history.peak_bytes}, budget {budget})")
+    print(
+        f"traced peak       {traced_peak} bytes"
+        f" (budget + {(traced_peak - budget) / largest:.2f} of the largest capture,"
+        f" allowed {TRANSIENT_FRAMES:g})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Measure IPC request latency and concurrent throughput over a local socket.
+
+Starts an IpcServer on a temporary Unix socket (a named pipe on Windows)
+serving captures from the fake grabber, then times requests from one
+client and from several clients at once. First checks that the file
+destination only writes image files inside its output directory, in the
+format their extension names, and that a malformed region is refused.
+
+Usage:
+    python -m benchmarks.bench_ipc [--requests N] [--clients N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.fakes import FakeGrabber
+from core.ipc_server import IpcClient, IpcServer, RequestError, capture_handlers
+from core.screenshot_capture import CaptureSession
+
+
+def verify(session: CaptureSession) -> None:
+    """Check the file destination and request validation."""
+    request = {"region": [0, 0, 20, 10], "destination": "file"}
+    refused = capture_handlers(session)["capture"]
+    try:
+        refused(dict(request, path="shot.png"))
+        raise AssertionError("file destination without an output directory")
+    except RequestError:
+        pass
+
+    output_dir = tempfile.mkdtemp()
+    capture = capture_handlers(session, output_dir=output_dir)["capture"]
+    response = capture(dict(request, path="shots/one.png"))
+    assert response["path"] == os.path.join(os.path.realpath(output_dir), "shots", "one.png")
+    assert os.path.getsize(response["path"]) == response["bytes"]
+
+    outside = os.path.join(os.path.dirname(output_dir), "outside.png")
+    for path in ("../outside.png", outside, "shots/../../outside.png", "run.bat", ""):
+        try:
+            capture(dict(request, path=path))
+            raise AssertionError(f"wrote {path!r}")
+        except RequestError:
+            pass
+    assert not os.path.exists(outside)
+    print("file destination writes images only inside its output directory")
+
+    palette = capture(dict(request, path="palette.png", format="png-palette"))
+    assert palette["format"] == "PNG", palette
+    for path, format in (("one.png", "jpeg"), ("one.png", "auto"), ("one.jpg", "webp")):
+        try:
+            capture(dict(request, path=path, format=format))
+            raise AssertionError(f"wrote {format} to {path}")
+        except RequestError:
+            pass
+    print("file destination refuses a format that doesn't match the extension")
+
+    for region in (5, "0,0,20,10", {"x1": 0}, [0, 0, 20], [0, 0, 20.5, 10], None):
+        try:
+            capture({"region": region, "destination": "inline"})
+            if region is not None:
+                raise AssertionError(f"accepted region {region!r}")
+        except RequestError:
+            pass
+    print("A region that is not a list of four ints is refused")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--format", default="png")
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        address = rf"\\.\pipe\SwiftClip-bench-{os.getpid()}"
+    else:
+        address = os.path.join(tempfile.mkdtemp(), "bench.sock")
+
+    session = CaptureSession(lambda: FakeGrabber(1920, 1080), lambda: None)
+    verify(session)
+    server = IpcServer(
+        capture_handlers(session, copy_to_clipboard=lambda frame: True),
+        address=address, workers=args.clients, max_queue=args.clients * 2
+    )
+    assert server.start(), "server did not start"
+
+    with IpcClient(address) as client:
+        for command, params in (
+            ("ping", {}),
+            ("capture", {"region": [0, 0, 200, 100], "format": args.format}),
+            ("capture", {"region": [0, 0, 200, 100], "destination": "clipboard"}),
+        ):
+            samples = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.request(command, **params)
+                samples.append((time.perf_counter() - start) * 1000)
+                assert response["ok"], response
+            label = f"{command} {params.get('destination', '')}".strip()
+            print(f"{label:<20} p50 {statistics.median(samples):7.3f} ms")
+
+    def run_client(results: list) -> None:
+        with IpcClient(address) as client:
+            for _ in range(args.requests // args.clients):
+                results.append(client.request(
+                    "capture", region=[0, 0, 400, 300], format=args.format
+                )["ok"])
+
+    results: list = []
+    threads = [threading.Thread(target=run_client, args=(results,)) for _ in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"{args.clients} clients          {len(results) / elapsed:7.1f} captures/s, "
+          f"{results.count(False)} busy")
+
+    server.stop()
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Verify direct Lens uploads against a local stand-in server.
+
+Serves a Lens-like upload endpoint with http.server on localhost that
+answers every POST with a 303 redirect to a results page, and counts the
+TCP connections it accepts. Checks that prewarm() opens the connection
+the first upload then uses, that later uploads reuse it, that a
+connection the server closed while idle is replaced transparently, and
+that the redirect becomes an absolute results URL. Also times cold and
+warm uploads.
+
+Usage:
+    python -m benchmarks.bench_lens_upload [--uploads N] [--size BYTES]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.lens_upload import LensUploader
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Accepts multipart uploads and redirects to a results page."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        assert self.headers["Content-Type"].startswith("multipart/form-data")
+        assert b'name="encoded_image"' in body
+        with self.server.lock:
+            self.server.uploads += 1
+            upload = self.server.uploads
+
+        if self.path.startswith("/fail"):
+            self.send_response(500)
+        else:
+            self.send_response(303)
+            self.send_header("Location", f"/search?p=results{upload}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep the benchmark output quiet."""
+
+
+def start_server(idle_timeout: float = 5.0) -> ThreadingHTTPServer:
+    """Start the stand-in server on a free localhost port."""
+    handler = type("Handler", (StandInHandler,), {"timeout": idle_timeout})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.uploads = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait until condition() is true."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def wait_warm(uploader: LensUploader) -> None:
+    """Wait until the pre-warmed connection is in the pool."""
+    wait_for(lambda: uploader._idle)
+
+
+def verify() -> None:
+    """Check prewarm, connection reuse, stale connections and redirects."""
+    server = start_server(idle_timeout=0.3)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    uploader = LensUploader(f"{base}/upload")
+
+    uploader.prewarm()
+    wait_warm(uploader)
+    wait_for(lambda: server.connections == 1)
+    print("prewarm opens one connection before the first upload")
+
+    url = uploader.upload(b"\x89PNG fake", "image/png")
+    assert url == f"{base}/search?p=results1", url
+    assert server.connections == 1
+    print("303 redirect becomes the absolute results URL")
+
+    for _ in range(3):
+        assert uploader.upload(b"\x89PNG fake", "image/png") is not None
+    assert server.connections == 1
+    print("Uploads reuse the pooled keep-alive connection")
+
+    time.sleep(0.6)  # The server drops the idle connection
+    assert uploader.upload(b"\x89PNG fake", "image/png") is not None
+    assert server.connections == 2
+    print("A connection closed while idle is replaced transparently")
+
+    failing = LensUploader(f"{base}/fail")
+    assert failing.upload(b"\x89PNG fake", "image/png") is None
+    print("An answer without a redirect gives no results URL")
+
+    uploader.close()
+    failing.close()
+    server.shutdown()
+
+
+def bench(uploads: int, size: int) -> None:
+    """Time uploads on a cold, a pre-warmed and a reused connection."""
+    server = start_server()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/upload"
+    data = bytes(size)
+
+    def timed(uploader: LensUploader) -> float:
+        start = time.perf_counter()
+        assert uploader.upload(data, "image/png") is not None
+        return (time.perf_counter() - start) * 1000
+
+    cold, warm = [], []
+    for _ in range(uploads):
+        uploader = LensUploader(endpoint)
+        cold.append(timed(uploader))
+        uploader.close()
+
+        uploader = LensUploader(endpoint)
+        uploader.prewarm()
+        wait_warm(uploader)
+        warm.append(timed(uploader))
+        uploader.close()
+
+    uploader = LensUploader(endpoint)
+    timed(uploader)
+    reused = [timed(uploader) for _ in range(uploads)]
+    uploader.close()
+    server.shutdown()
+
+    for label, samples in (("cold", cold), ("pre-warmed", warm), ("reused", reused)):
+        print(f"{label:<11} p50 {statistics.median(samples):7.3f} ms")
+    print(f"{server.connections} connections for {server.uploads} uploads")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--size", type=int, default=200 * 1024)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.uploads, args.size)
+
+
+if __name__ == "__main__":
+    main()
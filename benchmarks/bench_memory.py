@@ -0,0 +1,99 @@
+"""
+Check the peak memory of converting one very large capture.
+
+Encodes a full virtual desktop (three 4K monitors side by side by default)
+through the CF_DIB and CF_DIBV5 builders, the streaming PNG writer, the
+lazy clipboard and the public API, and asserts that none of them holds
+more than its output plus a few row bands on top of the capture.
+
+tracemalloc sees Python and NumPy allocations but not PIL's image memory,
+so the PNG paths are checked through the streaming writer, which has no
+PIL image at all.
+
+Usage:
+    python -m benchmarks.bench_memory [--width N] [--height N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from benchmarks.corpus import CONTENT_TYPES
+from benchmarks.fakes import desktop_from_image
+from core import api
+from core.frame import Frame
+from core.png_writer import DEFAULT_BAND_ROWS, encode_png
+from utils.clipboard import PNG_FORMAT_NAME, MemoryClipboardBackend, copy_frame_to_clipboard
+from utils.dib import frame_to_dib, frame_to_dibv5
+
+
+# Row bands of working memory an encoder may hold besides its output
+MAX_BANDS = 16
+
+# Slack for interpreter and zlib bookkeeping, in bytes
+SLACK = 1024 * 1024
+
+
+def measure(convert: Callable[[], bytes]) -> tuple:
+    """Run a conversion, returning its output size, peak bytes and seconds."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    output = convert()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(output), peak, elapsed
+
+
+def main() -> None:
+    """Run the checks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=int, default=3 * 3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--content", choices=sorted(CONTENT_TYPES), default="ui")
+    args = parser.parse_args()
+
+    width, height = args.width, args.height
+    frame = Frame(
+        desktop_from_image(CONTENT_TYPES[args.content](width, height)),
+        0, 0, width, height
+    )
+    frame_bytes = width * height * 4
+    band_bytes = DEFAULT_BAND_ROWS * width * 4
+
+    backend = MemoryClipboardBackend()
+    png = backend.register_format(PNG_FORMAT_NAME)
+
+    def clipboard_png() -> bytes:
+        copy_frame_to_clipboard(frame, backend)
+        return backend.get(png)
+
+    cases = {
+        "frame_to_dib": lambda: frame_to_dib(frame),
+        "frame_to_dibv5": lambda: frame_to_dibv5(frame),
+        "encode_png": lambda: encode_png(frame),
+        "clipboard_png": clipboard_png,
+        "api_encode_png": lambda: api.encode(frame, "png").data,
+    }
+
+    print(f"{width}x{height} {args.content}, frame {frame_bytes / 1e6:.1f} MB")
+    failed = False
+    for name, convert in cases.items():
+        size, peak, elapsed = measure(convert)
+        # The PNG buffer is joined once more when it is returned
+        ceiling = 2 * size + MAX_BANDS * band_bytes + SLACK
+        ok = peak <= ceiling
+        failed = failed or not ok
+        print(
+            f"{name:<16} output {size / 1e6:8.2f} MB  peak {peak / 1e6:8.2f} MB "
+            f"({peak / frame_bytes:5.2f}x frame)  {elapsed * 1000:7.1f} ms"
+            f"  {'ok' if ok else f'over {ceiling / 1e6:.2f} MB'}"
+        )
+
+    if failed:
+        raise SystemExit("Peak memory above the ceiling")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Count selection redraws per second of drag when OverlaySelector is fed a
+synthetic stream of high-rate mouse motion events.
+
+Runs without a display by replacing the Tk root and canvas with fakes
+driven by a simulated clock.
+
+Usage:
+    python -m benchmarks.bench_overlay_drag [--rate HZ] [--seconds S]
+"""
+
+import argparse
+import heapq
+import time
+from types import SimpleNamespace
+from typing import Callable, List, Tuple
+
+from core.overlay_selector import OverlaySelector
+
+
+class FakeRoot:
+    """Tk root stand-in with after() timers on a simulated clock."""
+
+    def __init__(self):
+        """Initialize the fake root at time zero."""
+        self.now_ms = 0.0
+        self._timers: List[Tuple[float, int, Callable[[], None]]] = []
+        self._cancelled = set()
+        self._next_id = 0
+
+    def after(self, ms: int, callback: Callable[[], None]) -> str:
+        """Schedule a callback on the simulated clock."""
+        self._next_id += 1
+        heapq.heappush(self._timers, (self.now_ms + ms, self._next_id, callback))
+        return str(self._next_id)
+
+    def after_cancel(self, job: str) -> None:
+        """Cancel a scheduled callback."""
+        self._cancelled.add(int(job))
+
+    def advance(self, now_ms: float) -> None:
+        """Advance the clock, running every timer that falls due."""
+        while self._timers and self._timers[0][0] <= now_ms:
+            due, job, callback = heapq.heappop(self._timers)
+            self.now_ms = due
+            if job not in self._cancelled:
+                callback()
+        self.now_ms = now_ms
+
+    def winfo_rootx(self) -> int:
+        return 0
+
+    def winfo_rooty(self) -> int:
+        return 0
+
+
+class FakeCanvas:
+    """Canvas stand-in that counts item updates."""
+
+    def __init__(self):
+        """Initialize the fake canvas."""
+        self.coords_calls = 0
+        self._items = 0
+
+    def _create(self, *args, **kwargs) -> int:
+        self._items += 1
+        return self._items
+
+    create_rectangle = _create
+    create_text = _create
+
+    def coords(self, *args) -> None:
+        self.coords_calls += 1
+
+    def itemconfigure(self, *args, **kwargs) -> None:
+        pass
+
+    def delete(self, *args) -> None:
+        pass
+
+
+def run(rate: int, seconds: float, max_fps: int) -> Tuple[int, int, float]:
+    """
+    Drive one synthetic drag.
+
+    Returns:
+        Tuple of (motion events, redraws, wall-clock seconds spent handling)
+    """
+    selector = OverlaySelector(max_fps=max_fps)
+    root = FakeRoot()
+    selector.root = root
+    selector.canvas = FakeCanvas()
+
+    selector._on_press(SimpleNamespace(x=0, y=0))
+    selector.redraw_count = 0
+
+    events = int(rate * seconds)
+    start = time.perf_counter()
+    for i in range(events):
+        root.advance(i * 1000.0 / rate)
+        selector._on_drag(SimpleNamespace(x=i % 3000, y=i % 2000))
+    root.advance(seconds * 1000.0 + 1000)
+    elapsed = time.perf_counter() - start
+
+    # The last redraw must show the final pointer position
+    assert (selector.end_x, selector.end_y) == ((events - 1) % 3000, (events - 1) % 2000)
+    return events, selector.redraw_count, elapsed
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=1000, help="motion events per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--max-fps", type=int, default=60)
+    args = parser.parse_args()
+
+    events, redraws, elapsed = run(args.rate, args.seconds, args.max_fps)
+    print(f"motion events     {events} ({args.rate} Hz)")
+    print(f"redraws           {redraws} ({redraws / args.seconds:.1f} per second)")
+    print(f"uncoalesced       {events} ({args.rate:.1f} per second)")
+    print(f"handler time      {elapsed * 1e6 / events:.2f} us per event")
+
+
+if __name__ == "__main__":
+    main()
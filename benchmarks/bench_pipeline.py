@@ -0,0 +1,79 @@
+"""
+Compare end-to-end post-selection latency of the serial path against the
+stage pipeline, using a fake grabber, an in-memory clipboard and a fake
+browser launch.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--iterations N] [--launch-ms MS]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import FakeGrabber
+from core.pipeline import Pipeline, StageFailed
+from core.screenshot_capture import CaptureSession
+from utils.clipboard import MemoryClipboardBackend, copy_dib_to_clipboard
+from utils.dib import frame_to_dib
+
+
+def build(session: CaptureSession, backend: MemoryClipboardBackend,
+          region: tuple, launch_seconds: float) -> Pipeline:
+    """Build the same stage graph SwiftClip uses in paste mode."""
+    def capture():
+        frame = session.grab_frame(*region)
+        if frame is None:
+            raise StageFailed("Failed to capture screenshot")
+        return frame
+
+    def clipboard(frame):
+        if not copy_dib_to_clipboard(frame_to_dib(frame), backend):
+            raise StageFailed("Failed to copy to clipboard")
+
+    def browser():
+        time.sleep(launch_seconds)  # Stands in for spawning the browser
+        return False
+
+    return (
+        Pipeline()
+        .stage("capture", capture)
+        .stage("clipboard", clipboard, requires=("capture",))
+        .stage("browser", browser)
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--launch-ms", type=float, default=150.0)
+    parser.add_argument("--region", default="1920x1080")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.region.lower().split("x"))
+    session = CaptureSession(
+        grabber_factory=lambda: FakeGrabber(3840, 2160),
+        display_signature=lambda: None
+    )
+    backend = MemoryClipboardBackend()
+    pipeline = build(session, backend, (0, 0, width, height), args.launch_ms / 1000)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for name, runner in (("serial", None), ("pipelined", executor)):
+            samples = []
+            for _ in range(args.iterations):
+                result = pipeline.run(runner)
+                assert result.ok, result.message()
+                samples.append(result.elapsed * 1000)
+            print(
+                f"{name:<10} mean {statistics.mean(samples):8.2f} ms  "
+                f"p50 {statistics.median(samples):8.2f} ms"
+            )
+
+    session.close()
+
+
+if __name__ == "__main__":
+    main()
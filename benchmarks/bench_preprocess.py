@@ -0,0 +1,179 @@
+"""
+Verify recognition preprocessing and measure its time and byte savings.
+
+Runs trimming, colour reduction and small-text enlargement over a set of
+synthetic captures (small text in wide margins, dark-theme text, a
+document, a UI panel and a photo). Reports the time of every stage and
+the CF_DIB and upload payload sizes before and after, for each colour
+mode.
+
+Usage:
+    python -m benchmarks.bench_preprocess [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from benchmarks.corpus import photo_screen, text_screen, ui_screen
+from benchmarks.fakes import desktop_from_image
+from core.encoder import encode_image
+from core.frame import Frame
+from core.preprocess import (
+    COLOR_MODES,
+    DEFAULT_MARGIN,
+    DEFAULT_TOLERANCE,
+    background_color,
+    content_box,
+    ink_mask,
+    line_height,
+    preprocess,
+    reduce_colors,
+    scale_factor,
+    trim_borders,
+    upscale,
+)
+from utils.dib import frame_to_dib
+
+
+# Pixel cap of enlarged captures, the default PREPROCESS_MAX_PIXELS
+MAX_PIXELS = 1920 * 1080
+
+
+def text_block(
+    size: Tuple[int, int],
+    font_size: int,
+    background: Tuple[int, int, int],
+    ink: Tuple[int, int, int]
+) -> Image.Image:
+    """A few lines of text in the middle of a plain background."""
+    width, height = size
+    image = Image.new("RGB", size, background)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=font_size)
+    for line in range(6):
+        draw.text(
+            (width // 4, height // 3 + line * (font_size + 4)),
+            "The quick brown fox jumps over the lazy dog 0123456789",
+            fill=ink, font=font
+        )
+    return image
+
+
+CAPTURES: Dict[str, Callable[[], Image.Image]] = {
+    "small text": lambda: text_block((1200, 700), 9, (255, 255, 255), (0, 0, 0)),
+    "dark text": lambda: text_block((1000, 600), 11, (30, 30, 30), (220, 220, 220)),
+    "document": lambda: text_screen(1000, 600),
+    "ui panel": lambda: ui_screen(800, 600),
+    "photo": lambda: photo_screen(800, 600),
+}
+
+
+def to_frame(image: Image.Image) -> Frame:
+    """Wrap a synthetic image in a frame."""
+    return Frame(desktop_from_image(image), 0, 0, image.width, image.height)
+
+
+def verify() -> None:
+    """Check the stages on small known inputs."""
+    image = Image.new("RGB", (40, 30), (250, 250, 250))
+    ImageDraw.Draw(image).rectangle((10, 5, 19, 14), fill=(200, 0, 0))
+    frame = to_frame(image)
+
+    trimmed = trim_borders(frame, margin=2)
+    assert (trimmed.left, trimmed.top, trimmed.width, trimmed.height) == (8, 3, 14, 14)
+    assert trimmed.buffer is frame.buffer  # A view, nothing copied
+
+    blank = to_frame(Image.new("RGB", (16, 16), (0, 0, 0)))
+    assert trim_borders(blank) is blank
+    assert preprocess(blank, colors=None) is blank
+
+    enlarged = upscale(trimmed, 3).to_image()
+    assert enlarged.size == (42, 42)
+    assert enlarged.tobytes() == trimmed.to_image().resize((42, 42), Image.NEAREST).tobytes()
+
+    red, green, blue = reduce_colors(frame, "gray").to_image().split()
+    assert red.tobytes() == green.tobytes() == blue.tobytes()
+    white = to_frame(Image.new("RGB", (4, 4), (255, 255, 255)))
+    assert reduce_colors(white, "gray").to_image().getextrema() == ((255, 255),) * 3
+    palette = reduce_colors(to_frame(photo_screen(64, 64)), "palette").to_image()
+    assert len(palette.getcolors(1024)) <= 216
+
+    small = to_frame(CAPTURES["small text"]())
+    assert preprocess(small).width == 3 * trim_borders(small).width
+    panel = to_frame(CAPTURES["ui panel"]())
+    assert preprocess(panel).size == trim_borders(panel).size
+    print("Trim, enlarge and colour reduction produce the expected frames")
+
+
+def timed(fn: Callable, repeat: int) -> tuple:
+    """Run fn repeat times, returning its last result and the best ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def payload(frame: Frame) -> int:
+    """Size of the upload encoding of a frame."""
+    return len(encode_image(frame.to_image()).data)
+
+
+def bench(repeat: int) -> None:
+    """Time each stage and compare payload sizes."""
+    for name, make in CAPTURES.items():
+        frame = to_frame(make())
+        mask, mask_ms = timed(
+            lambda: ink_mask(frame, background_color(frame), DEFAULT_TOLERANCE), repeat
+        )
+        box, box_ms = timed(lambda: content_box(mask, DEFAULT_MARGIN), repeat)
+        trimmed = trim_borders(frame)
+        height, line_ms = timed(lambda: line_height(mask), repeat)
+        factor = scale_factor(height, trimmed.size, max_pixels=MAX_PIXELS)
+        _, gray_ms = timed(lambda: reduce_colors(trimmed, "gray"), repeat)
+        _, palette_ms = timed(lambda: reduce_colors(trimmed, "palette"), repeat)
+        _, upscale_ms = timed(lambda: upscale(trimmed, factor), repeat)
+
+        print(
+            f"{name:<11} {frame.width}x{frame.height} -> {trimmed.width}x{trimmed.height}"
+            f" x{factor} (lines {height} px)"
+        )
+        print(
+            f"  mask {mask_ms:.2f} ms  box {box_ms:.2f} ms  lines {line_ms:.2f} ms"
+            f"  gray {gray_ms:.2f} ms  palette {palette_ms:.2f} ms"
+            f"  upscale {upscale_ms:.2f} ms"
+        )
+
+        before_dib, before_upload = len(frame_to_dib(frame)), payload(frame)
+        for colors in (None,) + COLOR_MODES:
+            for scale in (1, 3):
+                out, total_ms = timed(
+                    lambda: preprocess(
+                        frame, max_scale=scale, colors=colors, max_pixels=MAX_PIXELS
+                    ),
+                    repeat
+                )
+                dib, upload = len(frame_to_dib(out)), payload(out)
+                print(
+                    f"  {colors or 'color':<8} scale<={scale}  {total_ms:6.2f} ms"
+                    f"  dib {before_dib:>8} -> {dib:>8} ({dib / before_dib:5.0%})"
+                    f"  upload {before_upload:>7} -> {upload:>7} ({upload / before_upload:5.0%})"
+                )
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
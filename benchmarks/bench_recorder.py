@@ -0,0 +1,141 @@
+"""
+Verify region recording and measure its frame rate and output size.
+
+Records a synthetic screen with a small moving element through a fake
+grab function. Checks that every GIF and WebP frame decodes to the
+captured pixels, that recording stops when the grabs change size, and
+compares frame-diff sub-frames with full frames.
+A deliberately slow writer shows the bounded queue dropping frames
+instead of growing.
+
+Usage:
+    python -m benchmarks.bench_recorder [--size WxH] [--fps N] [--seconds N]
+"""
+
+import argparse
+import itertools
+import time
+from io import BytesIO
+from typing import Callable, List, Optional
+
+from PIL import Image, ImageDraw, ImageSequence
+
+from benchmarks.corpus import ui_screen
+from benchmarks.fakes import desktop_from_image
+from core.frame import Frame
+from core.recorder import GifWriter, Recorder, WebPWriter, diff_rect
+
+
+def scenes(width: int, height: int, count: int) -> List[Image.Image]:
+    """A static UI with a spinner-sized square moving across it."""
+    background = ui_screen(width, height)
+    images = []
+    for index in range(count):
+        image = background.copy()
+        x = 40 + index * 7 % max(1, width - 80)
+        ImageDraw.Draw(image).rectangle((x, 60, x + 24, 84), fill=(220, 40, 40))
+        images.append(image)
+    return images
+
+
+def fake_grab(frames: List[Frame]) -> Callable[..., Optional[Frame]]:
+    """Grab function cycling through prepared frames."""
+    cycle = itertools.cycle(frames)
+    return lambda *region: next(cycle)
+
+
+def record(writer_class: type, frames: List[Frame], fps: float, seconds: float) -> tuple:
+    """Record the frames, returning the recorder and the file data."""
+    buffer = BytesIO()
+    width, height = frames[0].size
+    writer = writer_class(buffer, (width, height))
+    recorder = Recorder(
+        fake_grab(frames), (0, 0, width, height), writer, fps=fps,
+        max_duration=seconds
+    )
+    recorder.start()
+    while recorder.running:
+        time.sleep(0.01)
+    return recorder, buffer.getvalue()
+
+
+def full_frame_size(writer_class: type, frames: List[Frame], count: int) -> int:
+    """Size of the same clip with every frame written whole."""
+    buffer = BytesIO()
+    writer = writer_class(buffer, frames[0].size)
+    for index in range(count):
+        writer.add(frames[index % len(frames)].to_image(), 0, 0, index / 10)
+    writer.close(count / 10)
+    return len(buffer.getvalue())
+
+
+def verify() -> None:
+    """Check that both formats decode to the captured frames."""
+    images = scenes(160, 120, 6)
+    frames = [Frame(desktop_from_image(image), 0, 0, 160, 120) for image in images]
+
+    for writer_class in (GifWriter, WebPWriter):
+        recorder, data = record(writer_class, frames, fps=200, seconds=0.2)
+        decoded = [
+            frame.convert("RGB").tobytes()
+            for frame in ImageSequence.Iterator(Image.open(BytesIO(data)))
+        ]
+        assert recorder.error is None
+        assert decoded == [images[i % len(images)].tobytes() for i in range(len(decoded))]
+        assert len(decoded) == recorder.written
+    print("GIF and WebP recordings decode to the captured frames")
+
+    resized = Frame(desktop_from_image(scenes(200, 150, 1)[0]), 0, 0, 200, 150)
+    for writer_class in (GifWriter, WebPWriter):
+        recorder, data = record(writer_class, frames[:3] + [resized], fps=200, seconds=5)
+        assert recorder.error is None and recorder.stop_reason is not None
+        assert recorder.written == 3 and recorder.duration < 1
+        with Image.open(BytesIO(data)) as clip:
+            assert clip.size == (160, 120) and clip.n_frames == 3
+    print("Recording stops when the region changes size")
+
+
+def bench(width: int, height: int, fps: float, seconds: float) -> None:
+    """Time diffing and recording, and compare diff and full-frame sizes."""
+    images = scenes(width, height, 30)
+    frames = [Frame(desktop_from_image(image), 0, 0, width, height) for image in images]
+
+    start = time.perf_counter()
+    for previous, current in zip(frames, frames[1:]):
+        diff_rect(previous, current)
+    per_diff = (time.perf_counter() - start) * 1000 / (len(frames) - 1)
+    print(f"diff_rect {width}x{height}: {per_diff:.2f} ms")
+
+    for writer_class in (GifWriter, WebPWriter):
+        recorder, data = record(writer_class, frames, fps, seconds)
+        full = full_frame_size(writer_class, frames, recorder.written)
+        print(
+            f"{writer_class.__name__:<10} {len(data):>9} bytes"
+            f" ({full} with full frames)  {recorder.summary()},"
+            f" encode {recorder.encode_time * 1000 / max(1, recorder.written):.1f} ms/frame"
+        )
+
+    class SlowWriter(GifWriter):
+        def add(self, *args) -> None:
+            time.sleep(0.1)
+            super().add(*args)
+
+    recorder, _ = record(SlowWriter, frames, fps, seconds)
+    print(f"SlowWriter {recorder.summary()}")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="800x600")
+    parser.add_argument("--fps", type=float, default=20.0)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    verify()
+    bench(width, height, args.fps, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
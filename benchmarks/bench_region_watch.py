@@ -0,0 +1,114 @@
+"""
+Measure region watch cost: tile hashing per poll and polls while static.
+
+Hashes synthetic regions with the NumPy path and the CRC32 fallback, then
+runs a RegionWatcher against a region that changes once and stays static,
+reporting how far the polling backs off and the CPU time it used.
+Checks that request_stop returns during a slow grab and that the frame
+from that grab is not reported.
+
+Usage:
+    python -m benchmarks.bench_region_watch [--seconds S]
+"""
+
+import argparse
+import threading
+import time
+
+import core.region_watch as region_watch
+from benchmarks.fakes import synthetic_desktop
+from core.frame import Frame
+from core.region_watch import RegionWatcher, changed_fraction, tile_hashes
+
+
+SIZES = {
+    "panel": (400, 300),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+
+def _hash_ms(frame: Frame, repeat: int = 5) -> float:
+    """Best time of tile_hashes over a few runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tile_hashes(frame)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0,
+                        help="how long the watcher runs")
+    args = parser.parse_args()
+
+    numpy = region_watch.np
+    for name, (width, height) in SIZES.items():
+        frame = Frame(synthetic_desktop(width, height), 0, 0, width, height)
+        fast = _hash_ms(frame) if numpy is not None else float("nan")
+        region_watch.np = None
+        try:
+            fallback = _hash_ms(frame, repeat=1)
+        finally:
+            region_watch.np = numpy
+        print(f"{name:<6} numpy {fast:8.2f} ms  crc32 {fallback:8.2f} ms")
+
+    # One change a third of the way in, then a static region
+    width, height = SIZES["panel"]
+    before = synthetic_desktop(width, height)
+    after = bytearray(before)
+    after[:width * 4 * 40] = bytes(width * 4 * 40)
+    assert changed_fraction(
+        (width, height), 32,
+        tile_hashes(Frame(before, 0, 0, width, height)),
+        tile_hashes(Frame(after, 0, 0, width, height))
+    ) > 0.1
+
+    started = time.perf_counter()
+
+    def grab(x1: int, y1: int, x2: int, y2: int) -> Frame:
+        changed = time.perf_counter() - started > args.seconds / 3
+        return Frame(after if changed else before, x1, y1, width, height)
+
+    changes = []
+    watcher = RegionWatcher(
+        grab, (0, 0, width, height), changes.append,
+        interval=0.05, max_interval=1.0
+    )
+    cpu = time.process_time()
+    watcher.start()
+    time.sleep(args.seconds)
+    watcher.stop()
+    cpu = time.process_time() - cpu
+
+    print(f"changes reported  {len(changes)} (initial + 1 expected)")
+    print(f"polls             {watcher.polls} in {args.seconds:.1f} s "
+          f"(last interval {watcher.current_interval:.2f} s)")
+    print(f"cpu time          {cpu * 1000:.1f} ms, hashing {watcher.hash_time * 1000:.1f} ms")
+
+    # Stopping from the tray must not wait for a grab in progress
+    grabbing, release = threading.Event(), threading.Event()
+
+    def slow_grab(x1: int, y1: int, x2: int, y2: int) -> Frame:
+        grabbing.set()
+        release.wait(5.0)
+        return Frame(before, x1, y1, width, height)
+
+    late = []
+    watcher = RegionWatcher(slow_grab, (0, 0, width, height), late.append)
+    watcher.start()
+    assert grabbing.wait(5.0)
+    start = time.perf_counter()
+    watcher.request_stop()
+    waited = time.perf_counter() - start
+    release.set()
+    watcher.stop()
+    assert waited < 0.05 and not late and not watcher.running, (waited, late)
+    print(f"request_stop      {waited * 1e6:.0f} us during a grab, nothing reported after")
+
+
+if __name__ == "__main__":
+    main()
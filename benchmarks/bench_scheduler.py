@@ -0,0 +1,164 @@
+"""
+Verify single-flight capture scheduling and measure dispatch latency.
+
+Runs CaptureScheduler on a real Dispatcher with a fake selection that
+lasts until the test releases or cancels it, the way the overlay waits
+for the user. Checks each busy policy with a press arriving during a
+selection, cancel() during a selection, per-request run functions and
+that shutdown leaves no live threads. Then times press-to-selection.
+
+Usage:
+    python -m benchmarks.bench_scheduler [--presses N]
+"""
+
+import argparse
+import queue
+import statistics
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from core.dispatcher import (
+    BUSY_DROP,
+    BUSY_QUEUE,
+    BUSY_RESTART,
+    CaptureRequest,
+    CaptureScheduler,
+    Dispatcher,
+)
+
+
+class FakeSelection:
+    """Stands in for the overlay: a selection runs until released or cancelled."""
+
+    def __init__(self):
+        self.started: "queue.Queue[CaptureRequest]" = queue.Queue()
+        self.finished: List[Tuple[CaptureRequest, str]] = []
+        self.cancel_calls = 0
+        self._releases: Dict[CaptureRequest, threading.Event] = {}
+
+    def run(self, request: CaptureRequest) -> None:
+        release = self._releases.setdefault(request, threading.Event())
+        self.started.put(request)
+        while not release.wait(0.002):
+            if request.is_cancelled:
+                self.finished.append((request, "cancelled"))
+                return
+        self.finished.append((request, "done"))
+
+    def on_cancel(self) -> None:
+        self.cancel_calls += 1
+
+    def next_started(self) -> CaptureRequest:
+        """Wait for the next selection to start."""
+        return self.started.get(timeout=5.0)
+
+    def release(self, request: CaptureRequest) -> None:
+        """Complete a selection, as a user finishing the drag."""
+        self._releases.setdefault(request, threading.Event()).set()
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait until condition() is true."""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.002)
+
+
+def start_scheduler(policy: str) -> Tuple[Dispatcher, CaptureScheduler, FakeSelection]:
+    """A started dispatcher and a scheduler running fake selections."""
+    dispatcher = Dispatcher("BenchDispatcher")
+    dispatcher.start()
+    selection = FakeSelection()
+    return dispatcher, CaptureScheduler(
+        dispatcher, selection.run, on_cancel=selection.on_cancel, policy=policy
+    ), selection
+
+
+def verify() -> None:
+    """Check the busy policies, cancellation and shutdown."""
+    threads = threading.active_count()
+    dispatcher, drop, selection = start_scheduler(BUSY_DROP)
+    first = drop.trigger()
+    assert selection.next_started() is first
+    assert drop.trigger() is None
+    selection.release(first)
+    wait_for(lambda: not drop.busy)
+    assert selection.finished == [(first, "done")] and selection.started.empty()
+    print("drop: a press during a selection is ignored")
+    dispatcher.stop()
+
+    dispatcher, queued, selection = start_scheduler(BUSY_QUEUE)
+    first = queued.trigger()
+    assert selection.next_started() is first
+    superseded, last = queued.trigger(), queued.trigger()
+    assert superseded.is_cancelled and not first.is_cancelled
+    selection.release(first)
+    assert selection.next_started() is last
+    selection.release(last)
+    wait_for(lambda: not queued.busy)
+    assert selection.finished == [(first, "done"), (last, "done")]
+    assert selection.cancel_calls == 0
+    print("queue: the latest press runs after the selection, earlier ones are dropped")
+    dispatcher.stop()
+
+    dispatcher, restart, selection = start_scheduler(BUSY_RESTART)
+    first = restart.trigger()
+    assert selection.next_started() is first
+    second = restart.trigger()
+    assert selection.next_started() is second
+    assert selection.finished == [(first, "cancelled")] and selection.cancel_calls == 1
+    selection.release(second)
+    wait_for(lambda: not restart.busy)
+    print("restart: a press cancels the selection and starts a new one")
+
+    first = restart.trigger()
+    assert selection.next_started() is first
+    restart.cancel()
+    wait_for(lambda: not restart.busy)
+    assert selection.finished[-1] == (first, "cancelled") and selection.cancel_calls == 2
+    restart.cancel()  # Nothing running
+    assert selection.cancel_calls == 2
+    print("cancel() ends the running selection and leaves the scheduler idle")
+
+    other = []
+    request = restart.trigger(run=other.append)
+    wait_for(lambda: not restart.busy)
+    assert other == [request] and selection.started.empty()
+    print("A request's own run function replaces the default")
+
+    dispatcher.stop()
+    assert threading.active_count() == threads, threading.enumerate()
+    print("Stopping the dispatcher leaves no live threads")
+
+
+def bench(presses: int) -> None:
+    """Time from a press to the selection starting on the dispatcher."""
+    dispatcher, scheduler, selection = start_scheduler(BUSY_DROP)
+    samples = []
+    for _ in range(presses):
+        scheduler.trigger()
+        started = selection.next_started()
+        samples.append((time.perf_counter() - started.requested_at) * 1e6)
+        selection.release(started)
+        wait_for(lambda: not scheduler.busy)
+    dispatcher.stop()
+    print(
+        f"press to selection  p50 {statistics.median(samples):7.1f} us"
+        f"  max {max(samples):7.1f} us"
+    )
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--presses", type=int, default=200)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.presses)
+
+
+if __name__ == "__main__":
+    main()
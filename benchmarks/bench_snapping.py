@@ -0,0 +1,104 @@
+"""
+Verify selection snapping and measure index build and query time.
+
+Uses synthetic window rectangles through StaticWindowProvider and the
+UI corpus screen (sidebar, title bar, buttons) for the frame edges.
+Checks that points snap to window borders and panel edges, that borders
+hidden behind a window in front are ignored, and that text does not
+produce edges.
+
+Usage:
+    python -m benchmarks.bench_snapping [--size WxH] [--windows N]
+"""
+
+import argparse
+import random
+import time
+
+from PIL import Image, ImageDraw
+
+from benchmarks.corpus import ui_screen
+from benchmarks.fakes import desktop_from_image
+from core.frame import Frame
+from core.snapping import Snapper, StaticWindowProvider, frame_edges
+
+
+def verify() -> None:
+    """Check window, occlusion and frame edge snapping."""
+    # A window in front, partly covering one at the back
+    provider = StaticWindowProvider([(100, 100, 500, 400), (300, 200, 700, 500)])
+    snapper = Snapper.from_windows(provider, tolerance=8)
+
+    assert snapper.snap(503, 300) == (500, 300)
+    assert snapper.snap(303, 450) == (300, 450)
+    assert snapper.snap(303, 300) == (303, 300)  # Hidden behind the front window
+    assert snapper.snap(695, 300) == (700, 300)
+    assert snapper.snap(600, 204) == (600, 200)
+    assert snapper.snap(400, 204) == (400, 204)  # Hidden behind the front window
+    assert snapper.snap(650, 350) == (650, 350)  # Out of reach
+    print("Window edges snap, hidden parts are ignored")
+
+    width, height = 800, 600
+    frame = Frame(desktop_from_image(ui_screen(width, height)), 1920, 0, width, height)
+
+    snapper = Snapper(tolerance=8)
+    snapper.add_frame(frame)
+    sidebar = 1920 + width // 5 + 1
+    assert snapper.snap(sidebar + 5, 300)[0] == sidebar
+    assert snapper.snap(1920 + 600, 45)[1] == 41
+
+    print("Frame edges snap to panel borders")
+
+    page = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+    for y in range(20, height - 20, 14):
+        draw.text((20, y), "Lorem ipsum dolor sit amet, consectetur " * 3, fill=(0, 0, 0))
+    assert frame_edges(Frame(desktop_from_image(page), 0, 0, width, height)) == ([], [])
+    print("Text produces no edges")
+
+
+def bench(width: int, height: int, window_count: int) -> None:
+    """Time building the indexes and snapping points."""
+    rng = random.Random(1)
+    windows = []
+    for _ in range(window_count):
+        x, y = rng.randrange(width - 200), rng.randrange(height - 150)
+        windows.append((x, y, x + rng.randrange(200, 1200), y + rng.randrange(150, 900)))
+
+    start = time.perf_counter()
+    snapper = Snapper.from_windows(StaticWindowProvider(windows))
+    window_ms = (time.perf_counter() - start) * 1000
+
+    frame = Frame(desktop_from_image(ui_screen(width, height)), 0, 0, width, height)
+    start = time.perf_counter()
+    vertical, horizontal = frame_edges(frame)
+    edges_ms = (time.perf_counter() - start) * 1000
+    snapper.add(vertical, horizontal)
+
+    points = [(rng.randrange(width), rng.randrange(height)) for _ in range(20000)]
+    start = time.perf_counter()
+    snapped = sum(snapper.snap(x, y) != (x, y) for x, y in points)
+    per_query = (time.perf_counter() - start) * 1e6 / len(points)
+
+    print(f"window index, {window_count} windows: {window_ms:.2f} ms")
+    print(
+        f"frame_edges {width}x{height}: {edges_ms:.1f} ms"
+        f" ({len(vertical)} vertical, {len(horizontal)} horizontal)"
+    )
+    print(f"snap: {per_query:.2f} us per query, {snapped / len(points):.0%} of points snapped")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--windows", type=int, default=40)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    verify()
+    bench(width, height, args.windows)
+
+
+if __name__ == "__main__":
+    main()
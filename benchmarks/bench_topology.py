@@ -0,0 +1,75 @@
+"""
+Measure multi-monitor captures on a synthetic three-monitor 4K layout.
+
+Compares grabbing a selection that spans monitors at one scale factor with
+the same selection across mixed scale factors, which is stitched at one
+resolution, and checks that a same-scale stitch matches a direct grab.
+
+Usage:
+    python -m benchmarks.bench_topology [--iterations N]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.fakes import FakeGrabber, synthetic_desktop
+from core.frame import Frame
+from core.monitor_topology import Monitor, MonitorTopology, StaticTopologyProvider
+from core.screenshot_capture import CaptureSession
+
+
+WIDTH, HEIGHT = 3840, 2160
+
+
+def _layout(scales: tuple) -> StaticTopologyProvider:
+    """Three 4K monitors side by side with the given scale factors."""
+    return StaticTopologyProvider([
+        Monitor(i * WIDTH, 0, WIDTH, HEIGHT, scale=scale, primary=i == 0)
+        for i, scale in enumerate(scales)
+    ])
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    desktop = synthetic_desktop(WIDTH * 3, HEIGHT)
+
+    def factory() -> FakeGrabber:
+        return FakeGrabber(WIDTH, HEIGHT, monitor_count=3, desktop=desktop)
+
+    # A selection spanning the seam between the first two monitors
+    region = (WIDTH - 1000, 500, WIDTH + 1000, 1500)
+
+    uniform = CaptureSession(factory, lambda: None, _layout((1.0, 1.0, 1.0)))
+    mixed = CaptureSession(factory, lambda: None, _layout((1.5, 1.0, 1.25)))
+
+    direct = Frame.from_screenshot(factory().grab({
+        "left": region[0], "top": region[1],
+        "width": region[2] - region[0], "height": region[3] - region[1],
+    }))
+    stitched = uniform.grab_frame(*region)
+    assert stitched.tobytes() == direct.tobytes(), "same-scale stitch differs"
+    print(f"same-scale stitch matches a direct grab: {stitched}")
+    print(f"mixed-scale stitch: {mixed.grab_frame(*region)}")
+
+    topology = MonitorTopology(_layout((1.5, 1.0, 1.25)).monitors())
+    start = time.perf_counter()
+    for _ in range(10000):
+        topology.layout(*region)
+    print(f"{'layout query':<16} {(time.perf_counter() - start) * 100:7.3f} us")
+
+    for name, session in (("same scale", uniform), ("mixed scale", mixed)):
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            session.grab_frame(*region)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<16} p50 {statistics.median(samples):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
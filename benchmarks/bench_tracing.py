@@ -0,0 +1,119 @@
+"""
+Verify latency tracing and measure its per-capture overhead.
+
+Checks nearest-rank percentiles against known samples, rollover of the
+rolling window, the per-milestone summary and its menu lines, the JSONL
+records and the disabled tracer. Then times finishing a trace and
+building the summary.
+
+Usage:
+    python -m benchmarks.bench_tracing [--traces N]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from core.tracing import (
+    CAPTURE_DONE,
+    CLIPBOARD_WRITTEN,
+    HOTKEY_RECEIVED,
+    NULL_TRACE,
+    OVERLAY_VISIBLE,
+    RollingHistogram,
+    Tracer,
+)
+
+
+def verify() -> None:
+    """Check percentiles, rollover, summaries and trace records."""
+    histogram = RollingHistogram(window=100)
+    assert histogram.percentiles(50, 99) == (0.0, 0.0)
+    for value in range(100, 0, -1):
+        histogram.add(float(value))
+    assert histogram.percentiles(0, 50, 95, 99, 100) == (1, 50, 95, 99, 100)
+    single = RollingHistogram()
+    single.add(7.0)
+    assert single.percentiles(1, 50, 99) == (7.0, 7.0, 7.0)
+    print("Percentiles follow the nearest-rank definition")
+
+    rolling = RollingHistogram(window=10)
+    for value in range(1, 21):
+        rolling.add(float(value))
+    assert len(rolling) == 10
+    assert rolling.percentiles(0, 50, 100) == (11, 15, 20)
+    print("The window keeps only the most recent samples")
+
+    path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+    tracer = Tracer(window=50, trace_file=path)
+    assert tracer.summary_lines() == ["No captures yet"]
+    for index in range(1, 101):
+        trace = tracer.begin(start=10.0)
+        trace.mark(CAPTURE_DONE, 10.0 + index / 1000)
+        trace.mark(OVERLAY_VISIBLE, 10.0 + 0.005)
+        if index % 2:
+            trace.mark(CLIPBOARD_WRITTEN, 10.0 + 2 * index / 1000)
+        tracer.finish(trace)
+
+    summary = tracer.summary()
+    assert list(summary) == [OVERLAY_VISIBLE, CAPTURE_DONE, CLIPBOARD_WRITTEN]
+    assert tracer.count == 100
+    p50, p95, p99, count = summary[CAPTURE_DONE]
+    assert count == 50 and (round(p50), round(p95), round(p99)) == (75, 98, 100)
+    assert summary[CLIPBOARD_WRITTEN][3] == 50  # Each milestone keeps its own window
+    assert tracer.summary_lines()[0] == "overlay visible: p50 5 / p95 5 / p99 5 ms"
+    print("The summary covers each milestone reached, in pipeline order")
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["id"] for record in records] == list(range(1, 101))
+    assert records[0]["ms"] == {
+        HOTKEY_RECEIVED: 0.0, CAPTURE_DONE: 1.0, CLIPBOARD_WRITTEN: 2.0,
+        OVERLAY_VISIBLE: 5.0,
+    }
+    assert list(records[1]["ms"]) == [HOTKEY_RECEIVED, CAPTURE_DONE, OVERLAY_VISIBLE]
+    print("Each finished trace is appended as one JSON line")
+
+    disabled = Tracer(enabled=False, trace_file=path)
+    trace = disabled.begin()
+    assert trace is NULL_TRACE
+    trace.mark(CAPTURE_DONE)
+    disabled.finish(trace)
+    assert disabled.count == 0 and disabled.summary_lines() == ["Tracing disabled"]
+    print("A disabled tracer records nothing")
+
+
+def bench(traces: int) -> None:
+    """Time finishing traces and building the summary."""
+    tracer = Tracer(window=200)
+    start = time.perf_counter()
+    for index in range(traces):
+        trace = tracer.begin()
+        trace.mark(OVERLAY_VISIBLE)
+        trace.mark(CAPTURE_DONE)
+        trace.mark(CLIPBOARD_WRITTEN)
+        tracer.finish(trace)
+    per_trace = (time.perf_counter() - start) * 1e6 / traces
+
+    start = time.perf_counter()
+    for _ in range(100):
+        tracer.summary_lines()
+    per_summary = (time.perf_counter() - start) * 1e6 / 100
+    print(f"begin to finish  {per_trace:7.2f} us per trace")
+    print(f"summary_lines    {per_summary:7.2f} us (window 200)")
+
+
+def main() -> None:
+    """Run verification and benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--traces", type=int, default=10000)
+    args = parser.parse_args()
+
+    verify()
+    bench(args.traces)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Synthetic screen content used by the benchmarks."""
+
+import random
+from typing import Callable, Dict
+
+from PIL import Image, ImageDraw
+
+
+def text_screen(width: int, height: int) -> Image.Image:
+    """Black text lines on a white document background."""
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    line = "The quick brown fox jumps over the lazy dog 0123456789 " * 4
+    for y in range(8, height, 16):
+        draw.text((8, y), line, fill=(20, 20, 20))
+    return image
+
+
+def ui_screen(width: int, height: int) -> Image.Image:
+    """Flat panels, buttons and a sidebar with a few labels."""
+    rng = random.Random(width * height)
+    image = Image.new("RGB", (width, height), (243, 243, 243))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width // 5, height), fill=(32, 33, 36))
+    draw.rectangle((0, 0, width, 40), fill=(0, 120, 212))
+    for _ in range(max(1, width * height // 40000)):
+        x = rng.randrange(width // 5, max(width // 5 + 1, width - 120))
+        y = rng.randrange(40, max(41, height - 32))
+        draw.rounded_rectangle((x, y, x + 110, y + 28), radius=4,
+                               fill=(255, 255, 255), outline=(200, 200, 200))
+        draw.text((x + 10, y + 8), "Button", fill=(0, 0, 0))
+    return image
+
+
+def photo_screen(width: int, height: int) -> Image.Image:
+    """Smooth colour gradients with sensor-like noise."""
+    red = Image.linear_gradient("L").resize((width, height))
+    green = Image.radial_gradient("L").resize((width, height))
+    blue = Image.effect_noise((width, height), 48)
+    return Image.merge("RGB", (red, green, blue))
+
+
+def mixed_screen(width: int, height: int) -> Image.Image:
+    """A UI frame with a photo in the middle."""
+    image = ui_screen(width, height)
+    photo = photo_screen(max(1, width // 2), max(1, height // 2))
+    image.paste(photo, (width // 4, height // 4))
+    return image
+
+
+CONTENT_TYPES: Dict[str, Callable[[int, int], Image.Image]] = {
+    "text": text_screen,
+    "ui": ui_screen,
+    "photo": photo_screen,
+    "mixed": mixed_screen,
+}
@@ -0,0 +1,111 @@
+"""Fake backends so benchmarks run headless on any platform."""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from mss.screenshot import ScreenShot
+from PIL import Image
+
+
+def make_monitors(
+    width: int, height: int, count: int = 1
+) -> List[Dict[str, int]]:
+    """
+    Build an mss-style monitor list of monitors placed side by side.
+
+    Args:
+        width: Width of each monitor
+        height: Height of each monitor
+        count: Number of monitors
+
+    Returns:
+        List of monitor dicts; index 0 is the combined virtual screen
+    """
+    monitors = [{"left": 0, "top": 0, "width": width * count, "height": height}]
+    for i in range(count):
+        monitors.append(
+            {"left": i * width, "top": 0, "width": width, "height": height}
+        )
+    return monitors
+
+
+def synthetic_desktop(width: int, height: int) -> bytearray:
+    """Build a raw BGRA desktop buffer with a simple repeating pattern."""
+    row = bytes((x * 7) & 0xFF for x in range(width * 4))
+    return bytearray(row * height)
+
+
+def desktop_from_image(image: Image.Image) -> bytearray:
+    """Convert a PIL Image to a raw BGRA desktop buffer, as mss returns it."""
+    return bytearray(image.convert("RGBA").tobytes("raw", "BGRA"))
+
+
+class FakeGrabber:
+    """
+    Synthetic replacement for ``mss.mss()``.
+
+    Serves grabs from an in-memory BGRA desktop and optionally simulates the
+    device-context setup and monitor enumeration cost of a real grabber.
+    """
+
+    def __init__(
+        self,
+        width: int = 1920,
+        height: int = 1080,
+        monitor_count: int = 1,
+        open_delay: float = 0.0,
+        desktop: Optional[bytearray] = None
+    ):
+        """
+        Initialize the fake grabber.
+
+        Args:
+            width: Width of each fake monitor
+            height: Height of each fake monitor
+            monitor_count: Number of fake monitors
+            open_delay: Seconds spent "opening" the grabber
+            desktop: Raw BGRA desktop buffer (generated if omitted)
+        """
+        if open_delay:
+            time.sleep(open_delay)
+        self.monitors = make_monitors(width, height, monitor_count)
+        self.grab_count = 0
+        self.closed = False
+
+        virtual = self.monitors[0]
+        self._width = virtual["width"]
+        self._height = virtual["height"]
+        if desktop is None:
+            desktop = synthetic_desktop(self._width, self._height)
+        self._desktop = desktop
+
+    def __enter__(self) -> "FakeGrabber":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def grab(self, monitor: Dict[str, int]) -> ScreenShot:
+        """Grab a region of the synthetic desktop."""
+        left = monitor["left"] - self.monitors[0]["left"]
+        top = monitor["top"] - self.monitors[0]["top"]
+        width = monitor["width"]
+        height = monitor["height"]
+
+        stride = self._width * 4
+        view = memoryview(self._desktop)
+        if left == 0 and width == self._width:
+            data = bytearray(view[top * stride:(top + height) * stride])
+        else:
+            row_bytes = width * 4
+            data = bytearray(row_bytes * height)
+            for y in range(height):
+                src = (top + y) * stride + left * 4
+                data[y * row_bytes:(y + 1) * row_bytes] = view[src:src + row_bytes]
+
+        self.grab_count += 1
+        return ScreenShot(data, monitor)
+
+    def close(self) -> None:
+        """Close the fake grabber."""
+        self.closed = True
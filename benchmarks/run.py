@@ -0,0 +1,221 @@
+"""
+Headless benchmark suite for the capture, encoding and clipboard hot paths.
+
+Drives CaptureSession.capture_region, image_to_bytes and the clipboard DIB
+conversion through a synthetic mss grabber and an in-memory clipboard over
+a matrix of region sizes and content types. Results are written as JSON;
+with --compare, they are checked against an earlier run.
+
+Usage:
+    python -m benchmarks.run [--out results.json] [--sizes thumb,1080p]
+    python -m benchmarks.run --compare baseline.json [--threshold 0.15]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from PIL import __version__ as PIL_VERSION
+
+from benchmarks.corpus import CONTENT_TYPES
+from benchmarks.fakes import FakeGrabber, desktop_from_image
+from core.screenshot_capture import CaptureSession, image_to_bytes
+from utils import dib
+from utils.clipboard import (
+    CF_DIB,
+    MemoryClipboardBackend,
+    copy_frame_to_clipboard,
+    copy_image_to_clipboard,
+)
+
+
+SIZES = {
+    "thumb": (128, 128),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+    "8k": (7680, 4320),
+}
+
+CASES = [
+    "capture_region",
+    "grab_frame",
+    "image_to_bytes_png",
+    "image_to_bytes_auto",
+    "clipboard_image",
+    "clipboard_frame",
+]
+
+
+def _time(fn: Callable[[], object], iterations: int) -> List[float]:
+    """Run fn once to warm up, then time each call in milliseconds."""
+    fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_matrix(
+    sizes: List[str],
+    contents: List[str],
+    cases: List[str],
+    iterations: int
+) -> List[Dict[str, object]]:
+    """
+    Benchmark every case for every size and content type.
+
+    Returns:
+        One result record per (case, size, content)
+    """
+    results = []
+    backend = MemoryClipboardBackend()
+
+    for size_name in sizes:
+        width, height = SIZES[size_name]
+        for content in contents:
+            desktop = desktop_from_image(CONTENT_TYPES[content](width, height))
+            session = CaptureSession(
+                grabber_factory=lambda: FakeGrabber(width, height, desktop=desktop),
+                display_signature=lambda: None
+            )
+            region = (0, 0, width, height)
+            image = session.capture_region(*region)
+            frame = session.grab_frame(*region)
+
+            bench = {
+                "capture_region": lambda: session.capture_region(*region),
+                "grab_frame": lambda: session.grab_frame(*region),
+                "image_to_bytes_png": lambda: image_to_bytes(image, "PNG"),
+                "image_to_bytes_auto": lambda: image_to_bytes(image, "AUTO"),
+                # Publishing is lazy, so paste the DIB to time its conversion
+                "clipboard_image": lambda: copy_image_to_clipboard(image, backend)
+                and backend.get(CF_DIB),
+                "clipboard_frame": lambda: copy_frame_to_clipboard(frame, backend)
+                and backend.get(CF_DIB),
+            }
+
+            for case in cases:
+                samples = _time(bench[case], iterations)
+                record = {
+                    "case": case,
+                    "size": size_name,
+                    "content": content,
+                    "width": width,
+                    "height": height,
+                    "iterations": iterations,
+                    "mean_ms": statistics.mean(samples),
+                    "p50_ms": statistics.median(samples),
+                    "min_ms": min(samples),
+                }
+                results.append(record)
+                print(
+                    f"{case:<22} {size_name:<6} {content:<6} "
+                    f"p50 {record['p50_ms']:9.2f} ms  min {record['min_ms']:9.2f} ms",
+                    flush=True
+                )
+
+            session.close()
+
+    return results
+
+
+def compare(
+    results: List[Dict[str, object]],
+    baseline: List[Dict[str, object]],
+    threshold: float
+) -> List[str]:
+    """
+    Find cases whose median got slower than the baseline by more than threshold.
+
+    Returns:
+        One description per regression
+    """
+    def key(record: Dict[str, object]) -> tuple:
+        return record["case"], record["size"], record["content"]
+
+    previous = {key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get(key(record))
+        if old is None or not old["p50_ms"]:
+            continue
+        change = record["p50_ms"] / old["p50_ms"] - 1.0
+        if change > threshold:
+            regressions.append(
+                f"{record['case']} {record['size']} {record['content']}: "
+                f"{old['p50_ms']:.2f} -> {record['p50_ms']:.2f} ms (+{change:.0%})"
+            )
+    return regressions
+
+
+def _split(value: str, choices: List[str]) -> List[str]:
+    """Parse a comma-separated subset of choices."""
+    if value == "all":
+        return list(choices)
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in choices]
+    if unknown:
+        raise SystemExit(f"Unknown value(s): {', '.join(unknown)}; choose from {', '.join(choices)}")
+    return items
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; returns the process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="thumb,720p,1080p,4k",
+                        help=f"comma-separated subset of {','.join(SIZES)} or 'all'")
+    parser.add_argument("--contents", default="all",
+                        help=f"comma-separated subset of {','.join(CONTENT_TYPES)} or 'all'")
+    parser.add_argument("--cases", default="all",
+                        help=f"comma-separated subset of {','.join(CASES)} or 'all'")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--out", help="write results JSON to this file")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_matrix(
+        _split(args.sizes, list(SIZES)),
+        _split(args.contents, list(CONTENT_TYPES)),
+        _split(args.cases, CASES),
+        args.iterations
+    )
+
+    report = {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pillow": PIL_VERSION,
+            "numpy": dib.np.__version__ if dib.np is not None else None,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
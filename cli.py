@@ -0,0 +1,221 @@
+"""
+SwiftClip command line interface.
+
+Headless captures without the tray icon, hotkey or overlay:
+
+    SwiftClip capture --region 0,0,800,600 --out shot.webp
+    SwiftClip capture --out - --format png > shot.png
+    SwiftClip frames --region 0,0,800,600 --fps 2 --count 20 --out-dir shots
+    SwiftClip record --region 0,0,800,600 --seconds 5 --out clip.gif
+    SwiftClip monitors
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+from core import api
+from core.screenshot_capture import set_dpi_awareness
+
+
+# File extension for each encoded image format
+_EXTENSIONS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp"}
+
+
+def parse_region(value: str) -> api.Region:
+    """Parse "x1,y1,x2,y2" into a region tuple."""
+    try:
+        x1, y1, x2, y2 = (int(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid region {value!r}, expected x1,y1,x2,y2"
+        )
+    return x1, y1, x2, y2
+
+
+def _add_encoding_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options shared by every command that encodes images."""
+    parser.add_argument("--region", type=parse_region,
+                        help="x1,y1,x2,y2 in screen pixels (default: all monitors)")
+    parser.add_argument("--format", choices=api.FORMATS,
+                        help="image format (default: from the file extension)")
+    parser.add_argument("--quality", type=int, help="JPEG/WebP quality")
+    parser.add_argument("--max-pixels", type=int, default=0,
+                        help="downscale captures larger than this many pixels")
+
+
+def _cmd_capture(args: argparse.Namespace) -> int:
+    """Capture one region to a file, stdout or the clipboard."""
+    frame = api.capture(args.region)
+    if frame is None:
+        print("Capture failed", file=sys.stderr)
+        return 1
+
+    if args.clipboard:
+        from utils.clipboard import close_default_backend, copy_frame_to_clipboard
+        copied = copy_frame_to_clipboard(frame)
+        # Render every format now, the process exits before anyone pastes
+        close_default_backend()
+        if not copied:
+            return 1
+
+    if args.out is None:
+        return 0
+
+    if args.out == "-":
+        encoded = api.encode(frame, args.format or "png", args.max_pixels, args.quality)
+        sys.stdout.buffer.write(encoded.data)
+        sys.stdout.buffer.flush()
+        return 0
+
+    encoded = api.save(frame, args.out, args.format, args.max_pixels, args.quality)
+    print(
+        f"{args.out}: {encoded.width}x{encoded.height} {encoded.format}, "
+        f"{len(encoded.data)} bytes",
+        file=sys.stderr
+    )
+    return 0
+
+
+def _cmd_frames(args: argparse.Namespace) -> int:
+    """Capture a region repeatedly and encode the frames on a worker pool."""
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    count = 0
+    total = 0
+    stream = api.frames(args.region, fps=args.fps, count=args.count)
+    encoded_frames = api.encode_batch(
+        stream, args.format or "png", args.max_pixels, args.quality,
+        workers=args.workers
+    )
+    for encoded in encoded_frames:
+        extension = _EXTENSIONS.get(encoded.format.upper(), ".bin")
+        path = os.path.join(args.out_dir, f"frame_{count:05d}{extension}")
+        with open(path, "wb") as f:
+            f.write(encoded.data)
+        count += 1
+        total += len(encoded.data)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{count} frames, {total} bytes in {elapsed:.2f} s "
+        f"({count / elapsed:.1f} fps)",
+        file=sys.stderr
+    )
+    # The stream only ends early when captures keep failing
+    return 0 if args.count is not None and count >= args.count else 1
+
+
+def _cmd_record(args: argparse.Namespace) -> int:
+    """Record a region to an animated GIF or WebP for a fixed time."""
+    from core.recorder import Recorder, open_writer
+
+    session = api.get_session()
+    region = args.region or session.topology.bounds
+    frame = session.grab_frame(*region)
+    if frame is None:
+        print("Capture failed", file=sys.stderr)
+        return 1
+
+    try:
+        writer = open_writer(args.out, frame.size)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    recorder = Recorder(
+        session.grab_frame, region, writer, fps=args.fps,
+        max_duration=args.seconds
+    )
+    recorder.start()
+    try:
+        while recorder.running:
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    recorder.stop()
+
+    print(f"{args.out}: {recorder.summary()}", file=sys.stderr)
+    return 0 if recorder.error is None else 1
+
+
+def _cmd_monitors(args: argparse.Namespace) -> int:
+    """List the monitors with their position and scale factor."""
+    topology = api.get_session().topology
+    for index, monitor in enumerate(topology.monitors, 1):
+        print(
+            f"{index}: {monitor.left},{monitor.top},{monitor.right},{monitor.bottom}"
+            f"  {monitor.width}x{monitor.height}  {monitor.scale * 100:.0f}%"
+            f"{'  primary' if monitor.primary else ''}"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with every subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="SwiftClip", description="Headless SwiftClip captures."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture = commands.add_parser("capture", help="capture one region")
+    _add_encoding_arguments(capture)
+    capture.add_argument("--out", help="output file, or - for stdout")
+    capture.add_argument("--clipboard", action="store_true",
+                         help="also copy the capture to the clipboard")
+    capture.set_defaults(handler=_cmd_capture)
+
+    frames = commands.add_parser("frames", help="capture a region repeatedly")
+    _add_encoding_arguments(frames)
+    frames.add_argument("--out-dir", required=True, help="directory for the frames")
+    frames.add_argument("--fps", type=float, default=1.0, help="captures per second")
+    frames.add_argument("--count", type=int, default=10, help="number of frames")
+    frames.add_argument("--workers", type=int, help="encoder threads (default: CPU count)")
+    frames.set_defaults(handler=_cmd_frames)
+
+    record = commands.add_parser("record", help="record a region to GIF or WebP")
+    record.add_argument("--region", type=parse_region,
+                        help="x1,y1,x2,y2 in screen pixels (default: all monitors)")
+    record.add_argument("--out", required=True, help="output .gif or .webp file")
+    record.add_argument("--fps", type=float, default=10.0, help="target frames per second")
+    record.add_argument("--seconds", type=float, default=5.0,
+                        help="length of the clip (Ctrl+C stops early)")
+    record.set_defaults(handler=_cmd_record)
+
+    monitors = commands.add_parser("monitors", help="list monitors")
+    monitors.set_defaults(handler=_cmd_monitors)
+
+    return parser
+
+
+# Subcommands main.py hands over to this module
+COMMANDS = ("capture", "frames", "record", "monitors")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a command.
+
+    Args:
+        argv: Arguments without the program name (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "capture" and args.out is None and not args.clipboard:
+        print("capture needs --out and/or --clipboard", file=sys.stderr)
+        return 2
+
+    set_dpi_awareness()
+    try:
+        return args.handler(args)
+    finally:
+        api.close_session()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
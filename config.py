@@ -3,6 +3,10 @@
 # Hotkey to trigger the screen selection
 HOTKEY = "ctrl+shift+t"
 
+# Hotkey presses during a selection: "drop" them, "queue" one more
+# selection, or "restart" the selection
+HOTKEY_BUSY_POLICY = "drop"
+
 # Overlay transparency (0.0 = fully transparent, 1.0 = fully opaque)
 OVERLAY_ALPHA = 0.3
 
@@ -11,3 +15,116 @@ SELECTION_COLOR = "#00FF00"  # Green
 
 # Selection rectangle border width
 SELECTION_BORDER_WIDTH = 2
+
+# Maximum selection redraws per second while dragging (display refresh rate)
+OVERLAY_MAX_FPS = 60
+
+# Show the selection size and position next to the cursor while dragging
+SHOW_SELECTION_READOUT = True
+
+# Several regions selected together (Shift+drag adds a region): "stitch"
+# them into one image stacked top to bottom, or "sequence" to copy them to
+# the clipboard one after another and keep each in the recent captures.
+# "sequence" needs Windows clipboard history (Win+V); while it is off the
+# regions are stitched and each is still kept in the recent captures
+MULTI_REGION_MODE = "stitch"
+
+# Pixels of white between regions stitched into one image
+MULTI_REGION_GAP = 8
+
+# Grab the screen when the hotkey is pressed and crop the selection from
+# that frozen frame instead of capturing again after the overlay closes
+FREEZE_FRAME = True
+
+# Memory budget for the recent captures history in bytes (0 disables it)
+HISTORY_MAX_BYTES = 64 * 1024 * 1024
+
+# Format used to compress history entries in the background (PNG or WEBP)
+HISTORY_FORMAT = "PNG"
+
+# Reuse encoded payloads when a capture has the same pixels as a recent one
+DEDUP_ENABLED = True
+
+# Number of recent captures remembered for deduplication
+DEDUP_MAX_ENTRIES = 16
+
+# Memory budget for payloads kept for deduplication in bytes
+DEDUP_MAX_BYTES = 64 * 1024 * 1024
+
+# Upload captures straight to Google Lens and open the results page instead
+# of opening a blank Lens page to paste into
+LENS_DIRECT_UPLOAD = False
+
+# Endpoint receiving the multipart upload (point at a local server to test)
+LENS_UPLOAD_URL = "https://lens.google.com/v3/upload"
+
+# Pixel cap for uploaded images; larger captures are downscaled
+UPLOAD_MAX_PIXELS = 4000 * 3000
+
+# Snap the selection corners to window and control edges (hold Alt to
+# place them freely), and the largest distance snapped in pixels
+SNAP_ENABLED = True
+SNAP_DISTANCE = 8
+
+# Prepare captures for recognition before they are copied or uploaded:
+# trim uniform borders, enlarge small text by up to PREPROCESS_MAX_SCALE
+# times (1 disables it) and reduce colours (None, "gray" or "palette";
+# the palette halves text and UI uploads but enlarges photos)
+PREPROCESS_ENABLED = False
+PREPROCESS_TRIM = True
+PREPROCESS_MAX_SCALE = 3
+PREPROCESS_COLORS = None
+
+# Pixel cap of an enlarged capture; larger captures are enlarged less or
+# not at all
+PREPROCESS_MAX_PIXELS = 1920 * 1080
+
+# Region watch (tray "Watch Region"): seconds between polls while the
+# region changes, and the longest pause the polling backs off to while static
+WATCH_INTERVAL = 0.5
+WATCH_MAX_INTERVAL = 5.0
+
+# Changed share of the watched region (0.0-1.0) that copies it again
+WATCH_CHANGE_THRESHOLD = 0.01
+
+# Side in pixels of the tiles the watched region is hashed in
+WATCH_TILE_SIZE = 32
+
+# Region recording (tray "Record Region"): target frames per second, the
+# longest clip in seconds and the output format ("gif" or "webp")
+RECORD_FPS = 10
+RECORD_MAX_SECONDS = 60
+RECORD_FORMAT = "gif"
+
+# Frames waiting for the encoder before new ones are dropped
+RECORD_QUEUE_FRAMES = 16
+
+# Folder recordings are saved to (None uses the Videos folder)
+RECORD_DIR = None
+
+# Serve capture requests from other local programs over a named pipe
+# (Unix socket elsewhere), see core/ipc_server.py. Off by default: any
+# program that can open the endpoint can read the screen
+IPC_ENABLED = False
+
+# Endpoint address (None uses a per-user default) and optional shared
+# secret clients must present; set a secret when enabling IPC
+IPC_ADDRESS = None
+IPC_AUTHKEY = None
+
+# Directory the "file" destination writes captures to; request paths must
+# stay inside it. None refuses file requests
+IPC_OUTPUT_DIR = None
+
+# Record per-stage latency of every capture for the tray "Stats" menu
+TRACE_ENABLED = True
+
+# Number of recent captures the latency percentiles are computed over
+TRACE_WINDOW = 200
+
+# Append every capture's latency trace to this JSONL file (None disables)
+TRACE_FILE = None
+
+# Import modules only needed by the first capture (clipboard, browser, image
+# codecs) in the background once the tray icon is up
+PRELOAD_AFTER_TRAY = True
@@ -0,0 +1,242 @@
+"""
+Public Python API for scripted captures.
+
+Captures share one warm CaptureSession, so scripts pay the grabber setup
+once. Example:
+
+    from core import api
+
+    frame = api.capture((0, 0, 800, 600))
+    api.save(frame, "shot.webp")
+
+    for encoded in api.encode_batch(api.frames((0, 0, 800, 600), fps=2, count=10)):
+        ...
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple
+
+from core.encoder import EncodedImage, encode_image, sniff_mime_type
+from core.frame import Frame
+from core.png_writer import encode_png
+from core.screenshot_capture import CaptureSession
+
+
+# Output formats by file extension
+EXTENSION_FORMATS = {
+    ".png": "png",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".webp": "webp",
+}
+
+# Formats accepted by encode(); "auto" picks one from the content
+FORMATS = ("auto", "png", "png-palette", "jpeg", "webp")
+
+Region = Tuple[int, int, int, int]
+
+_session: Optional[CaptureSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> CaptureSession:
+    """Get the shared capture session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = CaptureSession()
+        return _session
+
+
+def close_session() -> None:
+    """Close the shared capture session; the next capture opens a new one."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def capture(
+    region: Optional[Region] = None,
+    session: Optional[CaptureSession] = None
+) -> Optional[Frame]:
+    """
+    Capture a region of the screen.
+
+    Args:
+        region: (x1, y1, x2, y2) in screen coordinates, or None for the
+                whole virtual screen
+        session: Capture session to use (defaults to the shared one)
+
+    Returns:
+        Frame of the region, or None on failure
+    """
+    session = session or get_session()
+    if region is None:
+        region = session.topology.bounds
+    return session.grab_frame(*region)
+
+
+def format_for_path(path: str, default: str = "png") -> str:
+    """
+    Get the output format matching a file name's extension.
+
+    Args:
+        path: Output file name
+        default: Format for unknown extensions
+
+    Returns:
+        Format name accepted by encode()
+    """
+    return EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), default)
+
+
+def encode(
+    frame: Frame,
+    format: str = "auto",
+    max_pixels: int = 0,
+    quality: Optional[int] = None
+) -> EncodedImage:
+    """
+    Encode a frame.
+
+    Args:
+        frame: Frame to encode
+        format: One of FORMATS
+        max_pixels: Downscale larger frames to this many pixels (0 keeps size)
+        quality: JPEG or WebP quality (encoder default if None)
+
+    Returns:
+        EncodedImage with the data and its format
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {', '.join(FORMATS)}")
+
+    if format == "png" and (max_pixels <= 0 or frame.width * frame.height <= max_pixels):
+        # Lossless PNG streams from the raw frame without an RGB image copy
+        data = encode_png(frame)
+        return EncodedImage(
+            data, "PNG", sniff_mime_type(data), frame.width, frame.height, ""
+        )
+
+    options = {}
+    if quality is not None:
+        options["jpeg_quality"] = quality
+        options["webp_quality"] = quality
+    return encode_image(
+        frame.to_image(), strategy=format, max_pixels=max_pixels, **options
+    )
+
+
+def save(
+    frame: Frame,
+    path: str,
+    format: Optional[str] = None,
+    max_pixels: int = 0,
+    quality: Optional[int] = None
+) -> EncodedImage:
+    """
+    Encode a frame and write it to a file.
+
+    Args:
+        frame: Frame to save
+        path: Output file name
+        format: One of FORMATS (defaults to the one matching the extension)
+        max_pixels: Downscale larger frames to this many pixels (0 keeps size)
+        quality: JPEG or WebP quality (encoder default if None)
+
+    Returns:
+        The EncodedImage written
+    """
+    encoded = encode(frame, format or format_for_path(path), max_pixels, quality)
+    with open(path, "wb") as f:
+        f.write(encoded.data)
+    return encoded
+
+
+def frames(
+    region: Optional[Region] = None,
+    fps: float = 1.0,
+    count: Optional[int] = None,
+    session: Optional[CaptureSession] = None,
+    max_failures: int = 5
+) -> Iterator[Frame]:
+    """
+    Capture a region repeatedly at a fixed rate.
+
+    Captures are scheduled against a fixed timeline, so a slow capture
+    shortens the next wait instead of shifting every later one. A failed
+    capture is skipped; after max_failures in a row (e.g. the region is
+    off every screen or the session is closed) the frames stop.
+
+    Args:
+        region: (x1, y1, x2, y2), or None for the whole virtual screen
+        fps: Captures per second
+        count: Number of frames to yield, or None to continue forever
+        session: Capture session to use (defaults to the shared one)
+        max_failures: Consecutive failed captures before stopping
+
+    Yields:
+        One frame per capture
+    """
+    session = session or get_session()
+    period = 1.0 / fps
+    deadline = time.perf_counter()
+    produced = 0
+    failures = 0
+
+    while count is None or produced < count:
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        deadline = max(deadline + period, time.perf_counter() - period)
+
+        frame = capture(region, session)
+        if frame is None:
+            failures += 1
+            if failures >= max_failures:
+                print(f"Stopping after {failures} failed captures in a row")
+                return
+            continue
+        failures = 0
+        produced += 1
+        yield frame
+
+
+def encode_batch(
+    frames: Iterable[Frame],
+    format: str = "png",
+    max_pixels: int = 0,
+    quality: Optional[int] = None,
+    workers: Optional[int] = None
+) -> Iterator[EncodedImage]:
+    """
+    Encode frames on a worker pool, yielding results in input order.
+
+    PIL's encoders release the GIL, so threads encode in parallel. At most
+    twice as many frames as workers are in flight, so a frames() generator
+    that runs forever does not pile up in memory.
+
+    Args:
+        frames: Frames to encode
+        format: One of FORMATS
+        max_pixels: Downscale larger frames to this many pixels (0 keeps size)
+        quality: JPEG or WebP quality (encoder default if None)
+        workers: Worker threads (defaults to the CPU count)
+
+    Yields:
+        EncodedImage of each frame
+    """
+    workers = workers or os.cpu_count() or 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Encode") as pool:
+        pending = []
+        for frame in frames:
+            pending.append(pool.submit(encode, frame, format, max_pixels, quality))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
@@ -0,0 +1,221 @@
+"""Browser discovery, resolved once and cached between runs."""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+
+def _chrome_paths(environ: Mapping[str, str]) -> List[str]:
+    """Get the Chrome install locations, skipping per-user ones when unset."""
+    paths = [
+        "C:/Program Files/Google/Chrome/Application/chrome.exe",
+        "C:/Program Files (x86)/Google/Chrome/Application/chrome.exe",
+    ]
+    # Without LOCALAPPDATA the join would be a path relative to the cwd
+    if environ.get("LOCALAPPDATA"):
+        paths.append(os.path.join(
+            environ["LOCALAPPDATA"],
+            "Google/Chrome/Application/chrome.exe"
+        ))
+    return paths
+
+
+# Common Chrome install locations on Windows, in order of preference
+CHROME_PATHS = _chrome_paths(os.environ)
+
+# Executable names looked up on PATH, as webbrowser does for these browsers
+CHROME_COMMANDS = ["chrome", "google-chrome"]
+
+_CACHE_VERSION = 1
+
+
+def default_cache_path() -> str:
+    """Get the per-user path of the browser cache file."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "SwiftClip", "browsers.json")
+
+
+class LaunchCandidate(NamedTuple):
+    """A way to open a URL: an executable to spawn, or the default browser."""
+
+    kind: str  # "exe" or "default"
+    target: str
+
+
+DEFAULT_BROWSER = LaunchCandidate("default", "")
+
+
+class FileSystem:
+    """File system access used for probing, replaceable in tests."""
+
+    def getmtime(self, path: str) -> Optional[float]:
+        """Get a file's modification time, or None if it does not exist."""
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def which(self, command: str) -> Optional[str]:
+        """Find an executable on PATH."""
+        return shutil.which(command)
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Read a text file, or None if it cannot be read."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write_text(self, path: str, text: str) -> None:
+        """Write a text file, creating its directory."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+class Launcher:
+    """Starts browsers, replaceable in tests."""
+
+    def spawn(self, executable: str, url: str) -> None:
+        """Start an executable with the URL as its only argument."""
+        subprocess.Popen([executable, url], close_fds=True)
+
+    def open_default(self, url: str) -> None:
+        """Open the URL in the system default browser."""
+        import webbrowser
+        webbrowser.open(url)
+
+
+class BrowserResolver:
+    """
+    Resolves the ordered list of ways to open a URL.
+
+    Probing runs once, in the background at startup. The result is cached
+    in a small JSON file keyed by the modification time of every probed
+    install, so later runs skip probing until a browser is installed,
+    updated or removed.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        paths: Optional[List[str]] = None,
+        commands: Optional[List[str]] = None,
+        fs: Optional[FileSystem] = None,
+        launcher: Optional[Launcher] = None
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            cache_path: Cache file path (defaults to default_cache_path())
+            paths: Executable paths to probe, in order of preference
+            commands: Executable names to look up on PATH
+            fs: File system access
+            launcher: Browser launcher
+        """
+        self.cache_path = cache_path or default_cache_path()
+        self.paths = CHROME_PATHS if paths is None else paths
+        self.commands = CHROME_COMMANDS if commands is None else commands
+        self.fs = fs or FileSystem()
+        self.launcher = launcher or Launcher()
+
+        self._candidates: Optional[List[LaunchCandidate]] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Resolve candidates on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.candidates, name="BrowserResolver", daemon=True
+            )
+            self._thread.start()
+
+    def candidates(self) -> List[LaunchCandidate]:
+        """
+        Get the ordered launch candidates, resolving them on first use.
+
+        Returns:
+            Candidates in order of preference, ending with the default browser
+        """
+        with self._lock:
+            if self._candidates is None:
+                self._candidates = self._load_cache() or self._probe()
+            return list(self._candidates)
+
+    def invalidate(self) -> None:
+        """Forget the resolved candidates so the next use probes again."""
+        with self._lock:
+            self._candidates = None
+
+    def launch(self, url: str) -> bool:
+        """
+        Open a URL with the first candidate that starts.
+
+        Args:
+            url: URL to open
+
+        Returns:
+            True if a browser was started, False otherwise
+        """
+        for candidate in self.candidates():
+            try:
+                if candidate.kind == "exe":
+                    self.launcher.spawn(candidate.target, url)
+                else:
+                    self.launcher.open_default(url)
+                return True
+            except Exception as e:
+                print(f"Failed to launch {candidate.target or 'default browser'}: {e}")
+                # A cached executable may have been removed since probing
+                self.invalidate()
+        return False
+
+    def _probe_state(self) -> Dict[str, Optional[float]]:
+        """Get the modification time of every probed install."""
+        return {path: self.fs.getmtime(path) for path in self.paths}
+
+    def _probe(self) -> List[LaunchCandidate]:
+        """Probe installs and PATH, then write the cache."""
+        state = self._probe_state()
+        candidates = [
+            LaunchCandidate("exe", path)
+            for path, mtime in state.items() if mtime is not None
+        ]
+        for command in self.commands:
+            found = self.fs.which(command)
+            if found and LaunchCandidate("exe", found) not in candidates:
+                candidates.append(LaunchCandidate("exe", found))
+        candidates.append(DEFAULT_BROWSER)
+
+        try:
+            self.fs.write_text(self.cache_path, json.dumps({
+                "version": _CACHE_VERSION,
+                "probes": state,
+                "candidates": [list(c) for c in candidates],
+            }))
+        except Exception as e:
+            print(f"Failed to write browser cache: {e}")
+
+        return candidates
+
+    def _load_cache(self) -> Optional[List[LaunchCandidate]]:
+        """Load cached candidates if every probed install is unchanged."""
+        text = self.fs.read_text(self.cache_path)
+        if not text:
+            return None
+
+        try:
+            cache = json.loads(text)
+            if cache.get("version") != _CACHE_VERSION:
+                return None
+            if cache.get("probes") != self._probe_state():
+                return None
+            return [LaunchCandidate(kind, target) for kind, target in cache["candidates"]]
+        except (ValueError, KeyError, TypeError):
+            return None
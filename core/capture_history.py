@@ -0,0 +1,222 @@
+"""Bounded in-memory history of recent captures."""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from typing import Callable, List, Optional
+
+from PIL import Image
+
+from core.frame import Frame
+from core.png_writer import encode_png
+from core.screenshot_capture import image_to_bytes
+
+
+class HistoryEntry:
+    """A single capture held by the history, raw or compressed."""
+
+    __slots__ = ("id", "timestamp", "width", "height", "frame", "data", "format")
+
+    def __init__(self, entry_id: int, frame: Frame):
+        """
+        Initialize the entry with a raw frame.
+
+        Args:
+            entry_id: Unique id within the history
+            frame: Compact frame owning its pixels
+        """
+        self.id = entry_id
+        self.timestamp = time.time()
+        self.width = frame.width
+        self.height = frame.height
+        self.frame: Optional[Frame] = frame
+        self.data: Optional[bytes] = None
+        self.format: Optional[str] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by this entry."""
+        if self.data is not None:
+            return len(self.data)
+        return self.frame.stride * self.frame.height
+
+    @property
+    def compressed(self) -> bool:
+        """Whether the raw frame has been replaced by encoded data."""
+        return self.data is not None
+
+    def to_image(self) -> Image.Image:
+        """Get the capture as an RGB PIL Image."""
+        if self.data is not None:
+            image = Image.open(BytesIO(self.data))
+            image.load()
+            return image.convert("RGB")
+        return self.frame.to_image()
+
+
+class CaptureHistory:
+    """
+    Recent captures with a byte budget and LRU eviction.
+
+    New captures are stored as raw frames and compressed on a background
+    worker, so adding a capture never encodes on the caller's thread.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        format: str = "PNG",
+        on_change: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize the history.
+
+        Args:
+            max_bytes: Upper bound for the bytes held by all entries
+            format: Image format used to compress entries (PNG, WEBP)
+            on_change: Called after entries are added, compressed or evicted
+        """
+        self.max_bytes = max_bytes
+        self.format = format
+        self.on_change = on_change
+
+        self._entries: "OrderedDict[int, HistoryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._total_bytes = 0
+        self.peak_bytes = 0
+
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._compress_loop, name="HistoryCompressor", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held by all entries."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, frame: Frame) -> Optional[int]:
+        """
+        Add a capture to the history.
+
+        The frame is copied into a compact buffer so views into a larger
+        frozen frame do not keep the whole screen alive.
+
+        Args:
+            frame: Captured frame
+
+        Returns:
+            Entry id, or None if the capture alone exceeds the budget
+        """
+        if frame.width * frame.height * 4 > self.max_bytes:
+            print("Capture exceeds history budget, not stored")
+            return None
+
+        compact = Frame(
+            frame.tobytes(), frame.left, frame.top, frame.width, frame.height
+        )
+
+        with self._lock:
+            entry = HistoryEntry(self._next_id, compact)
+            self._next_id += 1
+            self._make_room(entry.nbytes)
+            self._entries[entry.id] = entry
+            self._account(entry.nbytes)
+
+        self._queue.put(entry.id)
+        self._notify()
+        return entry.id
+
+    def get(self, entry_id: int) -> Optional[HistoryEntry]:
+        """
+        Get an entry and mark it as most recently used.
+
+        Args:
+            entry_id: Entry id
+
+        Returns:
+            The entry, or None if it was evicted
+        """
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is not None:
+                self._entries.move_to_end(entry_id)
+            return entry
+
+    def entries(self) -> List[HistoryEntry]:
+        """Get all entries, most recently used first."""
+        with self._lock:
+            return list(reversed(self._entries.values()))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+        self._notify()
+
+    def close(self) -> None:
+        """Stop the compression worker."""
+        self._queue.put(None)
+        self._worker.join(timeout=2.0)
+
+    def _make_room(self, nbytes: int) -> None:
+        """Evict least recently used entries until nbytes fit the budget."""
+        while self._entries and self._total_bytes + nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.nbytes
+
+    def _account(self, delta: int) -> None:
+        """Adjust the byte total and track its peak."""
+        self._total_bytes += delta
+        self.peak_bytes = max(self.peak_bytes, self._total_bytes)
+
+    def _compress_loop(self) -> None:
+        """Worker thread body: compress queued entries."""
+        while True:
+            entry_id = self._queue.get()
+            if entry_id is None:
+                return
+
+            with self._lock:
+                entry = self._entries.get(entry_id)
+                frame = entry.frame if entry is not None else None
+            if frame is None:
+                continue  # Evicted before it was compressed
+
+            try:
+                if self.format.upper() == "PNG":
+                    data = encode_png(frame)
+                else:
+                    data = image_to_bytes(frame.to_image(), self.format)
+            except Exception as e:
+                print(f"Failed to compress capture: {e}")
+                continue
+
+            with self._lock:
+                if self._entries.get(entry_id) is not entry:
+                    continue
+                if len(data) >= entry.nbytes:
+                    continue  # Keep the raw frame rather than grow
+                old_bytes = entry.nbytes
+                entry.data = data
+                entry.format = self.format
+                entry.frame = None
+                self._account(entry.nbytes - old_bytes)
+
+            self._notify()
+
+    def _notify(self) -> None:
+        """Invoke the change callback, ignoring its errors."""
+        if self.on_change:
+            try:
+                self.on_change()
+            except Exception as e:
+                print(f"History change callback failed: {e}")
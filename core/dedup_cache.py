@@ -0,0 +1,134 @@
+"""Pixel-digest cache for reusing payloads of repeated captures."""
+
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from core.frame import Frame
+
+
+def pixel_digest(frame: Frame) -> int:
+    """
+    Compute a CRC32 of the exact pixels of a frame.
+
+    Args:
+        frame: Frame to digest, contiguous or a strided view
+
+    Returns:
+        CRC32 of the BGRA rows
+    """
+    if frame.stride == frame.width * 4:
+        start = frame.offset
+        end = start + frame.stride * frame.height
+        return zlib.crc32(memoryview(frame.buffer)[start:end])
+    value = 0
+    for y in range(frame.height):
+        value = zlib.crc32(frame.row(y), value)
+    return value
+
+
+class DedupCache:
+    """
+    Recent capture payloads keyed by frame size and pixel digest.
+
+    Only a capture with the same pixels hits, so every cached payload,
+    including the clipboard DIB, can stand in for a fresh encoding.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 16,
+        max_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Number of recent captures to remember
+            max_bytes: Upper bound for the bytes of all cached payloads
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Tuple[int, int, int], Dict[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, frame: Frame) -> Tuple[int, int, int]:
+        """Get the cache key of a frame: its size and pixel digest."""
+        return frame.width, frame.height, pixel_digest(frame)
+
+    def lookup(self, key: Tuple[int, int, int]) -> Optional[Dict[str, bytes]]:
+        """
+        Find payloads cached for a capture with the same pixels.
+
+        Args:
+            key: Key from key()
+
+        Returns:
+            Mapping of payload name to encoded bytes, or None on a miss
+        """
+        with self._lock:
+            payloads = self._entries.get(key)
+            if payloads is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return payloads
+
+    def store(self, key: Tuple[int, int, int], payloads: Dict[str, bytes]) -> None:
+        """
+        Cache the payloads encoded for a capture.
+
+        Args:
+            key: Key from key()
+            payloads: Mapping of payload name to encoded bytes
+        """
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= _size(old)
+            self._entries[key] = dict(payloads)
+            self.total_bytes += _size(payloads)
+            self._evict()
+
+    def add_payload(self, key: Tuple[int, int, int], name: str, data: bytes) -> None:
+        """Attach an encoded payload to a capture, caching it if it is new."""
+        with self._lock:
+            payloads = self._entries.setdefault(key, {})
+            old = payloads.get(name)
+            if old is not None:
+                self.total_bytes -= len(old)
+            payloads[name] = data
+            self.total_bytes += len(data)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond the count or byte limits."""
+        while len(self._entries) > self.max_entries or (
+                len(self._entries) > 1 and self.total_bytes > self.max_bytes):
+            _, payloads = self._entries.popitem(last=False)
+            self.total_bytes -= _size(payloads)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Hit and miss counters."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def _size(payloads: Dict[str, bytes]) -> int:
+    """Total bytes of a capture's payloads."""
+    return sum(len(data) for data in payloads.values())
@@ -0,0 +1,221 @@
+"""Event-driven work dispatch and single-flight capture scheduling."""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+# What happens to a hotkey press that arrives while a capture is running
+BUSY_DROP = "drop"        # Ignore the press
+BUSY_QUEUE = "queue"      # Run one more capture when the current one ends
+BUSY_RESTART = "restart"  # Cancel the current capture and start over
+
+BUSY_POLICIES = (BUSY_DROP, BUSY_QUEUE, BUSY_RESTART)
+
+
+class Dispatcher:
+    """
+    Runs submitted work items in order on a single worker thread.
+
+    The worker blocks on its queue, so an idle dispatcher never wakes up.
+    """
+
+    def __init__(self, name: str = "Dispatcher"):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            name: Worker thread name
+        """
+        self.name = name
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue a call to run on the worker thread.
+
+        Args:
+            fn: Function to call
+            *args: Arguments for fn
+        """
+        self._queue.put((fn, args))
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        Stop the worker after the work already queued.
+
+        Args:
+            timeout: Seconds to wait for the worker to finish
+        """
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Worker thread body."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"{self.name}: unhandled error in {getattr(fn, '__name__', fn)}: {e}")
+
+
+class CaptureRequest:
+    """A single hotkey-triggered capture that can be cancelled."""
+
+    __slots__ = ("requested_at", "cancelled", "trace", "run")
+
+    def __init__(
+        self,
+        requested_at: Optional[float] = None,
+        trace: Any = None,
+        run: Optional[Callable[["CaptureRequest"], None]] = None
+    ):
+        """
+        Initialize the request.
+
+        Args:
+            requested_at: time.perf_counter() of the hotkey press
+            trace: Latency trace carried along with the request
+            run: Performs this capture instead of the scheduler's default
+        """
+        self.requested_at = time.perf_counter() if requested_at is None else requested_at
+        self.cancelled = threading.Event()
+        self.trace = trace
+        self.run = run
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether the request has been cancelled."""
+        return self.cancelled.is_set()
+
+
+class CaptureScheduler:
+    """
+    Single-flight scheduler for capture requests.
+
+    At most one capture runs at a time on the dispatcher. Presses that
+    arrive meanwhile are handled according to the busy policy.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        run: Callable[[CaptureRequest], None],
+        on_cancel: Optional[Callable[[], None]] = None,
+        policy: str = BUSY_DROP
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            dispatcher: Dispatcher that runs the captures
+            run: Performs one capture; should return early once the request
+                 is cancelled
+            on_cancel: Called after a running request is cancelled, e.g. to
+                       close the overlay
+            policy: One of BUSY_DROP, BUSY_QUEUE or BUSY_RESTART
+        """
+        if policy not in BUSY_POLICIES:
+            raise ValueError(f"Unknown busy policy: {policy}")
+
+        self.policy = policy
+        self._dispatcher = dispatcher
+        self._run = run
+        self._on_cancel = on_cancel
+
+        self._lock = threading.Lock()
+        self._active: Optional[CaptureRequest] = None
+        self._pending: Optional[CaptureRequest] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether a capture is running."""
+        return self._active is not None
+
+    def trigger(
+        self,
+        requested_at: Optional[float] = None,
+        trace: Any = None,
+        run: Optional[Callable[[CaptureRequest], None]] = None
+    ) -> Optional[CaptureRequest]:
+        """
+        Handle a hotkey press; safe to call from any thread.
+
+        Args:
+            requested_at: time.perf_counter() of the press
+            trace: Latency trace to attach to the request
+            run: Performs this capture instead of the default, e.g. a
+                 selection for another feature; it follows the same
+                 busy policy and cancellation
+
+        Returns:
+            The new request, or None if the press was dropped
+        """
+        request = CaptureRequest(requested_at, trace, run)
+        cancelled = None
+
+        with self._lock:
+            if self._active is None:
+                self._active = request
+                self._dispatcher.submit(self._execute, request)
+                return request
+
+            if self.policy == BUSY_DROP:
+                return None
+
+            # Only the latest waiting press is kept
+            if self._pending is not None:
+                self._pending.cancelled.set()
+            self._pending = request
+
+            if self.policy == BUSY_RESTART:
+                cancelled = self._active
+                cancelled.cancelled.set()
+
+        if cancelled is not None and self._on_cancel:
+            self._on_cancel()
+        return request
+
+    def cancel(self) -> None:
+        """Cancel the running capture and any waiting one."""
+        with self._lock:
+            active, pending = self._active, self._pending
+            self._pending = None
+            for request in (active, pending):
+                if request is not None:
+                    request.cancelled.set()
+
+        if active is not None and self._on_cancel:
+            self._on_cancel()
+
+    def _execute(self, request: CaptureRequest) -> None:
+        """Run one request on the dispatcher, then start the waiting one."""
+        try:
+            if not request.is_cancelled:
+                (request.run or self._run)(request)
+        except Exception as e:
+            print(f"Capture failed: {e}")
+        finally:
+            with self._lock:
+                self._active, self._pending = self._pending, None
+                if self._active is not None:
+                    self._dispatcher.submit(self._execute, self._active)
@@ -0,0 +1,219 @@
+"""Content-aware image encoding for recognition payloads."""
+
+import math
+from io import BytesIO
+from typing import NamedTuple, Optional
+
+from PIL import Image, ImageChops, features
+
+
+# Classes returned by classify_content
+CONTENT_UI = "ui"
+CONTENT_PHOTO = "photo"
+
+# Longest side of the sample used for classification
+_SAMPLE_SIDE = 256
+
+# Share of pixels identical to their right neighbour above which a capture
+# is treated as flat UI or text rather than a photo
+_FLAT_RATIO = 0.5
+
+# Dense text has less flat area but many sharp edges
+_DENSE_FLAT_RATIO = 0.3
+_DENSE_EDGE_DENSITY = 0.15
+
+# Difference to the right neighbour counted as an edge
+_EDGE_THRESHOLD = 32
+
+_MIME_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+class EncodedImage(NamedTuple):
+    """An encoded capture and how it was produced."""
+
+    data: bytes
+    format: str
+    mime_type: str
+    width: int
+    height: int
+    content: str
+
+
+class ContentStats(NamedTuple):
+    """Cheap statistics gathered from a sample of a capture."""
+
+    colors: Optional[int]
+    flat_ratio: float
+    edge_density: float
+
+
+def sniff_mime_type(data: bytes) -> str:
+    """Get the content type of encoded image data from its magic bytes."""
+    if data.startswith(b"\x89PNG"):
+        return _MIME_TYPES["PNG"]
+    if data.startswith(b"\xff\xd8"):
+        return _MIME_TYPES["JPEG"]
+    if data.startswith(b"RIFF") and data[8:12] == b"WEBP":
+        return _MIME_TYPES["WEBP"]
+    return "application/octet-stream"
+
+
+def _sample(image: Image.Image) -> Image.Image:
+    """Get a small nearest-neighbour sample that keeps exact pixel values."""
+    width, height = image.size
+    factor = max(1, math.ceil(max(width, height) / _SAMPLE_SIDE))
+    if factor == 1:
+        return image
+    return image.resize(
+        (max(1, width // factor), max(1, height // factor)), Image.NEAREST
+    )
+
+
+def content_stats(image: Image.Image) -> ContentStats:
+    """
+    Measure colour count, flat area and edge density on a sample.
+
+    Args:
+        image: RGB PIL Image
+
+    Returns:
+        Colour count (None if above 4096), share of pixels equal to their
+        right neighbour, and share of strong horizontal edges
+    """
+    sample = _sample(image.convert("RGB"))
+    colors = sample.getcolors(4096)
+
+    gray = sample.convert("L")
+    width, height = gray.size
+    if width < 2:
+        return ContentStats(len(colors) if colors else None, 1.0, 0.0)
+
+    left = gray.crop((0, 0, width - 1, height))
+    right = gray.crop((1, 0, width, height))
+    histogram = ImageChops.difference(left, right).histogram()
+    total = float(sum(histogram))
+
+    return ContentStats(
+        len(colors) if colors is not None else None,
+        histogram[0] / total,
+        sum(histogram[_EDGE_THRESHOLD:]) / total
+    )
+
+
+def classify_content(image: Image.Image) -> str:
+    """
+    Classify a capture as flat UI/text or photo-like content.
+
+    Args:
+        image: PIL Image
+
+    Returns:
+        CONTENT_UI or CONTENT_PHOTO
+    """
+    stats = content_stats(image)
+    if stats.colors is not None and stats.colors <= 256:
+        return CONTENT_UI
+    if stats.flat_ratio >= _FLAT_RATIO:
+        return CONTENT_UI
+    if (stats.flat_ratio >= _DENSE_FLAT_RATIO
+            and stats.edge_density >= _DENSE_EDGE_DENSITY):
+        return CONTENT_UI
+    return CONTENT_PHOTO
+
+
+def limit_pixels(image: Image.Image, max_pixels: int) -> Image.Image:
+    """
+    Downscale an image with high-quality resampling to fit a pixel budget.
+
+    Args:
+        image: PIL Image
+        max_pixels: Maximum width * height (0 disables the cap)
+
+    Returns:
+        The original image if it fits, otherwise a resized copy
+    """
+    width, height = image.size
+    if max_pixels <= 0 or width * height <= max_pixels:
+        return image
+
+    scale = math.sqrt(max_pixels / float(width * height))
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+def encode_image(
+    image: Image.Image,
+    strategy: str = "auto",
+    max_pixels: int = 0,
+    photo_strategy: str = "jpeg",
+    jpeg_quality: int = 85,
+    webp_quality: int = 80,
+    png_compress_level: int = 6
+) -> EncodedImage:
+    """
+    Encode a capture with settings chosen for its content.
+
+    Strategies:
+        auto: classify, then use png-palette for UI/text and
+              photo_strategy for photos
+        png: lossless RGB PNG
+        png-palette: PNG with an adaptive palette of at most 256 colours
+        jpeg: JPEG at jpeg_quality
+        webp: WebP at webp_quality
+
+    Args:
+        image: PIL Image
+        strategy: One of the strategies above
+        max_pixels: Pixel cap applied before encoding (0 disables it)
+        photo_strategy: Strategy used by auto for photos (jpeg is several
+                        times faster to encode, webp is smaller)
+        jpeg_quality: JPEG quality (1-95)
+        webp_quality: WebP quality (1-100)
+        png_compress_level: zlib level for PNG (0-9)
+
+    Returns:
+        EncodedImage with the payload and chosen format
+    """
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    content = classify_content(image) if strategy == "auto" else ""
+    if strategy == "auto":
+        if content == CONTENT_UI:
+            strategy = "png-palette"
+        elif photo_strategy == "webp" and not features.check("webp"):
+            strategy = "jpeg"
+        else:
+            strategy = photo_strategy
+
+    image = limit_pixels(image, max_pixels)
+
+    buffer = BytesIO()
+    if strategy == "png":
+        format = "PNG"
+        image.save(buffer, format, compress_level=png_compress_level)
+    elif strategy == "png-palette":
+        format = "PNG"
+        colors = image.getcolors(256)
+        palette = image.quantize(
+            colors=len(colors) if colors else 256,
+            method=Image.Quantize.FASTOCTREE
+        )
+        palette.save(buffer, format, compress_level=png_compress_level)
+    elif strategy == "jpeg":
+        format = "JPEG"
+        image.save(buffer, format, quality=jpeg_quality, optimize=False)
+    elif strategy == "webp":
+        format = "WEBP"
+        image.save(buffer, format, quality=webp_quality, method=4)
+    else:
+        raise ValueError(f"Unknown encoding strategy: {strategy}")
+
+    return EncodedImage(
+        buffer.getvalue(),
+        format,
+        _MIME_TYPES[format],
+        image.width,
+        image.height,
+        content
+    )
@@ -0,0 +1,188 @@
+"""Raw BGRA frame representation shared by capture, crop and encode paths."""
+
+from typing import Any, Iterator, List, Optional
+
+from PIL import Image
+
+
+class Frame:
+    """
+    A rectangle of raw BGRA screen pixels.
+
+    The pixels live in a shared buffer addressed by offset and stride, so
+    cropping a frame only creates a new view and never copies pixel data.
+    """
+
+    __slots__ = ("buffer", "left", "top", "width", "height", "stride", "offset")
+
+    def __init__(
+        self,
+        buffer: Any,
+        left: int,
+        top: int,
+        width: int,
+        height: int,
+        stride: Optional[int] = None,
+        offset: int = 0
+    ):
+        """
+        Initialize the frame.
+
+        Args:
+            buffer: Object supporting the buffer protocol with BGRA pixels
+            left: Screen x coordinate of the first pixel
+            top: Screen y coordinate of the first pixel
+            width: Width in pixels
+            height: Height in pixels
+            stride: Bytes per row in the buffer (defaults to width * 4)
+            offset: Byte offset of the first pixel in the buffer
+        """
+        self.buffer = buffer
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.stride = width * 4 if stride is None else stride
+        self.offset = offset
+
+    @classmethod
+    def from_screenshot(cls, screenshot: Any) -> "Frame":
+        """Wrap an mss ScreenShot without copying its raw buffer."""
+        return cls(
+            screenshot.raw,
+            screenshot.left,
+            screenshot.top,
+            screenshot.width,
+            screenshot.height
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<Frame pos={self.left},{self.top} "
+            f"size={self.width}x{self.height} stride={self.stride}>"
+        )
+
+    @property
+    def right(self) -> int:
+        """Screen x coordinate just past the last column."""
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        """Screen y coordinate just past the last row."""
+        return self.top + self.height
+
+    @property
+    def size(self) -> tuple:
+        """Frame size as (width, height)."""
+        return self.width, self.height
+
+    def contains(self, left: int, top: int, right: int, bottom: int) -> bool:
+        """Check whether a screen rectangle lies entirely inside the frame."""
+        return (
+            left >= self.left and top >= self.top
+            and right <= self.right and bottom <= self.bottom
+        )
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int) -> Optional["Frame"]:
+        """
+        Crop a screen rectangle out of the frame without copying pixels.
+
+        Args:
+            x1: Left screen coordinate
+            y1: Top screen coordinate
+            x2: Right screen coordinate
+            y2: Bottom screen coordinate
+
+        Returns:
+            Frame viewing the same buffer, or None if the rectangle is empty
+            or not fully inside this frame
+        """
+        left, right = min(x1, x2), max(x1, x2)
+        top, bottom = min(y1, y2), max(y1, y2)
+
+        if right <= left or bottom <= top:
+            return None
+        if not self.contains(left, top, right, bottom):
+            return None
+
+        offset = (
+            self.offset
+            + (top - self.top) * self.stride
+            + (left - self.left) * 4
+        )
+        return Frame(
+            self.buffer, left, top, right - left, bottom - top,
+            self.stride, offset
+        )
+
+    def bands(self, rows: int) -> Iterator["Frame"]:
+        """
+        Split the frame into horizontal bands without copying pixels.
+
+        Args:
+            rows: Rows per band; the last band may be shorter
+
+        Yields:
+            Frames viewing consecutive row ranges, top to bottom
+        """
+        for y in range(0, self.height, rows):
+            yield Frame(
+                self.buffer, self.left, self.top + y, self.width,
+                min(rows, self.height - y), self.stride,
+                self.offset + y * self.stride
+            )
+
+    def row(self, y: int) -> memoryview:
+        """Get a zero-copy view of the BGRA bytes of row y (frame-relative)."""
+        start = self.offset + y * self.stride
+        return memoryview(self.buffer)[start:start + self.width * 4]
+
+    def tobytes(self) -> bytes:
+        """Get the pixels as contiguous BGRA bytes."""
+        if self.stride == self.width * 4:
+            start = self.offset
+            return bytes(memoryview(self.buffer)[start:start + self.stride * self.height])
+        return b"".join(self.row(y) for y in range(self.height))
+
+    def to_image(self) -> Image.Image:
+        """
+        Convert the frame to an RGB PIL Image.
+
+        The BGRA to RGB conversion is done by PIL's raw decoder directly from
+        the strided buffer, so only the output image is allocated.
+        """
+        view = memoryview(self.buffer)[self.offset:]
+        return Image.frombuffer(
+            "RGB", (self.width, self.height), view,
+            "raw", "BGRX", self.stride, 1
+        )
+
+
+def stack_frames(frames: List[Frame], gap: int = 0, background: int = 0xFF) -> Frame:
+    """
+    Stack frames top to bottom into one new frame, left-aligned.
+
+    Args:
+        frames: Frames in the order they are stacked
+        gap: Rows of background between two frames
+        background: Byte value of every channel of the background
+                    (0xFF is white)
+
+    Returns:
+        Frame positioned at the first frame's screen position
+    """
+    width = max(frame.width for frame in frames)
+    height = sum(frame.height for frame in frames) + gap * (len(frames) - 1)
+    stride = width * 4
+    canvas = bytearray([background]) * (stride * height)
+
+    top = 0
+    for frame in frames:
+        row_bytes = frame.width * 4
+        for y in range(frame.height):
+            start = (top + y) * stride
+            canvas[start:start + row_bytes] = frame.row(y)
+        top += frame.height + gap
+
+    return Frame(canvas, frames[0].left, frames[0].top, width, height)
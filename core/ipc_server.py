@@ -0,0 +1,430 @@
+"""
+Local IPC endpoint for triggering captures from other programs.
+
+Messages are UTF-8 JSON objects, one per send_bytes() call over a
+multiprocessing.connection channel: a named pipe on Windows, a Unix socket
+elsewhere. A request names a command and may carry an "id" that the
+response echoes:
+
+    {"id": 1, "command": "capture", "region": [0, 0, 800, 600],
+     "format": "png", "destination": "inline"}
+    {"id": 1, "ok": true, "format": "PNG", "width": 800, ...}
+
+Failed requests get {"ok": false, "error": "..."}.
+"""
+
+import base64
+import getpass
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Optional
+
+from core import api
+from core.screenshot_capture import CaptureSession
+
+
+# Largest request accepted, in bytes
+MAX_REQUEST_BYTES = 64 * 1024
+
+# Where capture results go
+DESTINATIONS = ("inline", "file", "clipboard")
+
+Handler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class RequestError(Exception):
+    """A request that cannot be served; the message is sent to the client."""
+
+
+def default_address() -> str:
+    """
+    Get the per-user endpoint address.
+
+    Returns:
+        Named pipe path on Windows, Unix socket path elsewhere
+    """
+    user = "".join(c for c in getpass.getuser() if c.isalnum()) or "user"
+    if sys.platform == "win32":
+        return rf"\\.\pipe\SwiftClip-{user}"
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"swiftclip-{user}.sock")
+
+
+def _family(address: str) -> str:
+    """Get the multiprocessing.connection family of an address."""
+    return "AF_PIPE" if address.startswith("\\\\") else "AF_UNIX"
+
+
+class IpcServer:
+    """
+    Serves JSON requests from local clients.
+
+    Every client connection gets a reader thread, so slow clients do not
+    block each other. Requests from all clients go through one bounded
+    queue drained by a few workers; when the queue is full, requests are
+    answered with a "busy" error right away instead of piling up.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Handler],
+        address: Optional[str] = None,
+        authkey: Optional[bytes] = None,
+        workers: int = 2,
+        max_queue: int = 16
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            handlers: Function per command name, called on a worker with the
+                      request and returning the response fields
+            address: Endpoint address (defaults to default_address())
+            authkey: Shared secret clients must know, or None for no
+                     authentication beyond the endpoint's permissions
+            workers: Number of requests handled at the same time
+            max_queue: Requests waiting for a worker before new ones are
+                       rejected as busy
+        """
+        self.handlers = dict(handlers)
+        self.handlers.setdefault("ping", lambda request: {})
+        self.address = address or default_address()
+        self._authkey = authkey
+        self._worker_count = workers
+
+        self._requests: "queue.Queue[Optional[tuple]]" = queue.Queue(max_queue)
+        self._listener: Optional[Listener] = None
+        self._threads: List[threading.Thread] = []
+        self._connections: List[Connection] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+        self.served = 0
+        self.rejected = 0
+
+    def start(self) -> bool:
+        """
+        Start listening.
+
+        Returns:
+            True if the endpoint is open, False if it is in use or failed
+        """
+        family = _family(self.address)
+        if family == "AF_UNIX" and os.path.exists(self.address):
+            if self._endpoint_alive():
+                print(f"IPC endpoint {self.address} is already in use")
+                return False
+            os.unlink(self.address)  # Left over from a crashed instance
+
+        try:
+            self._listener = Listener(self.address, family, authkey=self._authkey)
+        except OSError as e:
+            print(f"Failed to open IPC endpoint {self.address}: {e}")
+            return False
+        if family == "AF_UNIX":
+            os.chmod(self.address, 0o600)
+
+        self._stopping.clear()
+        self._spawn(self._accept_loop, "IpcAccept")
+        for index in range(self._worker_count):
+            self._spawn(self._work_loop, f"IpcWorker-{index}")
+        return True
+
+    def stop(self) -> None:
+        """Stop listening, disconnect clients and stop the workers."""
+        if self._listener is None:
+            return
+        self._stopping.set()
+
+        # Wake the accept loop with a throwaway connection
+        try:
+            Client(self.address, _family(self.address), authkey=self._authkey).close()
+        except Exception:
+            pass
+        self._listener.close()
+        self._listener = None
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+        for _ in range(self._worker_count):
+            self._requests.put(None)
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def _endpoint_alive(self) -> bool:
+        """Whether another server answers on the address."""
+        try:
+            Client(self.address, _family(self.address), authkey=self._authkey).close()
+            return True
+        except Exception:
+            return False
+
+    def _spawn(self, target: Callable[..., None], name: str, *args: Any) -> None:
+        """Start a daemon thread owned by the server."""
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _accept_loop(self) -> None:
+        """Accept clients until stopped."""
+        while not self._stopping.is_set():
+            try:
+                connection = self._listener.accept()
+            except Exception as e:
+                if not self._stopping.is_set():
+                    print(f"IPC accept failed: {e}")
+                continue
+            if self._stopping.is_set():
+                connection.close()
+                return
+
+            with self._lock:
+                self._connections.append(connection)
+            threading.Thread(
+                target=self._read_loop, args=(connection,),
+                name="IpcClient", daemon=True
+            ).start()
+
+    def _read_loop(self, connection: Connection) -> None:
+        """Queue every request a client sends until it disconnects."""
+        send_lock = threading.Lock()
+        try:
+            while True:
+                try:
+                    payload = connection.recv_bytes(MAX_REQUEST_BYTES)
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    request = json.loads(payload.decode("utf-8"))
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    self._respond(
+                        connection, send_lock, {}, {"ok": False, "error": f"Bad request: {e}"}
+                    )
+                    continue
+
+                try:
+                    self._requests.put_nowait((connection, send_lock, request))
+                except queue.Full:
+                    self.rejected += 1
+                    self._respond(connection, send_lock, request, {"ok": False, "error": "busy"})
+        finally:
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            connection.close()
+
+    def _work_loop(self) -> None:
+        """Handle queued requests until stopped."""
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            connection, send_lock, request = item
+            self._respond(connection, send_lock, request, self._handle(request))
+
+    def _handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the handler of a request and build the response."""
+        handler = self.handlers.get(request.get("command"))
+        if handler is None:
+            return {"ok": False, "error": f"Unknown command: {request.get('command')}"}
+        try:
+            response = {"ok": True}
+            response.update(handler(request))
+            self.served += 1
+            return response
+        except RequestError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            print(f"IPC request failed: {e}")
+            return {"ok": False, "error": f"Internal error: {e}"}
+
+    @staticmethod
+    def _respond(
+        connection: Connection,
+        send_lock: threading.Lock,
+        request: Dict[str, Any],
+        response: Dict[str, Any]
+    ) -> None:
+        """Send a response, echoing the request id."""
+        if "id" in request:
+            response["id"] = request["id"]
+        try:
+            with send_lock:
+                connection.send_bytes(json.dumps(response).encode("utf-8"))
+        except (OSError, ValueError):
+            pass  # Client went away
+
+
+class IpcClient:
+    """Sends requests to a running IpcServer."""
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None):
+        """
+        Connect to the server.
+
+        Args:
+            address: Endpoint address (defaults to default_address())
+            authkey: Shared secret configured on the server
+        """
+        address = address or default_address()
+        self._connection = Client(address, _family(address), authkey=authkey)
+        self._next_id = 0
+
+    def __enter__(self) -> "IpcClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def request(self, command: str, **params: Any) -> Dict[str, Any]:
+        """
+        Send one request and wait for its response.
+
+        Args:
+            command: Command name
+            params: Request fields
+
+        Returns:
+            Response object; "ok" tells whether it succeeded
+        """
+        self._next_id += 1
+        message = dict(params, command=command, id=self._next_id)
+        self._connection.send_bytes(json.dumps(message).encode("utf-8"))
+        return json.loads(self._connection.recv_bytes().decode("utf-8"))
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._connection.close()
+
+
+def output_path(output_dir: str, path: str) -> str:
+    """
+    Resolve a client-supplied file name inside the output directory.
+
+    Args:
+        output_dir: Directory file captures are written to
+        path: File name, optionally in a subdirectory, relative to it
+
+    Returns:
+        Absolute path of the file
+
+    Raises:
+        RequestError: If the path leaves the directory or its extension is
+                      not an image format
+    """
+    if os.path.splitext(path)[1].lower() not in api.EXTENSION_FORMATS:
+        raise RequestError(
+            f"path must end in one of {', '.join(api.EXTENSION_FORMATS)}"
+        )
+    root = os.path.realpath(output_dir)
+    # realpath also resolves symlinks, so a link cannot point outside
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.isabs(path) or os.path.commonpath([root, resolved]) != root:
+        raise RequestError("path must stay inside the output directory")
+    return resolved
+
+
+def capture_handlers(
+    session: CaptureSession,
+    copy_to_clipboard: Optional[Callable[[Any], bool]] = None,
+    output_dir: Optional[str] = None
+) -> Dict[str, Handler]:
+    """
+    Build the handlers serving captures from a warm session.
+
+    Requests take "region" ([x1, y1, x2, y2], default all monitors),
+    "format" (see api.FORMATS, default "auto"), "max_pixels", "quality" and
+    "destination":
+        inline: respond with the image as base64 "data"
+        file: write the image to "path", relative to output_dir
+        clipboard: copy the capture to the clipboard
+
+    Args:
+        session: Capture session shared with the application
+        copy_to_clipboard: Copies a frame, returning success (defaults to
+                           utils.clipboard.copy_frame_to_clipboard)
+        output_dir: Directory the file destination writes to, or None to
+                    refuse file requests
+
+    Returns:
+        Handler per command name
+    """
+    def capture(request: Dict[str, Any]) -> Dict[str, Any]:
+        destination = request.get("destination", "inline")
+        if destination not in DESTINATIONS:
+            raise RequestError(f"Unknown destination: {destination}")
+        if destination == "file":
+            if output_dir is None:
+                raise RequestError("file destination is disabled")
+            if not isinstance(request.get("path"), str) or not request["path"]:
+                raise RequestError("file destination needs a path")
+            path = output_path(output_dir, request["path"])
+        format = request.get("format", "auto")
+        if format not in api.FORMATS:
+            raise RequestError(f"Unknown format: {format}")
+        # A format that doesn't match the extension would write e.g. JPEG
+        # bytes into a .png file; png-palette is still PNG
+        if destination == "file" and "format" in request and (
+                format.partition("-")[0] != api.format_for_path(path)):
+            raise RequestError(
+                f"format {format} does not match the extension of {request['path']}"
+            )
+        region = request.get("region")
+        if region is not None:
+            if (not isinstance(region, list) or len(region) != 4
+                    or not all(isinstance(v, int) for v in region)):
+                raise RequestError("region must be [x1, y1, x2, y2]")
+            region = tuple(region)
+
+        frame = api.capture(region, session)
+        if frame is None:
+            raise RequestError("Capture failed")
+
+        if destination == "clipboard":
+            copy = copy_to_clipboard
+            if copy is None:
+                from utils.clipboard import copy_frame_to_clipboard as copy
+            if not copy(frame):
+                raise RequestError("Failed to copy to clipboard")
+            return {"width": frame.width, "height": frame.height}
+
+        options = (request.get("max_pixels", 0), request.get("quality"))
+        if destination == "file":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            encoded = api.save(frame, path, request.get("format"), *options)
+        else:
+            encoded = api.encode(frame, format, *options)
+
+        response = {
+            "format": encoded.format,
+            "mime_type": encoded.mime_type,
+            "width": encoded.width,
+            "height": encoded.height,
+            "bytes": len(encoded.data),
+        }
+        if destination == "file":
+            response["path"] = path
+        else:
+            response["data"] = base64.b64encode(encoded.data).decode("ascii")
+        return response
+
+    def monitors(request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"monitors": [
+            {"region": [m.left, m.top, m.right, m.bottom],
+             "scale": m.scale, "primary": m.primary}
+            for m in session.topology.monitors
+        ]}
+
+    return {"capture": capture, "monitors": monitors}
@@ -1,74 +1,44 @@
 """Google Lens integration module."""
 
-import webbrowser
+from typing import Optional
 
-
-GOOGLE_LENS_URL = "https://lens.google.com/"
+from core.browser_resolver import BrowserResolver
 
 
-def open_google_lens() -> bool:
-    """
-    Open Google Lens in browser.
+GOOGLE_LENS_URL = "https://lens.google.com/"
 
-    Returns:
-        True if browser was opened successfully, False otherwise
-    """
-    try:
-        # Try to open with Chrome specifically
-        chrome_opened = _try_open_chrome(GOOGLE_LENS_URL)
+_default_resolver: Optional[BrowserResolver] = None
 
-        if not chrome_opened:
-            # Fall back to default browser
-            print("Chrome not found, opening in default browser...")
-            webbrowser.open(GOOGLE_LENS_URL)
 
-        return True
+def get_default_resolver() -> BrowserResolver:
+    """Get the shared browser resolver, creating it on first use."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = BrowserResolver()
+    return _default_resolver
 
-    except Exception as e:
-        print(f"Failed to open Google Lens: {e}")
-        return False
 
-
-def _try_open_chrome(url: str) -> bool:
+def open_google_lens(
+    url: str = GOOGLE_LENS_URL,
+    resolver: Optional[BrowserResolver] = None
+) -> bool:
     """
-    Try to open URL in Chrome browser.
+    Open Google Lens in browser.
+
+    Chrome is preferred; the default browser is the last resort.
 
     Args:
-        url: URL to open
+        url: Lens page to open, e.g. the results page of an upload
+        resolver: Browser resolver (defaults to a shared instance)
 
     Returns:
-        True if Chrome was opened successfully, False otherwise
+        True if browser was opened successfully, False otherwise
     """
-    # Common Chrome paths on Windows
-    chrome_paths = [
-        "C:/Program Files/Google/Chrome/Application/chrome.exe",
-        "C:/Program Files (x86)/Google/Chrome/Application/chrome.exe",
-        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-    ]
-
-    for chrome_path in chrome_paths:
-        try:
-            chrome = webbrowser.get(f'"{chrome_path}" %s')
-            chrome.open(url)
-            return True
-        except webbrowser.Error:
-            continue
-
-    # Try registered Chrome browser
     try:
-        chrome = webbrowser.get('chrome')
-        chrome.open(url)
-        return True
-    except webbrowser.Error:
-        pass
+        if resolver is None:
+            resolver = get_default_resolver()
+        return resolver.launch(url)
 
-    # Try google-chrome (common alias)
-    try:
-        chrome = webbrowser.get('google-chrome')
-        chrome.open(url)
-        return True
-    except webbrowser.Error:
-        pass
-
-    return False
+    except Exception as e:
+        print(f"Failed to open Google Lens: {e}")
+        return False
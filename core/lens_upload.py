@@ -0,0 +1,208 @@
+"""Direct image upload to Google Lens over pooled keep-alive connections."""
+
+import http.client
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+
+# Errors raised when a pooled connection was closed by the server while idle
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+def build_multipart(
+    field: str, filename: str, data: bytes, mime_type: str
+) -> Tuple[bytes, str]:
+    """
+    Build a multipart/form-data body with a single file field.
+
+    Args:
+        field: Form field name
+        filename: File name reported for the upload
+        data: File contents
+        mime_type: File content type
+
+    Returns:
+        Tuple of (body, content type header value)
+    """
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {mime_type}\r\n\r\n"
+    ).encode("ascii")
+    tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+    return head + data + tail, f"multipart/form-data; boundary={boundary}"
+
+
+class LensUploader:
+    """
+    Uploads captures to a Lens-compatible endpoint.
+
+    Connections are kept alive in a small pool and can be opened ahead of
+    time with prewarm(), so DNS resolution and the TLS handshake overlap
+    with the user dragging the selection.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        pool_size: int = 2,
+        timeout: float = 10.0,
+        field: str = "encoded_image"
+    ):
+        """
+        Initialize the uploader.
+
+        Args:
+            endpoint: Upload URL (http or https), e.g. config.LENS_UPLOAD_URL
+            pool_size: Maximum idle connections kept open
+            timeout: Socket timeout in seconds
+            field: Multipart field name for the image
+        """
+        parts = urlsplit(endpoint)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported upload URL: {endpoint}")
+
+        self.endpoint = endpoint
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.field = field
+
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path or "/"
+        self._query = parts.query
+
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._warming = False
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """Create an unconnected connection to the endpoint host."""
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(
+                self._host, self._port, timeout=self.timeout
+            )
+        return http.client.HTTPConnection(
+            self._host, self._port, timeout=self.timeout
+        )
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Take an idle connection or create a new one.
+
+        Returns:
+            Tuple of (connection, whether it was reused from the pool)
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def prewarm(self) -> None:
+        """
+        Open a connection in the background if none is idle.
+
+        Returns immediately; safe to call from any thread.
+        """
+        with self._lock:
+            if self._idle or self._warming:
+                return
+            self._warming = True
+
+        threading.Thread(target=self._warm, name="LensPrewarm", daemon=True).start()
+
+    def _warm(self) -> None:
+        """Connect one pooled connection, performing DNS and TLS up front."""
+        start = time.perf_counter()
+        try:
+            conn = self._new_connection()
+            conn.connect()
+            self._release(conn)
+            print(f"Lens connection warmed in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"Failed to pre-warm Lens connection: {e}")
+        finally:
+            with self._lock:
+                self._warming = False
+
+    def upload(
+        self,
+        data: bytes,
+        mime_type: str,
+        filename: str = "capture"
+    ) -> Optional[str]:
+        """
+        Upload an encoded image and return the results page URL.
+
+        Args:
+            data: Encoded image bytes
+            mime_type: Content type of the image
+            filename: File name reported for the upload
+
+        Returns:
+            Absolute results URL, or None on failure
+        """
+        body, content_type = build_multipart(self.field, filename, data, mime_type)
+        path = f"{self._path}?{self._query}" if self._query else self._path
+        headers = {
+            "Content-Type": content_type,
+            "Content-Length": str(len(body)),
+            "Connection": "keep-alive",
+        }
+
+        for _ in range(2):
+            conn, reused = self._acquire()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+            except _STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused:
+                    continue  # The server closed it while idle, retry fresh
+                print(f"Lens upload failed: {e}")
+                return None
+            except Exception as e:
+                conn.close()
+                print(f"Lens upload failed: {e}")
+                return None
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            location = response.getheader("Location")
+            if 300 <= response.status < 400 and location:
+                return urljoin(self.endpoint, location)
+
+            print(f"Lens upload returned HTTP {response.status} without a redirect")
+            return None
+
+        return None
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
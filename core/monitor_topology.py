@@ -0,0 +1,367 @@
+"""Monitor layout with per-monitor scale factors and a spatial index."""
+
+import bisect
+import ctypes
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# GetDpiForMonitor type returning the DPI the user picked in Settings
+MDT_EFFECTIVE_DPI = 0
+
+# dwFlags bit of MONITORINFO set on the primary monitor
+MONITORINFOF_PRIMARY = 1
+
+# DPI of a monitor at 100% scaling
+BASE_DPI = 96
+
+
+class Monitor(NamedTuple):
+    """A monitor in physical screen coordinates."""
+
+    left: int
+    top: int
+    width: int
+    height: int
+    scale: float = 1.0
+    primary: bool = False
+
+    @property
+    def right(self) -> int:
+        """Screen x coordinate just past the last column."""
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> int:
+        """Screen y coordinate just past the last row."""
+        return self.top + self.height
+
+    def intersect(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Clip a rectangle to this monitor.
+
+        Returns:
+            Clipped (x1, y1, x2, y2), or None if they do not overlap
+        """
+        left = max(x1, self.left)
+        top = max(y1, self.top)
+        right = min(x2, self.right)
+        bottom = min(y2, self.bottom)
+        if left >= right or top >= bottom:
+            return None
+        return left, top, right, bottom
+
+
+class Placement(NamedTuple):
+    """Where one monitor's part of a capture goes in the stitched result."""
+
+    monitor: Monitor
+    source: Tuple[int, int, int, int]
+    dest: Tuple[int, int]
+    size: Tuple[int, int]
+
+    @property
+    def scaled(self) -> bool:
+        """Whether the grabbed pixels have to be resized."""
+        x1, y1, x2, y2 = self.source
+        return self.size != (x2 - x1, y2 - y1)
+
+
+class TopologyProvider(ABC):
+    """Reports the monitor layout, replaceable in tests."""
+
+    @abstractmethod
+    def monitors(self) -> List[Monitor]:
+        """Get the monitors in enumeration order."""
+        raise NotImplementedError
+
+
+class StaticTopologyProvider(TopologyProvider):
+    """Fixed layout, for synthetic setups and platforms without DPI info."""
+
+    def __init__(self, monitors: Sequence[Monitor]):
+        """
+        Initialize the provider.
+
+        Args:
+            monitors: Monitors to report
+        """
+        self._monitors = list(monitors)
+
+    @classmethod
+    def from_mss(cls, monitors: List[Dict[str, int]]) -> "StaticTopologyProvider":
+        """
+        Build a layout from an mss monitor list, assuming 100% scaling.
+
+        The primary monitor is the one at the virtual screen origin.
+
+        Args:
+            monitors: mss monitor dicts; index 0 is the combined virtual screen
+        """
+        return cls([
+            Monitor(m["left"], m["top"], m["width"], m["height"],
+                    primary=m["left"] == 0 and m["top"] == 0)
+            for m in monitors[1:]
+        ])
+
+    def monitors(self) -> List[Monitor]:
+        """Get the monitors in enumeration order."""
+        return list(self._monitors)
+
+
+class Win32TopologyProvider(TopologyProvider):
+    """Enumerates monitors and their effective DPI with the Win32 API."""
+
+    def monitors(self) -> List[Monitor]:
+        """
+        Get the monitors in enumeration order, the same order mss uses.
+
+        Returns:
+            Monitors, or an empty list if enumeration failed
+        """
+        if sys.platform != "win32":
+            return []
+        try:
+            import ctypes.wintypes as wintypes
+
+            class MONITORINFO(ctypes.Structure):
+                _fields_ = [
+                    ("cbSize", wintypes.DWORD),
+                    ("rcMonitor", wintypes.RECT),
+                    ("rcWork", wintypes.RECT),
+                    ("dwFlags", wintypes.DWORD),
+                ]
+
+            enum_proc = ctypes.WINFUNCTYPE(
+                ctypes.c_int,
+                wintypes.HMONITOR,
+                wintypes.HDC,
+                ctypes.POINTER(wintypes.RECT),
+                wintypes.LPARAM
+            )
+            handles: List[Any] = []
+
+            def collect(handle, hdc, rect, data):
+                handles.append(handle)
+                return 1
+
+            user32 = ctypes.windll.user32
+            user32.EnumDisplayMonitors(None, None, enum_proc(collect), 0)
+
+            monitors = []
+            for handle in handles:
+                info = MONITORINFO()
+                info.cbSize = ctypes.sizeof(MONITORINFO)
+                if not user32.GetMonitorInfoW(handle, ctypes.byref(info)):
+                    continue
+                rect = info.rcMonitor
+                monitors.append(Monitor(
+                    rect.left,
+                    rect.top,
+                    rect.right - rect.left,
+                    rect.bottom - rect.top,
+                    scale=self._scale(handle),
+                    primary=bool(info.dwFlags & MONITORINFOF_PRIMARY)
+                ))
+            return monitors
+        except Exception as e:
+            print(f"Monitor enumeration failed: {e}")
+            return []
+
+    @staticmethod
+    def _scale(handle: Any) -> float:
+        """Get a monitor's scale factor, or 1.0 before Windows 8.1."""
+        try:
+            dpi_x = ctypes.c_uint()
+            dpi_y = ctypes.c_uint()
+            result = ctypes.windll.shcore.GetDpiForMonitor(
+                handle, MDT_EFFECTIVE_DPI, ctypes.byref(dpi_x), ctypes.byref(dpi_y)
+            )
+            if result == 0 and dpi_x.value:
+                return dpi_x.value / BASE_DPI
+        except Exception:
+            pass
+        return 1.0
+
+
+class MonitorTopology:
+    """
+    Spatial index over a monitor layout.
+
+    The distinct monitor edges split the virtual screen into a grid of
+    cells, each owned by at most one monitor. Point and rectangle queries
+    find their cells with a binary search over the edges.
+    """
+
+    def __init__(self, monitors: Sequence[Monitor]):
+        """
+        Initialize the index.
+
+        Args:
+            monitors: Monitors in enumeration order
+        """
+        self.monitors: Tuple[Monitor, ...] = tuple(monitors)
+        self._xs = sorted({m.left for m in self.monitors} | {m.right for m in self.monitors})
+        self._ys = sorted({m.top for m in self.monitors} | {m.bottom for m in self.monitors})
+
+        # _cells[row][column] is the index of the monitor covering that cell,
+        # or -1 for dead space in non-rectangular layouts
+        self._cells: List[List[int]] = []
+        for row in range(len(self._ys) - 1):
+            cy = self._ys[row]
+            cells = []
+            for column in range(len(self._xs) - 1):
+                cx = self._xs[column]
+                owner = -1
+                for index, m in enumerate(self.monitors):
+                    if m.left <= cx < m.right and m.top <= cy < m.bottom:
+                        owner = index
+                        break
+                cells.append(owner)
+            self._cells.append(cells)
+
+    @classmethod
+    def detect(cls, provider: TopologyProvider) -> "MonitorTopology":
+        """Build the index from a provider's current layout."""
+        return cls(provider.monitors())
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """
+        Get the virtual screen rectangle covering all monitors.
+
+        Returns:
+            Tuple of (x1, y1, x2, y2), all zero without monitors
+        """
+        if not self.monitors:
+            return 0, 0, 0, 0
+        return self._xs[0], self._ys[0], self._xs[-1], self._ys[-1]
+
+    def monitor_at(self, x: int, y: int) -> Optional[Monitor]:
+        """
+        Find the monitor containing a screen point.
+
+        Returns:
+            Monitor, or None if the point is outside every monitor
+        """
+        column = bisect.bisect_right(self._xs, x) - 1
+        row = bisect.bisect_right(self._ys, y) - 1
+        if not (0 <= column < len(self._xs) - 1 and 0 <= row < len(self._ys) - 1):
+            return None
+        owner = self._cells[row][column]
+        return self.monitors[owner] if owner >= 0 else None
+
+    def intersecting(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> List[Tuple[Monitor, Tuple[int, int, int, int]]]:
+        """
+        Find the monitors overlapping a rectangle.
+
+        Args:
+            x1: Left coordinate
+            y1: Top coordinate
+            x2: Right coordinate (exclusive)
+            y2: Bottom coordinate (exclusive)
+
+        Returns:
+            (monitor, clipped rectangle) pairs in enumeration order
+        """
+        first_column = max(bisect.bisect_right(self._xs, x1) - 1, 0)
+        last_column = min(bisect.bisect_left(self._xs, x2), len(self._xs) - 1)
+        first_row = max(bisect.bisect_right(self._ys, y1) - 1, 0)
+        last_row = min(bisect.bisect_left(self._ys, y2), len(self._ys) - 1)
+
+        owners = set()
+        for row in range(first_row, last_row):
+            owners.update(self._cells[row][first_column:last_column])
+        owners.discard(-1)
+
+        result = []
+        for index in sorted(owners):
+            clipped = self.monitors[index].intersect(x1, y1, x2, y2)
+            if clipped is not None:
+                result.append((self.monitors[index], clipped))
+        return result
+
+    def layout(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> Tuple[Tuple[int, int], List[Placement]]:
+        """
+        Plan a capture of a rectangle that may span several monitors.
+
+        Every part is scaled to the highest scale factor among the monitors
+        it spans, so text and UI come out the same size on every monitor
+        and the sharpest monitor keeps its native resolution. Along each
+        axis, the stretch between two monitor edges grows by the largest
+        factor of the parts in it, so scaled parts never overlap; a smaller
+        part leaves its unused space empty.
+
+        Args:
+            x1: Left coordinate
+            y1: Top coordinate
+            x2: Right coordinate (exclusive)
+            y2: Bottom coordinate (exclusive)
+
+        Returns:
+            Tuple of (stitched size, placements); without any overlapping
+            monitor the size is the rectangle's and there are no placements
+        """
+        parts = self.intersecting(x1, y1, x2, y2)
+        if not parts:
+            return (x2 - x1, y2 - y1), []
+
+        target = max(monitor.scale for monitor, _ in parts)
+        factors = [target / monitor.scale for monitor, _ in parts]
+
+        map_x = _axis_map(x1, x2, [(r[0], r[2]) for _, r in parts], factors)
+        map_y = _axis_map(y1, y2, [(r[1], r[3]) for _, r in parts], factors)
+        size = (map_x(x2), map_y(y2))
+
+        placements = []
+        for (monitor, rect), factor in zip(parts, factors):
+            left, top = map_x(rect[0]), map_y(rect[1])
+            width = min(round((rect[2] - rect[0]) * factor), size[0] - left)
+            height = min(round((rect[3] - rect[1]) * factor), size[1] - top)
+            placements.append(
+                Placement(monitor, rect, (left, top), (width, height))
+            )
+        return size, placements
+
+
+def _axis_map(
+    start: int,
+    end: int,
+    spans: List[Tuple[int, int]],
+    factors: List[float]
+) -> Callable[[int], int]:
+    """
+    Build the screen-to-output coordinate map along one axis.
+
+    Args:
+        start: First screen coordinate of the capture
+        end: Screen coordinate just past the capture
+        spans: (start, end) of each part along this axis
+        factors: Scale factor of each part
+
+    Returns:
+        Function mapping a screen coordinate to an output coordinate
+    """
+    edges = sorted({start, end} | {s for s, _ in spans} | {e for _, e in spans})
+    offsets = [0.0]
+    stretch = []
+    for a, b in zip(edges, edges[1:]):
+        factor = max(
+            (f for (s, e), f in zip(spans, factors) if s < b and e > a),
+            default=1.0
+        )
+        stretch.append(factor)
+        offsets.append(offsets[-1] + (b - a) * factor)
+
+    def to_output(value: int) -> int:
+        i = min(max(bisect.bisect_right(edges, value) - 1, 0), len(stretch) - 1)
+        return round(offsets[i] + (value - edges[i]) * stretch[i])
+
+    return to_output
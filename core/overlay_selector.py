@@ -1,17 +1,53 @@
 """Transparent overlay for screen region selection."""
 
-import tkinter as tk
-from typing import Callable, Optional, Tuple
+import queue
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from core.snapping import Snapper
+
+# tkinter is imported when the overlay is first built, after the tray icon
+# is already up, instead of when this module is imported
+if TYPE_CHECKING:
+    import tkinter as tk
+
+
+# Virtual event used to wake the UI thread when a request is queued
+_REQUEST_EVENT = "<<SwiftClipRequest>>"
+
+# Seconds between checks that the UI thread is still alive while a
+# caller waits for a selection
+_SELECT_POLL_INTERVAL = 0.5
+
+# Bit of Tk's event.state set while Shift is held
+_SHIFT_MASK = 0x0001
+
+# Bit of Tk's event.state set while Alt is held
+_ALT_MASK = 0x20000 if sys.platform == "win32" else 0x0008
+
+# Selected regions as (x1, y1, x2, y2) screen coordinates
+Regions = List[Tuple[int, int, int, int]]
 
 
 class OverlaySelector:
-    """Full-screen transparent overlay for selecting screen regions."""
+    """
+    Full-screen transparent overlay for selecting screen regions.
+
+    Releasing a drag confirms the selection. Releasing it with Shift held
+    keeps the rectangle and lets another one be drawn; Enter or a drag
+    without Shift then confirms all of them together. With a snapper, the
+    corners snap to nearby window and control edges unless Alt is held.
+    """
 
     def __init__(
         self,
         alpha: float = 0.3,
         selection_color: str = "#00FF00",
-        border_width: int = 2
+        border_width: int = 2,
+        max_fps: int = 60,
+        show_readout: bool = True
     ):
         """
         Initialize the overlay selector.
@@ -20,36 +56,77 @@ class OverlaySelector:
             alpha: Overlay transparency (0.0-1.0)
             selection_color: Color of the selection rectangle
             border_width: Width of the selection rectangle border
+            max_fps: Maximum selection redraws per second while dragging
+            show_readout: Show the selection size and position while dragging
         """
         self.alpha = alpha
         self.selection_color = selection_color
         self.border_width = border_width
+        self.show_readout = show_readout
 
-        self.root: Optional[tk.Tk] = None
-        self.canvas: Optional[tk.Canvas] = None
+        self.root: Optional["tk.Tk"] = None
+        self.canvas: Optional["tk.Canvas"] = None
         self.selection_rect: Optional[int] = None
+        self.readout_text: Optional[int] = None
+
+        # Motion events are coalesced and rendered at most once per frame
+        self._frame_ms: int = max(1, round(1000 / max_fps))
+        self._render_job: Optional[str] = None
+        self._root_x: int = 0
+        self._root_y: int = 0
+        self.redraw_count: int = 0
 
         self.start_x: int = 0
         self.start_y: int = 0
         self.end_x: int = 0
         self.end_y: int = 0
 
-        self._callback: Optional[Callable[[Tuple[int, int, int, int]], None]] = None
+        # Regions kept with Shift and their rectangles on the canvas
+        self.regions: Regions = []
+        self._region_rects: List[int] = []
+
+        self.snapper: Optional[Snapper] = None
+
+        self._callback: Optional[Callable[[Optional[Regions]], None]] = None
         self._cancelled: bool = False
+        self._persistent: bool = False
 
-    def show(self, callback: Callable[[Tuple[int, int, int, int]], None]) -> None:
+    def show(self, callback: Callable[[Optional[Regions]], None]) -> None:
         """
         Show the overlay and wait for user selection.
 
         Args:
-            callback: Function to call with selection coordinates (x1, y1, x2, y2)
-                     Will be called with None if cancelled
+            callback: Function to call with the selected regions, each as
+                     (x1, y1, x2, y2). Will be called with None if cancelled
         """
-        self._callback = callback
-        self._cancelled = False
+        import tkinter as tk
 
         # Create main window
         self.root = tk.Tk()
+        self._persistent = False
+        self._build()
+
+        self.open(callback)
+
+        # Run event loop
+        self.root.mainloop()
+
+    def attach(self, root: "tk.Tk") -> None:
+        """
+        Build the overlay on an existing root that outlives selections.
+
+        The window is withdrawn instead of destroyed when a selection ends,
+        so the next open() only has to reset state and show it again.
+
+        Args:
+            root: Tk root owned by the caller's UI thread
+        """
+        self.root = root
+        self._persistent = True
+        self._build()
+
+    def _build(self) -> None:
+        """Configure the root window and create the canvas."""
         self.root.withdraw()  # Hide initially
 
         # Configure window
@@ -66,6 +143,7 @@ class OverlaySelector:
         screen_height = self.root.winfo_screenheight()
 
         # Create canvas
+        import tkinter as tk
         self.canvas = tk.Canvas(
             self.root,
             width=screen_width,
@@ -82,21 +160,69 @@ class OverlaySelector:
         self.root.bind("<Escape>", self._on_escape)
         self.root.bind("<Return>", self._on_confirm)
 
+    def open(
+        self,
+        callback: Callable[[Optional[Regions]], None],
+        snapper: Optional[Snapper] = None
+    ) -> None:
+        """
+        Reset selection state and show the overlay window.
+
+        Must be called on the thread that owns the Tk root.
+
+        Args:
+            callback: Function to call with the selected regions, each as
+                     (x1, y1, x2, y2). Will be called with None if cancelled
+            snapper: Edges the selection corners snap to, if any
+        """
+        self._callback = callback
+        self._cancelled = False
+        self.snapper = snapper
+
+        self.start_x = self.start_y = self.end_x = self.end_y = 0
+        self._cancel_render()
+        if self.selection_rect:
+            self.canvas.delete(self.selection_rect)
+            self.selection_rect = None
+        for rect in self._region_rects:
+            self.canvas.delete(rect)
+        self._region_rects = []
+        self.regions = []
+        if self.readout_text:
+            self.canvas.delete(self.readout_text)
+            self.readout_text = None
+
         # Show window
         self.root.deiconify()
+        self.root.lift()
         self.root.focus_force()
 
-        # Run event loop
-        self.root.mainloop()
+    @property
+    def is_open(self) -> bool:
+        """Whether a selection is currently in progress."""
+        return self.root is not None and self._callback is not None
+
+    def cancel(self) -> None:
+        """Cancel the selection in progress, if any."""
+        if self.is_open:
+            self._on_escape(None)
 
-    def _on_press(self, event: tk.Event) -> None:
+    def _pointer(self, event: "tk.Event") -> Tuple[int, int]:
+        """Get the pointer position on the canvas, snapped unless Alt is held."""
+        if self.snapper is None or event.state & _ALT_MASK:
+            return event.x, event.y
+        x, y = self.snapper.snap(self._root_x + event.x, self._root_y + event.y)
+        return x - self._root_x, y - self._root_y
+
+    def _on_press(self, event: "tk.Event") -> None:
         """Handle mouse press event."""
-        self.start_x = event.x
-        self.start_y = event.y
-        self.end_x = event.x
-        self.end_y = event.y
+        self._root_x = self.root.winfo_rootx()
+        self._root_y = self.root.winfo_rooty()
+        self.start_x, self.start_y = self._pointer(event)
+        self.end_x, self.end_y = self.start_x, self.start_y
 
         # Create selection rectangle
+        self._cancel_render()
         if self.selection_rect:
             self.canvas.delete(self.selection_rect)
 
@@ -106,10 +232,27 @@ class OverlaySelector:
             width=self.border_width
         )
 
-    def _on_drag(self, event: tk.Event) -> None:
+        if self.show_readout:
+            if self.readout_text is None:
+                self.readout_text = self.canvas.create_text(
+                    0, 0, anchor="nw", fill=self.selection_color,
+                    font=("Segoe UI", 10)
+                )
+            self._render()
+
+    def _on_drag(self, event: "tk.Event") -> None:
         """Handle mouse drag event."""
-        self.end_x = event.x
-        self.end_y = event.y
+        self.end_x, self.end_y = self._pointer(event)
+
+        # Schedule a single redraw for this frame; later motion events
+        # only update the pointer position it will use
+        if self._render_job is None:
+            self._render_job = self.root.after(self._frame_ms, self._render)
+
+    def _render(self) -> None:
+        """Redraw the selection rectangle and readout at the latest position."""
+        self._render_job = None
+        self.redraw_count += 1
 
         # Update selection rectangle
         if self.selection_rect:
@@ -119,46 +262,312 @@ class OverlaySelector:
                 self.end_x, self.end_y
             )
 
-    def _on_release(self, event: tk.Event) -> None:
-        """Handle mouse release event - automatically confirm selection."""
-        self.end_x = event.x
-        self.end_y = event.y
-
-        # Only confirm if there's a valid selection area
-        if abs(self.end_x - self.start_x) > 5 and abs(self.end_y - self.start_y) > 5:
+        if self.readout_text:
+            width = abs(self.end_x - self.start_x)
+            height = abs(self.end_y - self.start_y)
+            left = self._root_x + min(self.start_x, self.end_x)
+            top = self._root_y + min(self.start_y, self.end_y)
+            text = f"{width} \u00d7 {height}  ({left}, {top})"
+            if self.regions:
+                text = f"#{len(self.regions) + 1}  {text}"
+            self.canvas.itemconfigure(self.readout_text, text=text)
+            self.canvas.coords(self.readout_text, self.end_x + 12, self.end_y + 12)
+
+    def _cancel_render(self) -> None:
+        """Drop a pending coalesced redraw."""
+        if self._render_job is not None:
+            self.root.after_cancel(self._render_job)
+            self._render_job = None
+
+    def _on_release(self, event: "tk.Event") -> None:
+        """Handle mouse release event - keep the region with Shift, else confirm."""
+        self.end_x, self.end_y = self._pointer(event)
+
+        # Only keep or confirm a valid selection area
+        if abs(self.end_x - self.start_x) <= 5 or abs(self.end_y - self.start_y) <= 5:
+            return
+
+        if event.state & _SHIFT_MASK:
+            self._add_region()
+        else:
             self._confirm_selection()
 
-    def _on_escape(self, event: tk.Event) -> None:
+    def _add_region(self) -> None:
+        """Keep the current rectangle and start a new one on the next press."""
+        self._cancel_render()
+        self._render()
+        self.regions.append(self._current_region())
+        if self.selection_rect:
+            self._region_rects.append(self.selection_rect)
+            self.selection_rect = None
+        self.start_x = self.start_y = self.end_x = self.end_y = 0
+
+    def _on_escape(self, event: Optional["tk.Event"]) -> None:
         """Handle escape key - cancel selection."""
         self._cancelled = True
+        callback, self._callback = self._callback, None
         self._close()
-        if self._callback:
-            self._callback(None)
+        if callback:
+            callback(None)
 
-    def _on_confirm(self, event: tk.Event) -> None:
+    def _on_confirm(self, event: "tk.Event") -> None:
         """Handle enter key - confirm selection."""
         self._confirm_selection()
 
-    def _confirm_selection(self) -> None:
-        """Confirm the current selection."""
-        # Get absolute screen coordinates
+    def _current_region(self) -> Tuple[int, int, int, int]:
+        """Get the rectangle being drawn in absolute screen coordinates."""
         root_x = self.root.winfo_rootx()
         root_y = self.root.winfo_rooty()
+        return (
+            root_x + min(self.start_x, self.end_x),
+            root_y + min(self.start_y, self.end_y),
+            root_x + max(self.start_x, self.end_x),
+            root_y + max(self.start_y, self.end_y),
+        )
 
-        # Calculate absolute coordinates
-        x1 = root_x + min(self.start_x, self.end_x)
-        y1 = root_y + min(self.start_y, self.end_y)
-        x2 = root_x + max(self.start_x, self.end_x)
-        y2 = root_y + max(self.start_y, self.end_y)
-
+    def _confirm_selection(self) -> None:
+        """Confirm the kept regions and the one being drawn, if any."""
+        regions = list(self.regions)
+        if self.start_x != self.end_x and self.start_y != self.end_y:
+            regions.append(self._current_region())
+        if not regions:
+            return  # Enter before anything was drawn
+
+        callback, self._callback = self._callback, None
         self._close()
 
-        if self._callback and not self._cancelled:
-            self._callback((x1, y1, x2, y2))
+        if callback and not self._cancelled:
+            callback(regions)
 
     def _close(self) -> None:
         """Close the overlay window."""
-        if self.root:
+        if not self.root:
+            return
+
+        self._cancel_render()
+
+        if self._persistent:
+            self.root.withdraw()
+        else:
             self.root.quit()
             self.root.destroy()
             self.root = None
+
+
+class OverlayService:
+    """
+    Warm overlay kept alive on a dedicated UI thread.
+
+    The Tk interpreter, fullscreen window and canvas are created once and
+    withdrawn between selections. Other threads request selections through
+    a thread-safe queue.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        selection_color: str = "#00FF00",
+        border_width: int = 2,
+        max_fps: int = 60,
+        show_readout: bool = True
+    ):
+        """
+        Initialize the overlay service.
+
+        Args:
+            alpha: Overlay transparency (0.0-1.0)
+            selection_color: Color of the selection rectangle
+            border_width: Width of the selection rectangle border
+            max_fps: Maximum selection redraws per second while dragging
+            show_readout: Show the selection size and position while dragging
+        """
+        self.selector = OverlaySelector(
+            alpha=alpha,
+            selection_color=selection_color,
+            border_width=border_width,
+            max_fps=max_fps,
+            show_readout=show_readout
+        )
+
+        self._requests: "queue.Queue[tuple]" = queue.Queue()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._root: Optional["tk.Tk"] = None
+        self._pending_shown_at: Optional[float] = None
+        self._pending_on_visible: Optional[Callable[[float], None]] = None
+
+        # Seconds from hotkey press to the overlay being mapped on screen
+        self.last_show_latency: Optional[float] = None
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """
+        Start the UI thread and build the overlay.
+
+        Args:
+            timeout: Seconds to wait for the overlay to be ready
+
+        Returns:
+            True if the overlay is ready, False otherwise
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="OverlayUI", daemon=True
+            )
+            self._thread.start()
+        return self._ready.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop the UI thread and destroy the overlay."""
+        if self._thread is None:
+            return
+        self._requests.put(("stop",))
+        self._wake()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def request_selection(
+        self,
+        callback: Callable[[Optional[Regions]], None],
+        requested_at: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None,
+        on_visible: Optional[Callable[[float], None]] = None,
+        snapper: Optional[Snapper] = None
+    ) -> bool:
+        """
+        Queue a selection request; safe to call from any thread.
+
+        Args:
+            callback: Called on the UI thread with the selected regions, or
+                     None if cancelled
+            requested_at: time.perf_counter() of the hotkey press, used to
+                          measure hotkey-to-visible latency
+            cancelled: Event that, once set, makes the request resolve to
+                       None instead of showing the overlay
+            on_visible: Called on the UI thread with the time.perf_counter()
+                        value at which the overlay was mapped
+            snapper: Edges the selection corners snap to, if any
+
+        Returns:
+            True if the request was queued, False if the overlay is not running
+        """
+        if not self._ready.is_set():
+            return False
+        self._requests.put((
+            "select", callback, requested_at or time.perf_counter(),
+            cancelled, on_visible, snapper
+        ))
+        return self._wake()
+
+    def cancel(self) -> None:
+        """Cancel the selection on screen, if any; safe from any thread."""
+        if self._ready.is_set():
+            self._requests.put(("cancel",))
+            self._wake()
+
+    def select(
+        self,
+        requested_at: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None,
+        on_visible: Optional[Callable[[float], None]] = None,
+        snapper: Optional[Snapper] = None
+    ) -> Optional[Regions]:
+        """
+        Request a selection and block until it completes.
+
+        Args:
+            requested_at: time.perf_counter() of the hotkey press
+            cancelled: Event that cancels the request before it is shown
+            on_visible: Called with the time the overlay was mapped
+            snapper: Edges the selection corners snap to, if any
+
+        Returns:
+            Selected regions, each as (x1, y1, x2, y2), or None if cancelled
+            or the UI thread stopped
+        """
+        done = threading.Event()
+        result = {"regions": None}
+
+        def on_selection(regions: Optional[Regions]) -> None:
+            result["regions"] = regions
+            done.set()
+
+        if not self.request_selection(
+                on_selection, requested_at, cancelled, on_visible, snapper):
+            return None
+
+        # A UI thread that died never answers, so do not wait on it forever
+        while not done.wait(_SELECT_POLL_INTERVAL):
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                print("Overlay stopped before the selection completed")
+                return None
+        return result["regions"]
+
+    def _wake(self) -> bool:
+        """Wake the UI thread to drain the request queue."""
+        try:
+            self._root.event_generate(_REQUEST_EVENT, when="tail")
+            return True
+        except Exception as e:
+            print(f"Failed to signal overlay: {e}")
+            return False
+
+    def _run(self) -> None:
+        """UI thread body: build the overlay once and run the event loop."""
+        try:
+            import tkinter as tk
+            self._root = tk.Tk()
+            self.selector.attach(self._root)
+            self._root.bind(_REQUEST_EVENT, self._on_request)
+            self._root.bind("<Map>", self._on_map)
+        except Exception as e:
+            print(f"Failed to create overlay: {e}")
+            return
+
+        self._ready.set()
+        self._root.mainloop()
+
+        self._ready.clear()
+        self._root.destroy()
+        self._root = None
+
+    def _on_request(self, event: "tk.Event") -> None:
+        """Drain queued requests on the UI thread."""
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                return
+
+            # Any request supersedes a selection still on screen
+            self.selector.cancel()
+
+            kind = request[0]
+            if kind == "stop":
+                self._root.quit()
+                return
+            if kind != "select":
+                continue
+
+            _, callback, requested_at, cancelled, on_visible, snapper = request
+            if cancelled is not None and cancelled.is_set():
+                callback(None)
+                continue
+
+            self._pending_shown_at = requested_at
+            self._pending_on_visible = on_visible
+            self.selector.open(callback, snapper)
+
+    def _on_map(self, event: "tk.Event") -> None:
+        """Record hotkey-to-visible latency when the overlay is mapped."""
+        if event.widget is not self._root or self._pending_shown_at is None:
+            return
+
+        now = time.perf_counter()
+        self.last_show_latency = now - self._pending_shown_at
+        self._pending_shown_at = None
+        print(f"Overlay visible in {self.last_show_latency * 1000:.1f} ms")
+
+        on_visible, self._pending_on_visible = self._pending_on_visible, None
+        if on_visible:
+            on_visible(now)
@@ -0,0 +1,194 @@
+"""Dependency-driven stage pipeline for post-selection processing."""
+
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+
+class StageFailed(Exception):
+    """Raised by a stage to fail with a message fit for the user."""
+
+
+class StageSkipped(Exception):
+    """Recorded for a stage whose dependency failed."""
+
+
+class Stage(NamedTuple):
+    """A named unit of work and the stages whose results it consumes."""
+
+    name: str
+    fn: Callable[..., Any]
+    requires: Tuple[str, ...]
+
+
+class PipelineResult:
+    """Results, errors and timings of one pipeline run."""
+
+    def __init__(self, order: Tuple[str, ...]):
+        """
+        Initialize an empty result.
+
+        Args:
+            order: Stage names in the order they were added
+        """
+        self.order = order
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.started_at = time.perf_counter()
+        self.finished_at = self.started_at
+
+    @property
+    def ok(self) -> bool:
+        """Whether every stage succeeded."""
+        return not self.errors
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds from the start of the run to the end of the last stage."""
+        return self.finished_at - self.started_at
+
+    def first_error(self) -> Optional[BaseException]:
+        """Get the earliest-added stage error that is not a skip."""
+        for name in self.order:
+            error = self.errors.get(name)
+            if error is not None and not isinstance(error, StageSkipped):
+                return error
+        return None
+
+    def message(self) -> Optional[str]:
+        """Get a user-facing description of the first error, if any."""
+        error = self.first_error()
+        if error is None:
+            return None
+        if isinstance(error, StageFailed):
+            return str(error)
+        stage = next(name for name in self.order if self.errors.get(name) is error)
+        return f"{stage.capitalize()} failed: {error}"
+
+
+class Pipeline:
+    """
+    Runs stages as soon as the stages they require have finished.
+
+    Independent stages run concurrently on an executor. Each stage is
+    called with the results of its required stages, in the order listed.
+    A failed stage fails every stage that depends on it.
+    """
+
+    def __init__(self):
+        """Initialize an empty pipeline."""
+        self._stages: "OrderedDict[str, Stage]" = OrderedDict()
+
+    def stage(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        requires: Tuple[str, ...] = ()
+    ) -> "Pipeline":
+        """
+        Add a stage.
+
+        Args:
+            name: Unique stage name
+            fn: Called with the results of the required stages
+            requires: Names of stages that must succeed first; they must
+                      already have been added
+
+        Returns:
+            The pipeline, for chaining
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        for dependency in requires:
+            if dependency not in self._stages:
+                raise ValueError(f"Stage {name} requires unknown stage {dependency}")
+        self._stages[name] = Stage(name, fn, tuple(requires))
+        return self
+
+    def run(self, executor: Optional[Executor] = None) -> PipelineResult:
+        """
+        Run every stage.
+
+        Args:
+            executor: Executor for concurrent stages; without one, stages
+                      run serially in the order they were added
+
+        Returns:
+            PipelineResult with per-stage results, errors and timings
+        """
+        result = PipelineResult(tuple(self._stages))
+        if executor is None:
+            for stage in self._stages.values():
+                self._run_stage(stage, result)
+        else:
+            self._run_concurrent(executor, result)
+        result.finished_at = time.perf_counter()
+        return result
+
+    def _ready(self, stage: Stage, result: PipelineResult) -> Optional[bool]:
+        """Whether a stage can run (True), must be skipped (False) or waits."""
+        for dependency in stage.requires:
+            if dependency in result.errors:
+                return False
+            if dependency not in result.results:
+                return None
+        return True
+
+    def _run_stage(self, stage: Stage, result: PipelineResult) -> None:
+        """Run one stage on the calling thread and record its outcome."""
+        if not self._ready(stage, result):
+            failed = next(d for d in stage.requires if d not in result.results)
+            result.errors[stage.name] = StageSkipped(failed)
+            return
+
+        args = [result.results[dependency] for dependency in stage.requires]
+        start = time.perf_counter()
+        try:
+            result.results[stage.name] = stage.fn(*args)
+        except Exception as e:
+            result.errors[stage.name] = e
+        finally:
+            result.timings[stage.name] = (start, time.perf_counter())
+
+    def _run_concurrent(self, executor: Executor, result: PipelineResult) -> None:
+        """Submit stages as their dependencies complete."""
+        waiting = list(self._stages.values())
+        running: Dict[Future, Stage] = {}
+
+        while waiting or running:
+            for stage in list(waiting):
+                ready = self._ready(stage, result)
+                if ready is None:
+                    continue
+                waiting.remove(stage)
+                if ready:
+                    running[executor.submit(self._call, stage, result)] = stage
+                else:
+                    failed = next(d for d in stage.requires if d in result.errors)
+                    result.errors[stage.name] = StageSkipped(failed)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                start, end, value, error = future.result()
+                result.timings[stage.name] = (start, end)
+                if error is None:
+                    result.results[stage.name] = value
+                else:
+                    result.errors[stage.name] = error
+
+    @staticmethod
+    def _call(stage: Stage, result: PipelineResult) -> Tuple[float, float, Any, Optional[Exception]]:
+        """Run a stage on a worker, capturing its value or error."""
+        args = [result.results[dependency] for dependency in stage.requires]
+        start = time.perf_counter()
+        try:
+            value = stage.fn(*args)
+        except Exception as e:
+            return start, time.perf_counter(), None, e
+        return start, time.perf_counter(), value, None
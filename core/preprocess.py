@@ -0,0 +1,325 @@
+"""
+Prepare captures for text recognition before they are copied or uploaded.
+
+Screen captures of text are often mostly empty background around small,
+low-DPI glyphs. Trimming the uniform border shrinks every payload,
+enlarging small text by a whole factor keeps glyph edges sharp while
+reaching the sizes recognizers read best, and fewer colours let the
+encoder pick an 8-bit palette PNG. Every step works on the raw BGRA
+buffer with NumPy and returns a Frame, so the clipboard, dedup and upload
+stages run unchanged on the result.
+"""
+
+from typing import Any, Optional, Tuple
+
+from core.frame import Frame
+from core.startup import optional_module
+
+# NumPy is optional, without it frames pass unchanged; imported on first use
+np = optional_module("numpy")
+
+
+# Colour reduction modes
+COLORS_GRAY = "gray"
+COLORS_PALETTE = "palette"
+COLOR_MODES = (COLORS_GRAY, COLORS_PALETTE)
+
+# Largest channel difference from the background still counted as background
+DEFAULT_TOLERANCE = 12
+
+# Background pixels kept around the content when trimming
+DEFAULT_MARGIN = 8
+
+# Line height small text is enlarged towards, in pixels
+DEFAULT_TARGET_HEIGHT = 24
+
+# Ink runs shorter than this many rows (rules, underlines, specks) are not
+# counted as text lines
+_MIN_LINE_ROWS = 3
+
+# Levels per channel of the palette mode; 6 gives at most 216 colours
+_PALETTE_LEVELS = 6
+
+
+def available() -> bool:
+    """Whether NumPy is installed; without it every step returns the frame."""
+    return np is not None
+
+
+def _bgra(frame: Frame) -> Any:
+    """View a frame as a (height, width, 4) array without copying."""
+    pixels = np.frombuffer(
+        frame.buffer, dtype=np.uint8,
+        count=frame.stride * (frame.height - 1) + frame.width * 4,
+        offset=frame.offset
+    )
+    return np.lib.stride_tricks.as_strided(
+        pixels, (frame.height, frame.width, 4), (frame.stride, 4, 1)
+    )
+
+
+def _from_array(array: Any, left: int, top: int) -> Frame:
+    """Wrap a contiguous (height, width, 4) array in a frame."""
+    height, width = array.shape[:2]
+    return Frame(array.reshape(-1), left, top, width, height)
+
+
+def background_color(frame: Frame) -> Tuple[int, int, int]:
+    """
+    Guess the background colour from the four corners.
+
+    Returns:
+        (b, g, r) of the most common corner pixel, the top-left on a tie
+    """
+    pixels = _bgra(frame)
+    corners = [
+        tuple(pixels[y, x, :3].tolist())
+        for y, x in ((0, 0), (0, -1), (-1, 0), (-1, -1))
+    ]
+    return max(corners, key=corners.count)
+
+
+def ink_mask(frame: Frame, background: Tuple[int, int, int], tolerance: int) -> Any:
+    """
+    Mark the pixels that differ from the background.
+
+    Args:
+        frame: Frame to scan
+        background: (b, g, r) background colour
+        tolerance: Largest channel difference still counted as background
+
+    Returns:
+        (height, width) boolean array, True on content
+    """
+    pixels = _bgra(frame)
+    mask = np.zeros((frame.height, frame.width), dtype=bool)
+    for channel, value in enumerate(background):
+        plane = pixels[..., channel]
+        # Compared as uint8 against clamped bounds, so no wider copy is made
+        if value - tolerance > 0:
+            mask |= plane < value - tolerance
+        if value + tolerance < 255:
+            mask |= plane > value + tolerance
+    return mask
+
+
+def content_box(mask: Any, margin: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Get the box around the content of an ink mask.
+
+    Args:
+        mask: Result of ink_mask
+        margin: Background pixels kept on each side
+
+    Returns:
+        (x1, y1, x2, y2) relative to the frame, or None if it is blank
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    if not len(rows):
+        return None
+    columns = np.flatnonzero(mask.any(axis=0))
+    height, width = mask.shape
+    return (
+        max(0, int(columns[0]) - margin),
+        max(0, int(rows[0]) - margin),
+        min(width, int(columns[-1]) + 1 + margin),
+        min(height, int(rows[-1]) + 1 + margin)
+    )
+
+
+def line_height(mask: Any) -> Optional[int]:
+    """
+    Estimate the height of the text lines in an ink mask.
+
+    Rows with any content form runs; the median run is the typical line.
+    Large panels or images make one tall run and so are never mistaken
+    for small text.
+
+    Returns:
+        Median line height in pixels, or None if there are no lines
+    """
+    padded = np.zeros(mask.shape[0] + 2, dtype=np.int8)
+    padded[1:-1] = mask.any(axis=1)
+    steps = np.diff(padded)
+    lengths = np.flatnonzero(steps == -1) - np.flatnonzero(steps == 1)
+    lengths = lengths[lengths >= _MIN_LINE_ROWS]
+    if not len(lengths):
+        return None
+    return int(np.median(lengths))
+
+
+def scale_factor(
+    height: Optional[int],
+    size: Tuple[int, int],
+    target_height: int = DEFAULT_TARGET_HEIGHT,
+    max_scale: int = 3,
+    max_pixels: int = 0
+) -> int:
+    """
+    Choose the whole factor small text is enlarged by.
+
+    Args:
+        height: Line height from line_height
+        size: Frame size as (width, height)
+        target_height: Line height to reach, in pixels
+        max_scale: Largest factor used
+        max_pixels: Pixel cap of the enlarged frame (0 disables it)
+
+    Returns:
+        Factor of at least 1
+    """
+    if height is None or height >= target_height:
+        return 1
+    factor = min(max_scale, -(-target_height // height))
+    width, frame_height = size
+    while factor > 1 and max_pixels and width * frame_height * factor * factor > max_pixels:
+        factor -= 1
+    return max(1, factor)
+
+
+def trim_borders(
+    frame: Frame,
+    tolerance: int = DEFAULT_TOLERANCE,
+    margin: int = DEFAULT_MARGIN
+) -> Frame:
+    """
+    Crop the uniform border around the content without copying pixels.
+
+    Args:
+        frame: Frame to trim
+        tolerance: Largest channel difference still counted as background
+        margin: Background pixels kept on each side
+
+    Returns:
+        Frame viewing the content, or the frame itself if it is blank or
+        NumPy is missing
+    """
+    if np is None:
+        return frame
+    mask = ink_mask(frame, background_color(frame), tolerance)
+    return _crop(frame, content_box(mask, margin))
+
+
+def _crop(frame: Frame, box: Optional[Tuple[int, int, int, int]]) -> Frame:
+    """Crop a frame-relative box, keeping the frame if there is none."""
+    if box is None:
+        return frame
+    x1, y1, x2, y2 = box
+    return frame.crop(
+        frame.left + x1, frame.top + y1, frame.left + x2, frame.top + y2
+    ) or frame
+
+
+def upscale(frame: Frame, factor: int) -> Frame:
+    """
+    Enlarge a frame by a whole factor, repeating every pixel.
+
+    Args:
+        frame: Frame to enlarge
+        factor: Times each pixel is repeated along both axes
+
+    Returns:
+        New frame at the same screen position, or the frame itself for a
+        factor of 1 or without NumPy
+    """
+    if np is None or factor <= 1:
+        return frame
+    # Widen each row once, then copy the wide rows factor times
+    rows = np.repeat(_bgra(frame), factor, axis=1)
+    out = np.empty((frame.height, factor) + rows.shape[1:], dtype=np.uint8)
+    out[...] = rows[:, None]
+    return _from_array(
+        out.reshape(frame.height * factor, rows.shape[1], 4), frame.left, frame.top
+    )
+
+
+def _palette_levels() -> Any:
+    """Lookup table rounding a channel value to the nearest palette level."""
+    step = 255 / (_PALETTE_LEVELS - 1)
+    return np.round(np.round(np.arange(256) / step) * step).astype(np.uint8)
+
+
+def reduce_colors(frame: Frame, mode: str) -> Frame:
+    """
+    Reduce the colours of a frame.
+
+    Modes:
+        gray: 8-bit luma in every channel
+        palette: every channel rounded to a few levels, at most 216 colours
+
+    Args:
+        frame: Frame to convert
+        mode: One of the modes above
+
+    Returns:
+        New frame, or the frame itself without NumPy
+    """
+    if mode not in COLOR_MODES:
+        raise ValueError(f"Unknown colour mode: {mode}")
+    if np is None:
+        return frame
+
+    pixels = _bgra(frame)
+    if mode == COLORS_GRAY:
+        # BT.601 weights in 8-bit fixed point; widened explicitly, as uint8
+        # times a uint16 scalar stays uint8 and wraps on NumPy 1.x
+        luma = pixels[..., 0].astype(np.uint16) * 29
+        luma += pixels[..., 1].astype(np.uint16) * 150
+        luma += pixels[..., 2].astype(np.uint16) * 77
+        luma >>= 8
+        out = np.repeat(luma.astype(np.uint8)[..., None], 4, axis=2)
+    else:
+        out = np.take(_palette_levels(), pixels)
+    out[..., 3] = 255
+    return _from_array(out, frame.left, frame.top)
+
+
+def preprocess(
+    frame: Frame,
+    trim: bool = True,
+    max_scale: int = 3,
+    colors: Optional[str] = None,
+    tolerance: int = DEFAULT_TOLERANCE,
+    margin: int = DEFAULT_MARGIN,
+    target_height: int = DEFAULT_TARGET_HEIGHT,
+    max_pixels: int = 0
+) -> Frame:
+    """
+    Trim, reduce colours and enlarge small text, in that order.
+
+    The ink mask is computed once and shared by trimming and the line
+    height estimate; colours are reduced before enlarging so the slower
+    step runs on the fewer pixels.
+
+    Args:
+        frame: Captured frame
+        trim: Crop the uniform border
+        max_scale: Largest factor small text is enlarged by (1 disables it)
+        colors: None, "gray" or "palette"
+        tolerance: Largest channel difference still counted as background
+        margin: Background pixels kept around the content when trimming
+        target_height: Line height small text is enlarged towards
+        max_pixels: Pixel cap of the enlarged frame (0 disables it)
+
+    Returns:
+        Processed frame, or the frame itself if nothing applies or NumPy
+        is missing
+    """
+    if np is None or frame.width < 1 or frame.height < 1:
+        return frame
+
+    factor = 1
+    if trim or max_scale > 1:
+        mask = ink_mask(frame, background_color(frame), tolerance)
+        box = content_box(mask, margin)
+        if trim and box is not None:
+            frame = _crop(frame, box)
+            mask = mask[box[1]:box[3], box[0]:box[2]]
+        if max_scale > 1:
+            factor = scale_factor(
+                line_height(mask), frame.size, target_height, max_scale, max_pixels
+            )
+
+    if colors is not None:
+        frame = reduce_colors(frame, colors)
+    return upscale(frame, factor)
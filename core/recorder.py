@@ -0,0 +1,586 @@
+"""
+Record a screen region to an animated GIF or WebP.
+
+Frames are grabbed at a target rate and compared with the last frame
+handed to the encoder; only the rectangle that changed is encoded, as a
+sub-frame placed over the previous ones. Frames go to a background
+encoder through a bounded queue and are written to disk as they are
+encoded, so the clip is never held in memory. When the encoder falls
+behind, new frames are dropped (and counted) instead of queueing up;
+the next frame then covers every change since the last queued one.
+Recording stops by itself if the region's grabs change size, e.g. after
+a display scale change, since the clip size is fixed by the first frame.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Any, BinaryIO, Callable, List, Optional, Tuple
+
+from PIL import Image
+
+from core.frame import Frame
+from core.startup import optional_module
+
+# NumPy is optional, fall back to full-width row diffs; imported on first use
+np = optional_module("numpy")
+
+
+# Output formats by file extension
+RECORD_FORMATS = {".gif": "gif", ".webp": "webp"}
+
+Rect = Tuple[int, int, int, int]
+
+
+def _pixels(frame: Frame) -> Any:
+    """View a frame as a (height, width) array of BGR pixels without alpha."""
+    pixels = np.frombuffer(
+        frame.buffer, dtype=np.uint32,
+        count=(frame.stride // 4) * (frame.height - 1) + frame.width,
+        offset=frame.offset
+    )
+    pixels = np.lib.stride_tricks.as_strided(
+        pixels, shape=(frame.height, frame.width), strides=(frame.stride, 4)
+    )
+    return pixels & np.uint32(0x00FFFFFF)
+
+
+def diff_rect(previous: Frame, current: Frame) -> Optional[Rect]:
+    """
+    Find the box around every pixel that differs between two frames.
+
+    Args:
+        previous: Earlier frame
+        current: Later frame
+
+    Returns:
+        (x1, y1, x2, y2) relative to the frame, the whole frame if the sizes
+        differ, or None if the frames are identical
+    """
+    width, height = current.size
+    if previous.size != current.size:
+        return 0, 0, width, height
+
+    if np is not None:
+        changed = _pixels(previous) != _pixels(current)
+        rows = np.flatnonzero(changed.any(axis=1))
+        if not len(rows):
+            return None
+        columns = np.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+        return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+    rows = [y for y in range(height) if previous.row(y) != current.row(y)]
+    if not rows:
+        return None
+    return 0, rows[0], width, rows[-1] + 1
+
+
+def _align(rect: Rect, alignment: int) -> Rect:
+    """Move a rectangle's top-left corner back to a multiple of alignment."""
+    x1, y1, x2, y2 = rect
+    return x1 - x1 % alignment, y1 - y1 % alignment, x2, y2
+
+
+class AnimationWriter(ABC):
+    """
+    Streams an animation to a file, one sub-frame at a time.
+
+    A frame's duration is only known once the next frame arrives, so each
+    writer holds back the last encoded frame until then.
+    """
+
+    # Sub-frame offsets must be multiples of this
+    alignment = 1
+
+    @abstractmethod
+    def add(self, image: Image.Image, left: int, top: int, timestamp: float) -> None:
+        """
+        Append a sub-frame drawn over the previous frames.
+
+        Args:
+            image: Changed part of the frame, RGB
+            left: X offset of the part in the animation
+            top: Y offset of the part in the animation
+            timestamp: Seconds since the recording started
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self, timestamp: float) -> None:
+        """
+        Finish the animation, closing the file if the writer owns it.
+
+        Args:
+            timestamp: Seconds since the recording started at which the
+                       last frame stops being shown
+        """
+        raise NotImplementedError
+
+
+class GifWriter(AnimationWriter):
+    """
+    Animated GIF writer.
+
+    Each sub-frame is quantized to its own local palette and compressed by
+    PIL's GIF encoder; the image block is then spliced out of PIL's output.
+    Sub-frames are kept on screen (disposal 1) so later ones draw over them.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        size: Tuple[int, int],
+        loop: int = 0,
+        close_file: bool = False
+    ):
+        """
+        Initialize the writer and write the file header.
+
+        Args:
+            file: Binary file object the GIF is written to
+            size: Animation (width, height)
+            loop: Times to play the animation, 0 for forever
+            close_file: Close the file in close()
+        """
+        self._file = file
+        self._close_file = close_file
+        self._pending: Optional[Tuple[bytes, float]] = None
+        file.write(
+            b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0, 0, 0)
+            + b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00"
+        )
+
+    def add(self, image: Image.Image, left: int, top: int, timestamp: float) -> None:
+        """Quantize and compress a sub-frame, writing the previous one."""
+        table, pixels = _gif_image_data(_to_palette(image))
+
+        # Local colour tables hold 2 ** (n + 1) entries
+        bits = max(1, (len(table) // 3 - 1).bit_length())
+        table = table.ljust(3 << bits, b"\x00")
+        block = (
+            struct.pack("<BHHHHB", 0x2C, left, top, image.width, image.height,
+                        0x80 | (bits - 1))
+            + table + pixels
+        )
+        self._flush(timestamp)
+        self._pending = (block, timestamp)
+
+    def close(self, timestamp: float) -> None:
+        """Write the last frame and the trailer."""
+        self._flush(timestamp)
+        self._file.write(b"\x3b")
+        if self._close_file:
+            self._file.close()
+
+    def _flush(self, timestamp: float) -> None:
+        """Write the held-back frame, shown until timestamp."""
+        if self._pending is None:
+            return
+        block, start = self._pending
+        # Round both ends so delays do not drift over a long clip
+        delay = max(1, round(timestamp * 100) - round(start * 100))
+        self._file.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0x04, delay, 0, 0) + block)
+        self._pending = None
+
+
+def _to_palette(image: Image.Image) -> Image.Image:
+    """Convert an RGB image to 256 colours, exactly with NumPy if it has no more."""
+    if np is not None:
+        # PIL maps onto a given palette at reduced precision, so index
+        # the distinct colours directly
+        rgb = np.asarray(image, dtype=np.uint32)
+        keys = (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+        colors, indices = np.unique(keys, return_inverse=True)
+        if len(colors) <= 256:
+            paletted = Image.fromarray(indices.reshape(keys.shape).astype(np.uint8))
+            paletted.putpalette(
+                np.stack((colors >> 16, colors >> 8, colors), axis=1)
+                .astype(np.uint8).tobytes()
+            )
+            return paletted
+
+    colors = image.getcolors(256)
+    if colors is None:
+        return image.quantize(256, method=Image.Quantize.FASTOCTREE)
+
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([channel for _, color in colors for channel in color])
+    return image.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def _gif_image_data(image: Image.Image) -> Tuple[bytes, bytes]:
+    """
+    Compress a palette image with PIL's GIF encoder.
+
+    Returns:
+        The colour table and the LZW image data that follows an image
+        descriptor, including its block terminator
+    """
+    buffer = BytesIO()
+    image.save(buffer, "GIF", optimize=False, interlace=False)
+    data = buffer.getvalue()
+
+    table = b""
+    flags = data[10]
+    position = 13
+    if flags & 0x80:
+        size = 3 << ((flags & 0x07) + 1)
+        table = data[position:position + size]
+        position += size
+
+    while data[position] == 0x21:  # Skip extensions up to the image
+        position += 2
+        while data[position]:
+            position += data[position] + 1
+        position += 1
+
+    flags = data[position + 9]
+    position += 10
+    if flags & 0x80:
+        size = 3 << ((flags & 0x07) + 1)
+        table = data[position:position + size]
+        position += size
+
+    return table, data[position:-1]
+
+
+class WebPWriter(AnimationWriter):
+    """
+    Animated WebP writer.
+
+    Each sub-frame is encoded as a still WebP by PIL and its bitstream is
+    wrapped in an ANMF chunk. The RIFF size is filled in by close(), so
+    the file must be seekable.
+    """
+
+    # ANMF chunks store offsets divided by two
+    alignment = 2
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        size: Tuple[int, int],
+        loop: int = 0,
+        lossless: bool = True,
+        quality: int = 80,
+        close_file: bool = False
+    ):
+        """
+        Initialize the writer and write the file header.
+
+        Args:
+            file: Seekable binary file object the WebP is written to
+            size: Animation (width, height)
+            loop: Times to play the animation, 0 for forever
+            lossless: Encode sub-frames losslessly, best for UI content
+            quality: Lossy quality (1-100), or effort when lossless
+            close_file: Close the file in close()
+        """
+        self._file = file
+        self._close_file = close_file
+        self._start = file.tell()
+        self._lossless = lossless
+        self._quality = quality
+        self._pending: Optional[Tuple[bytes, int, int, int, int, float]] = None
+
+        header = struct.pack("<B3x", 0x02) + _uint24(size[0] - 1) + _uint24(size[1] - 1)
+        file.write(
+            b"RIFF\x00\x00\x00\x00WEBP"
+            + _riff_chunk(b"VP8X", header)
+            + _riff_chunk(b"ANIM", struct.pack("<IH", 0, loop))
+        )
+
+    def add(self, image: Image.Image, left: int, top: int, timestamp: float) -> None:
+        """Encode a sub-frame, writing the previous one."""
+        buffer = BytesIO()
+        image.save(buffer, "WEBP", lossless=self._lossless, quality=self._quality)
+        bitstream = _webp_bitstream(buffer.getvalue())
+
+        self._flush(timestamp)
+        self._pending = (bitstream, left, top, image.width, image.height, timestamp)
+
+    def close(self, timestamp: float) -> None:
+        """Write the last frame and fill in the RIFF size."""
+        self._flush(timestamp)
+        end = self._file.tell()
+        self._file.seek(self._start + 4)
+        self._file.write(struct.pack("<I", end - self._start - 8))
+        self._file.seek(end)
+        if self._close_file:
+            self._file.close()
+
+    def _flush(self, timestamp: float) -> None:
+        """Write the held-back frame, shown until timestamp."""
+        if self._pending is None:
+            return
+        bitstream, left, top, width, height, start = self._pending
+        duration = max(1, round(timestamp * 1000) - round(start * 1000))
+        header = (
+            _uint24(left // 2) + _uint24(top // 2)
+            + _uint24(width - 1) + _uint24(height - 1)
+            + _uint24(min(duration, 0xFFFFFF))
+            + b"\x02"  # Draw without blending, keep the frame afterwards
+        )
+        self._file.write(_riff_chunk(b"ANMF", header + bitstream))
+        self._pending = None
+
+
+def _uint24(value: int) -> bytes:
+    """Pack an unsigned 24-bit little-endian integer."""
+    return struct.pack("<I", value)[:3]
+
+
+def _riff_chunk(kind: bytes, data: bytes) -> bytes:
+    """Build a RIFF chunk, padded to an even size."""
+    return kind + struct.pack("<I", len(data)) + data + b"\x00" * (len(data) & 1)
+
+
+def _webp_bitstream(data: bytes) -> bytes:
+    """Get the ALPH, VP8 and VP8L chunks of a still WebP file."""
+    chunks = []
+    position = 12
+    while position + 8 <= len(data):
+        kind = data[position:position + 4]
+        size = struct.unpack_from("<I", data, position + 4)[0]
+        end = position + 8 + size + (size & 1)
+        if kind in (b"ALPH", b"VP8 ", b"VP8L"):
+            chunks.append(data[position:end])
+        position = end
+    return b"".join(chunks)
+
+
+def recording_path(directory: Optional[str] = None, format: str = "gif") -> str:
+    """
+    Get a timestamped file name for a new recording.
+
+    Args:
+        directory: Output folder (defaults to the Videos folder, or the home
+                   folder if there is none); created if missing
+        format: "gif" or "webp"
+
+    Returns:
+        Path of a file that does not exist yet
+    """
+    if directory is None:
+        home = os.path.expanduser("~")
+        directory = os.path.join(home, "Videos")
+        if not os.path.isdir(directory):
+            directory = home
+    os.makedirs(directory, exist_ok=True)
+
+    name = time.strftime("SwiftClip-%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{name}.{format}")
+    index = 1
+    while os.path.exists(path):
+        index += 1
+        path = os.path.join(directory, f"{name}-{index}.{format}")
+    return path
+
+
+def open_writer(path: str, size: Tuple[int, int], **options: Any) -> AnimationWriter:
+    """
+    Create a file and the animation writer matching its extension.
+
+    Args:
+        path: Output file name ending in .gif or .webp
+        size: Animation (width, height)
+        options: Writer options, e.g. loop or lossless
+
+    Returns:
+        Writer that closes the file when it is closed
+    """
+    format = RECORD_FORMATS.get(os.path.splitext(path)[1].lower())
+    if format is None:
+        raise ValueError(f"Unsupported recording format: {path}")
+    writer = GifWriter if format == "gif" else WebPWriter
+    return writer(open(path, "wb"), size, close_file=True, **options)
+
+
+class Recorder:
+    """
+    Records a screen region on two threads: capture and encode.
+
+    The capture thread grabs at a fixed rate and queues the changed part
+    of each frame; the encoder thread writes queued parts to the writer.
+    """
+
+    def __init__(
+        self,
+        grab: Callable[[int, int, int, int], Optional[Frame]],
+        region: Rect,
+        writer: AnimationWriter,
+        fps: float = 10.0,
+        max_queue: int = 16,
+        max_duration: Optional[float] = None,
+        on_finish: Optional[Callable[["Recorder"], None]] = None
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            grab: Captures (x1, y1, x2, y2) as a frame, e.g.
+                  CaptureSession.grab_frame
+            region: Recorded region (x1, y1, x2, y2)
+            writer: Writer the animation is streamed to
+            fps: Target captures per second
+            max_queue: Frames waiting for the encoder before new ones are
+                       dropped
+            max_duration: Seconds after which recording stops by itself
+            on_finish: Called on the encoder thread once the writer is
+                       closed
+        """
+        self.region = region
+        self._grab = grab
+        self._writer = writer
+        self.fps = fps
+        self.max_duration = max_duration
+        self._on_finish = on_finish
+
+        self._queue: "queue.Queue[Tuple[float, Optional[Frame], Optional[Rect]]]" = (
+            queue.Queue(max_queue)
+        )
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        self.captured = 0
+        self.unchanged = 0
+        self.dropped = 0
+        self.written = 0
+        self.encode_time = 0.0
+        self.duration = 0.0
+        self.error: Optional[Exception] = None
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the recording has not finished yet."""
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def achieved_fps(self) -> float:
+        """Captures per second actually reached."""
+        return self.captured / self.duration if self.duration else 0.0
+
+    def start(self) -> None:
+        """Start recording on background threads."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="RecordCapture", daemon=True),
+            threading.Thread(target=self._encode_loop, name="RecordEncode", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request_stop(self) -> None:
+        """Stop capturing without waiting; on_finish runs once it is written."""
+        self._stop.set()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop capturing and wait for the queued frames to be written."""
+        self.request_stop()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def summary(self) -> str:
+        """Describe the finished recording in one line."""
+        summary = (
+            f"{self.duration:.1f} s, {self.achieved_fps:.1f} of {self.fps:g} fps, "
+            f"{self.written} frames written, {self.dropped} dropped"
+        )
+        if self.stop_reason is not None:
+            summary += f", stopped: {self.stop_reason}"
+        return summary
+
+    def _capture_loop(self) -> None:
+        """Capture thread body."""
+        period = 1.0 / self.fps
+        start = time.perf_counter()
+        deadline = start
+        reference: Optional[Frame] = None
+        size: Optional[Tuple[int, int]] = None
+
+        while not self._stop.is_set():
+            delay = deadline - time.perf_counter()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            now = time.perf_counter()
+            deadline = max(deadline + period, now - period)
+            if self.max_duration is not None and now - start >= self.max_duration:
+                break
+
+            frame = self._grab(*self.region)
+            if frame is None:
+                continue
+            if size is None:
+                size = frame.size
+            elif frame.size != size:
+                # The writer's canvas has the first frame's size
+                self.stop_reason = (
+                    f"region changed size from {size[0]}x{size[1]}"
+                    f" to {frame.width}x{frame.height}"
+                )
+                print(f"Recording {self.stop_reason}, stopping")
+                break
+            self.captured += 1
+            self.duration = time.perf_counter() - start
+
+            if reference is None:
+                rect = (0, 0, frame.width, frame.height)
+            else:
+                rect = diff_rect(reference, frame)
+                if rect is None:
+                    self.unchanged += 1
+                    continue
+                rect = _align(rect, self._writer.alignment)
+
+            try:
+                self._queue.put_nowait((self.duration, frame, rect))
+            except queue.Full:
+                self.dropped += 1  # Diffed against the last queued frame next time
+                continue
+            reference = frame
+
+        self.duration = time.perf_counter() - start
+        self._queue.put((self.duration, None, None))
+
+    def _encode_loop(self) -> None:
+        """Encoder thread body."""
+        while True:
+            timestamp, frame, rect = self._queue.get()
+            if frame is None:
+                break
+            if self.error is not None:
+                continue  # Drain the queue after a failed write
+
+            start = time.perf_counter()
+            try:
+                x1, y1, x2, y2 = rect
+                part = frame.crop(
+                    frame.left + x1, frame.top + y1, frame.left + x2, frame.top + y2
+                )
+                self._writer.add(part.to_image(), x1, y1, timestamp)
+                self.written += 1
+            except Exception as e:
+                print(f"Failed to write recording frame: {e}")
+                self.error = e
+                self._stop.set()
+            self.encode_time += time.perf_counter() - start
+
+        try:
+            self._writer.close(timestamp)
+        except Exception as e:
+            print(f"Failed to finish recording: {e}")
+            self.error = self.error or e
+
+        if self._on_finish is not None:
+            try:
+                self._on_finish(self)
+            except Exception as e:
+                print(f"Recording finish action failed: {e}")
@@ -0,0 +1,245 @@
+"""Watch a pinned screen region and report when it changes."""
+
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from core.frame import Frame
+from core.startup import optional_module
+
+# NumPy is optional, fall back to per-tile CRC32; imported on first use
+np = optional_module("numpy")
+
+
+# Seed of the per-column and per-row weights mixed into the tile hashes
+_WEIGHT_SEED = 0x5C1F
+
+
+def _tile_starts(length: int, tile_size: int) -> List[int]:
+    """Get the first index of every tile along an axis."""
+    return list(range(0, length, tile_size))
+
+
+@lru_cache(maxsize=8)
+def _weights(length: int, seed: int) -> Any:
+    """Random odd 32-bit weights, so moving a pixel changes its tile's hash."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 1 << 32, size=length, dtype=np.uint32) | np.uint32(1)
+
+
+def tile_hashes(frame: Frame, tile_size: int = 32) -> Sequence[int]:
+    """
+    Hash every tile of a frame straight from its raw BGRA buffer.
+
+    Tiles are tile_size square, except at the right and bottom edges.
+    The alpha byte is ignored.
+
+    Args:
+        frame: Frame to hash
+        tile_size: Side of a tile in pixels
+
+    Returns:
+        One hash per tile, in row-major order
+    """
+    if np is not None:
+        return _tile_hashes_numpy(frame, tile_size)
+
+    hashes = []
+    for top in _tile_starts(frame.height, tile_size):
+        bottom = min(top + tile_size, frame.height)
+        for left in _tile_starts(frame.width, tile_size):
+            right = min(left + tile_size, frame.width)
+            value = 0
+            for y in range(top, bottom):
+                value = zlib.crc32(frame.row(y)[left * 4:right * 4], value)
+            hashes.append(value)
+    return hashes
+
+
+def _tile_hashes_numpy(frame: Frame, tile_size: int) -> Any:
+    """Vectorized tile_hashes: weighted sums modulo 2 ** 32 per tile."""
+    width, height = frame.width, frame.height
+    pixels = np.frombuffer(
+        frame.buffer, dtype=np.uint32,
+        count=(frame.stride // 4) * (height - 1) + width,
+        offset=frame.offset
+    )
+    pixels = np.lib.stride_tricks.as_strided(
+        pixels, shape=(height, width), strides=(frame.stride, 4)
+    )
+
+    mixed = (pixels & np.uint32(0x00FFFFFF)) * _weights(width, _WEIGHT_SEED)
+    columns = np.add.reduceat(mixed, _tile_starts(width, tile_size), axis=1)
+    columns *= _weights(height, _WEIGHT_SEED + 1)[:, None]
+    return np.add.reduceat(columns, _tile_starts(height, tile_size), axis=0).ravel()
+
+
+def changed_fraction(
+    size: Tuple[int, int],
+    tile_size: int,
+    previous: Sequence[int],
+    current: Sequence[int]
+) -> float:
+    """
+    Get the share of a frame's area covered by tiles whose hash changed.
+
+    Args:
+        size: Frame (width, height)
+        tile_size: Tile size the hashes were computed with
+        previous: Earlier tile_hashes of a frame of the same size
+        current: Later tile_hashes
+
+    Returns:
+        Changed area as a fraction between 0.0 and 1.0
+    """
+    width, height = size
+    widths = [min(tile_size, width - x) for x in _tile_starts(width, tile_size)]
+    heights = [min(tile_size, height - y) for y in _tile_starts(height, tile_size)]
+
+    if np is not None:
+        changed = (np.asarray(previous) != np.asarray(current)).reshape(
+            len(heights), len(widths)
+        )
+        area = np.asarray(heights) @ changed @ np.asarray(widths)
+        return float(area) / (width * height)
+
+    area = 0
+    for index, (old, new) in enumerate(zip(previous, current)):
+        if old != new:
+            row, column = divmod(index, len(widths))
+            area += heights[row] * widths[column]
+    return area / (width * height)
+
+
+class RegionWatcher:
+    """
+    Polls a screen region and calls back when enough of it changed.
+
+    Changes are measured against the last frame reported, so small edits
+    add up until they cross the threshold. The polling interval doubles
+    (by the backoff factor) while the region stays static and snaps back
+    to the base interval on any change, so a static region costs a grab
+    every few seconds at most.
+    """
+
+    def __init__(
+        self,
+        grab: Callable[[int, int, int, int], Optional[Frame]],
+        region: Tuple[int, int, int, int],
+        on_change: Callable[[Frame], None],
+        interval: float = 0.5,
+        max_interval: float = 5.0,
+        backoff: float = 2.0,
+        threshold: float = 0.01,
+        tile_size: int = 32
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            grab: Captures (x1, y1, x2, y2) as a frame, e.g.
+                  CaptureSession.grab_frame
+            region: Watched region (x1, y1, x2, y2)
+            on_change: Called on the watcher thread with the first frame and
+                       every frame that changed enough since the last call
+            interval: Seconds between polls while the region changes
+            max_interval: Longest seconds between polls while it is static
+            backoff: Factor the interval grows by after a static poll
+            threshold: Changed share of the area (0.0-1.0) that fires on_change
+            tile_size: Side of a hashed tile in pixels
+        """
+        self.region = region
+        self._grab = grab
+        self._on_change = on_change
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.threshold = threshold
+        self.tile_size = tile_size
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.current_interval = interval
+        self.polls = 0
+        self.changes = 0
+        self.hash_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start polling on a background thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="RegionWatch", daemon=True
+        )
+        self._thread.start()
+
+    def request_stop(self) -> None:
+        """Stop polling without waiting; no change is reported after this."""
+        self._stop.set()
+
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self.request_stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Watcher thread body."""
+        reported: Optional[Sequence[int]] = None
+        seen: Optional[Sequence[int]] = None
+        size: Optional[Tuple[int, int]] = None
+
+        while not self._stop.is_set():
+            frame = self._grab(*self.region)
+            self.polls += 1
+            if frame is None:
+                self._stop.wait(self.max_interval)
+                continue
+
+            start = time.perf_counter()
+            hashes = tile_hashes(frame, self.tile_size)
+            self.hash_time += time.perf_counter() - start
+
+            if reported is None or size != frame.size:
+                fire = True
+            else:
+                fire = changed_fraction(
+                    frame.size, self.tile_size, reported, hashes
+                ) >= self.threshold
+
+            # Back off only while nothing at all changed between polls
+            if seen is not None and size == frame.size and _same(seen, hashes):
+                self.current_interval = min(
+                    self.current_interval * self.backoff, self.max_interval
+                )
+            else:
+                self.current_interval = self.interval
+            seen, size = hashes, frame.size
+
+            # A stop requested during the grab skips the report
+            if fire and not self._stop.is_set():
+                reported = hashes
+                self.changes += 1
+                try:
+                    self._on_change(frame)
+                except Exception as e:
+                    print(f"Region watch action failed: {e}")
+
+            self._stop.wait(self.current_interval)
+
+
+def _same(previous: Sequence[int], current: Sequence[int]) -> bool:
+    """Whether two tile hash sequences are identical."""
+    if np is not None:
+        return bool(np.array_equal(previous, current))
+    return list(previous) == list(current)
@@ -1,12 +1,32 @@
 """Screenshot capture module using mss library."""
 
 import ctypes
+import sys
+import threading
 from io import BytesIO
-from typing import Tuple, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import mss
 from PIL import Image
 
+from core.encoder import encode_image
+from core.frame import Frame
+from core.monitor_topology import (
+    MonitorTopology,
+    Placement,
+    StaticTopologyProvider,
+    TopologyProvider,
+    Win32TopologyProvider,
+)
+
+
+# Indices for GetSystemMetrics, used to detect display configuration changes
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+SM_CMONITORS = 80
+
 
 def set_dpi_awareness():
     """Set DPI awareness to avoid coordinate offset issues on Windows."""
@@ -19,20 +39,58 @@ def set_dpi_awareness():
             pass
 
 
-def capture_region(
-    x1: int, y1: int, x2: int, y2: int
-) -> Optional[Image.Image]:
+def get_display_signature() -> Optional[Tuple[int, ...]]:
     """
-    Capture a specific region of the screen.
+    Get a cheap signature of the current display configuration.
 
-    Args:
-        x1: Left coordinate
-        y1: Top coordinate
-        x2: Right coordinate
-        y2: Bottom coordinate
+    The signature changes whenever the virtual screen bounds or the number
+    of monitors change, which is what a WM_DISPLAYCHANGE event reports.
 
     Returns:
-        PIL Image object of the captured region, or None on failure
+        Tuple of system metrics, or None if unavailable on this platform
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        metrics = ctypes.windll.user32.GetSystemMetrics
+        return (
+            metrics(SM_XVIRTUALSCREEN),
+            metrics(SM_YVIRTUALSCREEN),
+            metrics(SM_CXVIRTUALSCREEN),
+            metrics(SM_CYVIRTUALSCREEN),
+            metrics(SM_CMONITORS),
+        )
+    except Exception:
+        return None
+
+
+def get_cursor_pos() -> Optional[Tuple[int, int]]:
+    """
+    Get the current mouse cursor position in screen coordinates.
+
+    Returns:
+        Tuple of (x, y), or None if unavailable on this platform
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes.wintypes
+        point = ctypes.wintypes.POINT()
+        if ctypes.windll.user32.GetCursorPos(ctypes.byref(point)):
+            return point.x, point.y
+    except Exception:
+        pass
+    return None
+
+
+def _normalize_region(
+    x1: int, y1: int, x2: int, y2: int
+) -> Optional[Dict[str, int]]:
+    """
+    Build an mss monitor dict from two corner points.
+
+    Returns:
+        Monitor dict, or None if the region is empty
     """
     # Ensure coordinates are in correct order
     left = min(x1, x2)
@@ -47,23 +105,80 @@ def capture_region(
     if width <= 0 or height <= 0:
         return None
 
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def _grab_image(sct: Any, monitor: Dict[str, int]) -> Image.Image:
+    """Grab a monitor dict with an open grabber and convert to PIL Image."""
+    screenshot = sct.grab(monitor)
+    return Image.frombytes(
+        "RGB",
+        (screenshot.width, screenshot.height),
+        screenshot.rgb
+    )
+
+
+def _stitch(
+    left: int,
+    top: int,
+    size: Tuple[int, int],
+    placements: List[Placement],
+    screenshots: List[Any]
+) -> Frame:
+    """
+    Combine per-monitor grabs into one frame.
+
+    Args:
+        left: Screen x coordinate of the capture
+        top: Screen y coordinate of the capture
+        size: Stitched (width, height) from MonitorTopology.layout
+        placements: Where each grab goes
+        screenshots: Grab of each placement's source rectangle
+
+    Returns:
+        Frame of the capture; space outside every monitor is black
+    """
+    width, height = size
+    stride = width * 4
+    canvas = bytearray(stride * height)
+
+    for placement, screenshot in zip(placements, screenshots):
+        part = Frame.from_screenshot(screenshot)
+        if placement.scaled:
+            image = part.to_image().resize(placement.size, Image.Resampling.BICUBIC)
+            part = Frame(image.tobytes("raw", "BGRX"), 0, 0, *placement.size)
+
+        dest_x, dest_y = placement.dest
+        row_bytes = min(part.width, width - dest_x) * 4
+        for y in range(min(part.height, height - dest_y)):
+            start = (dest_y + y) * stride + dest_x * 4
+            canvas[start:start + row_bytes] = part.row(y)[:row_bytes]
+
+    return Frame(canvas, left, top, width, height)
+
+
+def capture_region(
+    x1: int, y1: int, x2: int, y2: int
+) -> Optional[Image.Image]:
+    """
+    Capture a specific region of the screen.
+
+    Args:
+        x1: Left coordinate
+        y1: Top coordinate
+        x2: Right coordinate
+        y2: Bottom coordinate
+
+    Returns:
+        PIL Image object of the captured region, or None on failure
+    """
+    monitor = _normalize_region(x1, y1, x2, y2)
+    if monitor is None:
+        return None
+
     try:
         with mss.mss() as sct:
-            monitor = {
-                "left": left,
-                "top": top,
-                "width": width,
-                "height": height
-            }
-            screenshot = sct.grab(monitor)
-
-            # Convert to PIL Image
-            img = Image.frombytes(
-                "RGB",
-                (screenshot.width, screenshot.height),
-                screenshot.rgb
-            )
-            return img
+            return _grab_image(sct, monitor)
     except Exception as e:
         print(f"Screenshot capture failed: {e}")
         return None
@@ -75,11 +190,15 @@ def image_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
 
     Args:
         image: PIL Image object
-        format: Image format (PNG, JPEG, etc.)
+        format: Image format (PNG, JPEG, etc.), or AUTO to pick the format
+                and settings from the image content
 
     Returns:
         Image data as bytes
     """
+    if format.upper() == "AUTO":
+        return encode_image(image).data
+
     buffer = BytesIO()
     image.save(buffer, format=format)
     buffer.seek(0)
@@ -97,3 +216,221 @@ def get_screen_size() -> Tuple[int, int]:
         # monitors[0] is the "all monitors" virtual screen
         all_monitors = sct.monitors[0]
         return all_monitors["width"], all_monitors["height"]
+
+
+class CaptureSession:
+    """
+    Long-lived, thread-safe screen capture session.
+
+    Keeps a single grabber open for the lifetime of the application instead
+    of creating a new ``mss.mss()`` context on every capture. The monitor
+    layout is enumerated once and cached until the display configuration
+    changes.
+
+    Captures only grab the monitors they overlap. A capture spanning
+    monitors with different scale factors is stitched at one consistent
+    resolution (see MonitorTopology.layout).
+    """
+
+    def __init__(
+        self,
+        grabber_factory: Optional[Callable[[], Any]] = None,
+        display_signature: Optional[Callable[[], Optional[Tuple[int, ...]]]] = None,
+        topology_provider: Optional[TopologyProvider] = None
+    ):
+        """
+        Initialize the capture session.
+
+        Args:
+            grabber_factory: Callable returning an mss-compatible grabber
+                            (defaults to mss.mss)
+            display_signature: Callable returning a value that changes on
+                               display configuration changes (defaults to
+                               get_display_signature)
+            topology_provider: Source of monitor scale factors (defaults to
+                               the Win32 API, or 100% scaling for every
+                               grabber monitor if that is unavailable)
+        """
+        self._grabber_factory = grabber_factory or mss.mss
+        self._display_signature = display_signature or get_display_signature
+        self._topology_provider = topology_provider or Win32TopologyProvider()
+
+        self._lock = threading.RLock()
+        self._grabber: Optional[Any] = None
+        self._monitors: Optional[List[Dict[str, int]]] = None
+        self._topology: Optional[MonitorTopology] = None
+        self._signature: Optional[Tuple[int, ...]] = None
+        self._closed = False
+
+    def __enter__(self) -> "CaptureSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _ensure_grabber(self) -> Any:
+        """Return the open grabber, reopening it after a display change."""
+        signature = self._display_signature()
+        if self._grabber is not None and signature != self._signature:
+            print("Display configuration changed, refreshing monitor layout")
+            self._release_grabber()
+
+        if self._grabber is None:
+            if self._closed:
+                raise RuntimeError("Capture session is closed")
+            self._grabber = self._grabber_factory()
+            self._signature = signature
+
+        return self._grabber
+
+    def _release_grabber(self) -> None:
+        """Close the grabber and drop the cached monitor layout."""
+        if self._grabber is not None:
+            try:
+                self._grabber.close()
+            except Exception:
+                pass
+        self._grabber = None
+        self._monitors = None
+        self._topology = None
+
+    @property
+    def monitors(self) -> List[Dict[str, int]]:
+        """
+        Get the cached monitor layout.
+
+        Returns:
+            List of monitor dicts; index 0 is the combined virtual screen
+        """
+        with self._lock:
+            grabber = self._ensure_grabber()
+            if self._monitors is None:
+                self._monitors = [dict(m) for m in grabber.monitors]
+            return [dict(m) for m in self._monitors]
+
+    @property
+    def topology(self) -> MonitorTopology:
+        """
+        Get the cached monitor topology.
+
+        Returns:
+            Spatial index of the monitors with their scale factors
+        """
+        with self._lock:
+            self._ensure_grabber()
+            if self._topology is None:
+                monitors = self._topology_provider.monitors()
+                if not monitors:
+                    monitors = StaticTopologyProvider.from_mss(self.monitors).monitors()
+                self._topology = MonitorTopology(monitors)
+            return self._topology
+
+    def invalidate(self) -> None:
+        """Drop the cached monitor layout, e.g. on WM_DISPLAYCHANGE."""
+        with self._lock:
+            self._release_grabber()
+
+    def capture_region(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> Optional[Image.Image]:
+        """
+        Capture a specific region of the screen.
+
+        Args:
+            x1: Left coordinate
+            y1: Top coordinate
+            x2: Right coordinate
+            y2: Bottom coordinate
+
+        Returns:
+            PIL Image object of the captured region, or None on failure
+        """
+        frame = self.grab_frame(x1, y1, x2, y2)
+        if frame is None:
+            return None
+        return frame.to_image()
+
+    def grab_frame(
+        self, x1: int, y1: int, x2: int, y2: int
+    ) -> Optional[Frame]:
+        """
+        Capture a specific region of the screen as a raw BGRA frame.
+
+        Args:
+            x1: Left coordinate
+            y1: Top coordinate
+            x2: Right coordinate
+            y2: Bottom coordinate
+
+        Returns:
+            Frame wrapping the grabbed pixels, or None on failure
+        """
+        monitor = _normalize_region(x1, y1, x2, y2)
+        if monitor is None:
+            return None
+
+        left, top = monitor["left"], monitor["top"]
+        right, bottom = left + monitor["width"], top + monitor["height"]
+
+        try:
+            with self._lock:
+                grabber = self._ensure_grabber()
+                size, placements = self.topology.layout(left, top, right, bottom)
+
+                # Within one monitor a single grab is already the result
+                if len(placements) <= 1:
+                    return Frame.from_screenshot(grabber.grab(monitor))
+
+                screenshots = [
+                    grabber.grab(_normalize_region(*placement.source))
+                    for placement in placements
+                ]
+            return _stitch(left, top, size, placements, screenshots)
+        except Exception as e:
+            print(f"Screenshot capture failed: {e}")
+            # Drop a possibly broken grabber so the next capture reopens it
+            self.invalidate()
+            return None
+
+    def grab_monitor_at(self, x: int, y: int) -> Optional[Frame]:
+        """
+        Capture the whole monitor containing a screen point.
+
+        Falls back to the combined virtual screen if no monitor contains
+        the point.
+
+        Args:
+            x: Screen x coordinate
+            y: Screen y coordinate
+
+        Returns:
+            Frame of the monitor, or None on failure
+        """
+        try:
+            topology = self.topology
+        except Exception as e:
+            print(f"Monitor enumeration failed: {e}")
+            return None
+
+        monitor = topology.monitor_at(x, y)
+        if monitor is None:
+            return self.grab_frame(*topology.bounds)
+        return self.grab_frame(
+            monitor.left, monitor.top, monitor.right, monitor.bottom
+        )
+
+    def get_screen_size(self) -> Tuple[int, int]:
+        """
+        Get the total screen size (including all monitors).
+
+        Returns:
+            Tuple of (width, height)
+        """
+        all_monitors = self.monitors[0]
+        return all_monitors["width"], all_monitors["height"]
+
+    def close(self) -> None:
+        """Close the session and release the grabber."""
+        with self._lock:
+            self._closed = True
+            self._release_grabber()
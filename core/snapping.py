@@ -0,0 +1,374 @@
+"""
+Snap selection edges to window and control boundaries.
+
+Two sources of edges are indexed when the hotkey is pressed: the
+rectangles of the visible top-level windows, and the long straight lines
+found in the frozen frame (panel borders, table rules, buttons). Every
+edge is a segment kept in a list sorted by position, so finding the
+nearest edge to the pointer during a drag is a bisect plus a scan of the
+few segments within the snap distance.
+"""
+
+import bisect
+import ctypes
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from core.frame import Frame
+from core.startup import optional_module
+
+# NumPy is optional, without it only windows snap; imported on first use
+np = optional_module("numpy")
+
+
+# DwmGetWindowAttribute: visible frame without the invisible resize border,
+# and whether the window is cloaked (on another virtual desktop, suspended)
+DWMWA_EXTENDED_FRAME_BOUNDS = 9
+DWMWA_CLOAKED = 14
+
+Rect = Tuple[int, int, int, int]
+
+# An edge at position (x of a vertical edge, y of a horizontal one)
+# spanning [start, end) along the other axis
+Segment = Tuple[int, int, int]
+
+
+class WindowProvider(ABC):
+    """Reports the visible windows, replaceable in tests."""
+
+    @abstractmethod
+    def windows(self) -> List[Rect]:
+        """Get window rectangles (x1, y1, x2, y2), front to back."""
+        raise NotImplementedError
+
+
+class StaticWindowProvider(WindowProvider):
+    """Fixed window rectangles, for synthetic setups."""
+
+    def __init__(self, windows: Sequence[Rect]):
+        """
+        Initialize the provider.
+
+        Args:
+            windows: Rectangles to report, front to back
+        """
+        self._windows = list(windows)
+
+    def windows(self) -> List[Rect]:
+        """Get window rectangles, front to back."""
+        return list(self._windows)
+
+
+class Win32WindowProvider(WindowProvider):
+    """Enumerates visible top-level windows with the Win32 API."""
+
+    def __init__(self, exclude: Sequence[int] = ()):
+        """
+        Initialize the provider.
+
+        Args:
+            exclude: Window handles to leave out, e.g. the overlay
+        """
+        self.exclude = set(exclude)
+
+    def windows(self) -> List[Rect]:
+        """
+        Get the visible, non-minimized windows in z-order.
+
+        Returns:
+            Window rectangles front to back, or an empty list on failure
+        """
+        if sys.platform != "win32":
+            return []
+        try:
+            import ctypes.wintypes as wintypes
+
+            enum_proc = ctypes.WINFUNCTYPE(
+                wintypes.BOOL, wintypes.HWND, wintypes.LPARAM
+            )
+            handles: List[Any] = []
+
+            def collect(handle, data):
+                handles.append(handle)
+                return 1
+
+            user32 = ctypes.windll.user32
+            user32.EnumWindows(enum_proc(collect), 0)
+
+            windows = []
+            for handle in handles:
+                if handle in self.exclude:
+                    continue
+                if not user32.IsWindowVisible(handle) or user32.IsIconic(handle):
+                    continue
+                rect = self._bounds(handle)
+                if rect is not None and rect[2] > rect[0] and rect[3] > rect[1]:
+                    windows.append(rect)
+            return windows
+        except Exception as e:
+            print(f"Window enumeration failed: {e}")
+            return []
+
+    @staticmethod
+    def _bounds(handle: Any) -> Optional[Rect]:
+        """Get the visible frame of a window, or None if it is cloaked."""
+        import ctypes.wintypes as wintypes
+
+        dwmapi = ctypes.windll.dwmapi
+        cloaked = wintypes.DWORD()
+        if dwmapi.DwmGetWindowAttribute(
+                handle, DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked)
+        ) == 0 and cloaked.value:
+            return None
+
+        rect = wintypes.RECT()
+        if dwmapi.DwmGetWindowAttribute(
+                handle, DWMWA_EXTENDED_FRAME_BOUNDS, ctypes.byref(rect), ctypes.sizeof(rect)
+        ) != 0 and not ctypes.windll.user32.GetWindowRect(handle, ctypes.byref(rect)):
+            return None
+        return rect.left, rect.top, rect.right, rect.bottom
+
+
+class EdgeIndex:
+    """Edge segments of one orientation, sorted by position."""
+
+    def __init__(self, segments: Iterable[Segment]):
+        """
+        Initialize the index.
+
+        Args:
+            segments: (position, start, end) of each edge
+        """
+        ordered = sorted(segments)
+        self._positions = [segment[0] for segment in ordered]
+        self._starts = [segment[1] for segment in ordered]
+        self._ends = [segment[2] for segment in ordered]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def nearest(self, position: int, along: int, tolerance: int) -> Optional[int]:
+        """
+        Find the closest edge passing near a point.
+
+        Args:
+            position: Point coordinate across the edges
+            along: Point coordinate along the edges
+            tolerance: Largest distance snapped, in pixels
+
+        Returns:
+            Position of the closest edge, or None if none is in reach
+        """
+        best = None
+        best_distance = tolerance + 1
+        index = bisect.bisect_left(self._positions, position - tolerance)
+        while index < len(self._positions) and self._positions[index] <= position + tolerance:
+            if self._starts[index] - tolerance <= along < self._ends[index] + tolerance:
+                distance = abs(self._positions[index] - position)
+                if distance < best_distance:
+                    best, best_distance = self._positions[index], distance
+            index += 1
+        return best
+
+
+def _subtract(start: int, end: int, covers: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Remove covered intervals from [start, end)."""
+    parts = [(start, end)]
+    for cover_start, cover_end in covers:
+        remaining = []
+        for part_start, part_end in parts:
+            if cover_end <= part_start or cover_start >= part_end:
+                remaining.append((part_start, part_end))
+                continue
+            if part_start < cover_start:
+                remaining.append((part_start, cover_start))
+            if cover_end < part_end:
+                remaining.append((cover_end, part_end))
+        parts = remaining
+    return parts
+
+
+def window_edges(windows: Sequence[Rect]) -> Tuple[List[Segment], List[Segment]]:
+    """
+    Get the visible parts of the window borders.
+
+    Args:
+        windows: Window rectangles, front to back
+
+    Returns:
+        Vertical and horizontal edge segments; parts hidden behind a window
+        further in front are left out
+    """
+    vertical: List[Segment] = []
+    horizontal: List[Segment] = []
+    for index, (x1, y1, x2, y2) in enumerate(windows):
+        front = windows[:index]
+        for x in (x1, x2):
+            covers = [(w[1], w[3]) for w in front if w[0] < x < w[2]]
+            vertical.extend((x, start, end) for start, end in _subtract(y1, y2, covers))
+        for y in (y1, y2):
+            covers = [(w[0], w[2]) for w in front if w[1] < y < w[3]]
+            horizontal.extend((y, start, end) for start, end in _subtract(x1, x2, covers))
+    return vertical, horizontal
+
+
+def _runs(cells: Any, block: int, min_blocks: int) -> List[Segment]:
+    """
+    Turn an edge map into segments.
+
+    Args:
+        cells: (blocks, positions) boolean map, True where a block of the
+               edge line at that position is mostly strong gradient
+        block: Pixels per block
+        min_blocks: Shortest run of blocks kept
+
+    Returns:
+        (position, start, end) of every run, in map coordinates
+    """
+    padded = np.zeros((cells.shape[1], cells.shape[0] + 2), dtype=np.int8)
+    padded[:, 1:-1] = cells.T
+    steps = np.diff(padded, axis=1)
+    positions, starts = np.nonzero(steps == 1)
+    _, ends = np.nonzero(steps == -1)
+    keep = ends - starts >= min_blocks
+    return list(zip(
+        positions[keep].tolist(),
+        (starts[keep] * block).tolist(),
+        (ends[keep] * block).tolist()
+    ))
+
+
+def frame_edges(
+    frame: Frame,
+    block: int = 16,
+    threshold: int = 24,
+    min_length: int = 48
+) -> Tuple[List[Segment], List[Segment]]:
+    """
+    Find long straight edges in a frame.
+
+    The luma gradient across each axis is thresholded at full resolution
+    and then reduced to blocks along the edge direction: a block counts
+    when most of its pixels are on the edge. Edges keep exact positions
+    while the map is block times smaller.
+
+    Args:
+        frame: Frame to search, e.g. the frozen screen
+        block: Pixels per block along the edges
+        threshold: Luma difference between neighbours counted as an edge
+        min_length: Shortest edge kept, in pixels
+
+    Returns:
+        Vertical and horizontal edge segments in screen coordinates, or
+        two empty lists without NumPy
+    """
+    if np is None or frame.width < 2 or frame.height < 2:
+        return [], []
+
+    width, height = frame.width, frame.height
+    src = np.frombuffer(
+        frame.buffer, dtype=np.uint8,
+        count=frame.stride * (height - 1) + width * 4,
+        offset=frame.offset
+    )
+    src = np.lib.stride_tricks.as_strided(
+        src, (height, width, 4), (frame.stride, 4, 1)
+    )
+    luma = (
+        src[..., 0].astype(np.int16) + 2 * src[..., 1].astype(np.int16) + src[..., 2]
+    ) >> 2
+
+    needed = block - block // 4
+    min_blocks = max(1, -(-min_length // block))
+
+    # Vertical edges lie between columns x - 1 and x
+    strong = np.abs(np.diff(luma, axis=1)) > threshold
+    rows = height // block * block
+    cells = strong[:rows].reshape(rows // block, block, width - 1).sum(
+        axis=1, dtype=np.uint16
+    ) >= needed
+    vertical = [
+        (frame.left + x + 1, frame.top + start, frame.top + end)
+        for x, start, end in _runs(cells, block, min_blocks)
+    ]
+
+    strong = np.abs(np.diff(luma, axis=0)) > threshold
+    columns = width // block * block
+    cells = strong[:, :columns].reshape(height - 1, columns // block, block).sum(
+        axis=2, dtype=np.uint16
+    ) >= needed
+    horizontal = [
+        (frame.top + y + 1, frame.left + start, frame.left + end)
+        for y, start, end in _runs(cells.T, block, min_blocks)
+    ]
+    return vertical, horizontal
+
+
+class Snapper:
+    """
+    Snaps points to the nearest indexed edge on each axis.
+
+    Edge sources can be added while the snapper is in use, e.g. the
+    frame's edges once they are computed on a worker; queries see either
+    the old or the new set of indexes.
+    """
+
+    def __init__(self, tolerance: int = 8):
+        """
+        Initialize an empty snapper.
+
+        Args:
+            tolerance: Largest distance snapped, in pixels
+        """
+        self.tolerance = tolerance
+        self._indexes: Tuple[Tuple[EdgeIndex, EdgeIndex], ...] = ()
+
+    @classmethod
+    def from_windows(cls, provider: WindowProvider, tolerance: int = 8) -> "Snapper":
+        """
+        Build a snapper with the edges of the visible windows.
+
+        Args:
+            provider: Source of the window rectangles
+            tolerance: Largest distance snapped, in pixels
+        """
+        snapper = cls(tolerance)
+        snapper.add(*window_edges(provider.windows()))
+        return snapper
+
+    def add(self, vertical: Iterable[Segment], horizontal: Iterable[Segment]) -> None:
+        """
+        Index more edges; earlier sources win ties.
+
+        Args:
+            vertical: Vertical edge segments in screen coordinates
+            horizontal: Horizontal edge segments in screen coordinates
+        """
+        self._indexes = self._indexes + ((EdgeIndex(vertical), EdgeIndex(horizontal)),)
+
+    def add_frame(self, frame: Frame) -> None:
+        """Index the long straight edges of a frame."""
+        self.add(*frame_edges(frame))
+
+    def snap(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        Move a point onto the closest edges within reach.
+
+        Args:
+            x: Screen x coordinate
+            y: Screen y coordinate
+
+        Returns:
+            Snapped (x, y); an axis without an edge in reach is unchanged
+        """
+        best_x, best_y = x, y
+        distance_x = distance_y = self.tolerance + 1
+        for vertical, horizontal in self._indexes:
+            edge = vertical.nearest(x, y, self.tolerance)
+            if edge is not None and abs(edge - x) < distance_x:
+                best_x, distance_x = edge, abs(edge - x)
+            edge = horizontal.nearest(y, x, self.tolerance)
+            if edge is not None and abs(edge - y) < distance_y:
+                best_y, distance_y = edge, abs(edge - y)
+        return best_x, best_y
@@ -0,0 +1,202 @@
+"""Startup helpers: background module preloading and import profiling."""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Modules only needed once the first capture happens. They are imported on
+# a background thread after the tray icon is up so the first capture does
+# not pay for them, and so they do not delay the tray appearing.
+PRELOAD_MODULES = (
+    "win32clipboard",
+    "webbrowser",
+    "numpy",
+)
+
+
+class _DeferredModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Any = None
+
+    def __getattr__(self, attr: str) -> Any:
+        module = self._module
+        if module is None:
+            # The import system serializes concurrent first imports
+            module = self._module = importlib.import_module(self._name)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<deferred module {self._name!r}>"
+
+
+def optional_module(name: str) -> Optional[Any]:
+    """
+    Get an optional module without importing it yet.
+
+    Only checks that the module is installed; it is imported the first
+    time one of its attributes is used, or earlier by preload_modules().
+
+    Args:
+        name: Module name, e.g. "numpy"
+
+    Returns:
+        Stand-in for the module, or None if it is not installed
+    """
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    return _DeferredModule(name)
+
+
+def _preload_pil_codecs() -> None:
+    """Import the PIL codecs Image.save() would otherwise load on first use."""
+    from PIL import Image
+    Image.preinit()
+
+
+def preload_modules(
+    modules: Iterable[str] = PRELOAD_MODULES,
+    pil_codecs: bool = True
+) -> threading.Thread:
+    """
+    Import modules on a background thread.
+
+    Modules that are not installed are skipped silently; whatever imports
+    them for real reports the error.
+
+    Args:
+        modules: Module names to import
+        pil_codecs: Also load the common PIL image codecs
+
+    Returns:
+        The started daemon thread
+    """
+    modules = list(modules)
+
+    def run() -> None:
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+        if pil_codecs:
+            _preload_pil_codecs()
+
+    thread = threading.Thread(target=run, name="Preload", daemon=True)
+    thread.start()
+    return thread
+
+
+class ImportProfiler:
+    """
+    Measures how long each module takes to import, like ``python -X importtime``.
+
+    Hooks the import system's module loading function, so it sees every
+    first-time import including submodules pulled in by ``from x import y``.
+    Only imports made on the installing thread are timed.
+    """
+
+    def __init__(self):
+        """Initialize the profiler."""
+        # (module, self seconds, cumulative seconds) in completion order
+        self.records: List[Tuple[str, float, float]] = []
+        self._stack: List[float] = []
+        self._bootstrap = sys.modules.get("_frozen_importlib")
+        self._original = None
+        self._thread_id: Optional[int] = None
+        self.started_at = time.perf_counter()
+
+    def install(self) -> bool:
+        """
+        Start timing imports.
+
+        Returns:
+            True if the import system could be hooked
+        """
+        original = getattr(self._bootstrap, "_find_and_load", None)
+        if original is None:
+            print("Import profiling is not supported on this Python")
+            return False
+
+        self._original = original
+        self._thread_id = threading.get_ident()
+
+        def find_and_load(name, import_):
+            if threading.get_ident() != self._thread_id or name in sys.modules:
+                return original(name, import_)
+
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, import_)
+            finally:
+                total = time.perf_counter() - start
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += total
+                self.records.append((name, total - children, total))
+
+        self._bootstrap._find_and_load = find_and_load
+        return True
+
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        if self._original is not None:
+            self._bootstrap._find_and_load = self._original
+            self._original = None
+
+    def top_level(self) -> Dict[str, float]:
+        """
+        Get the cumulative import time of each top-level package.
+
+        Returns:
+            Seconds per top-level package, counting its first import only
+        """
+        totals: Dict[str, float] = {}
+        for name, self_time, _ in self.records:
+            root = name.partition(".")[0]
+            totals[root] = totals.get(root, 0.0) + self_time
+        return totals
+
+    def report(self, ready_at: Optional[float] = None, limit: int = 25) -> str:
+        """
+        Format the profile.
+
+        Args:
+            ready_at: perf_counter() time the tray icon became ready
+            limit: Number of modules listed in each table
+
+        Returns:
+            Multi-line report
+        """
+        total_import = sum(self_time for _, self_time, _ in self.records)
+        lines = [
+            f"Imported {len(self.records)} modules in {total_import * 1000:.1f} ms"
+        ]
+        if ready_at is not None:
+            lines.append(
+                f"Tray ready {(ready_at - self.started_at) * 1000:.1f} ms after main.py started"
+            )
+
+        lines.append("")
+        lines.append(f"{'package':<32} {'ms':>9}")
+        packages = sorted(self.top_level().items(), key=lambda item: -item[1])
+        for name, seconds in packages[:limit]:
+            lines.append(f"{name:<32} {seconds * 1000:9.1f}")
+
+        lines.append("")
+        lines.append(f"{'module':<40} {'self ms':>9} {'cumul ms':>9}")
+        slowest = sorted(self.records, key=lambda record: -record[1])
+        for name, self_time, total in slowest[:limit]:
+            lines.append(f"{name:<40} {self_time * 1000:9.1f} {total * 1000:9.1f}")
+
+        return "\n".join(lines)
@@ -0,0 +1,235 @@
+"""Per-stage latency tracing for the capture pipeline."""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+# Milestones of one capture, in pipeline order
+HOTKEY_RECEIVED = "hotkey_received"
+OVERLAY_VISIBLE = "overlay_visible"
+SELECTION_CONFIRMED = "selection_confirmed"
+CAPTURE_DONE = "capture_done"
+CLIPBOARD_WRITTEN = "clipboard_written"
+BROWSER_LAUNCHED = "browser_launched"
+
+MILESTONES = (
+    HOTKEY_RECEIVED,
+    OVERLAY_VISIBLE,
+    SELECTION_CONFIRMED,
+    CAPTURE_DONE,
+    CLIPBOARD_WRITTEN,
+    BROWSER_LAUNCHED,
+)
+
+
+class Trace:
+    """Monotonic timestamps of the milestones of one capture."""
+
+    __slots__ = ("trace_id", "start", "marks")
+
+    def __init__(self, trace_id: int, start: Optional[float] = None):
+        """
+        Initialize the trace at the hotkey press.
+
+        Args:
+            trace_id: Sequence number of the trace
+            start: time.perf_counter() of the hotkey press
+        """
+        self.trace_id = trace_id
+        self.start = time.perf_counter() if start is None else start
+        self.marks: Dict[str, float] = {HOTKEY_RECEIVED: self.start}
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        """
+        Record a milestone.
+
+        Args:
+            name: Milestone name
+            at: time.perf_counter() value (defaults to now)
+        """
+        self.marks[name] = time.perf_counter() if at is None else at
+
+    def offsets(self) -> Dict[str, float]:
+        """Get every milestone as milliseconds since the hotkey press."""
+        return {
+            name: (at - self.start) * 1000
+            for name, at in sorted(self.marks.items(), key=lambda item: item[1])
+        }
+
+
+class _NullTrace(Trace):
+    """Trace used when tracing is disabled; every call is a no-op."""
+
+    __slots__ = ()
+    trace_id = 0
+    start = 0.0
+    marks: Dict[str, float] = {}
+
+    def __init__(self):
+        pass
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        pass
+
+    def offsets(self) -> Dict[str, float]:
+        return {}
+
+
+NULL_TRACE = _NullTrace()
+
+
+class RollingHistogram:
+    """Percentiles over the most recent samples."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the histogram.
+
+        Args:
+            window: Number of recent samples kept
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self._samples.append(value)
+
+    def percentiles(self, *points: float) -> Tuple[float, ...]:
+        """
+        Get nearest-rank percentiles of the current window.
+
+        Args:
+            *points: Percentiles between 0 and 100
+
+        Returns:
+            One value per requested percentile (0.0 when empty)
+        """
+        ordered = sorted(self._samples)
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        # The smallest sample with at least p% of the samples at or below it
+        count = len(ordered)
+        return tuple(
+            ordered[min(count, max(1, math.ceil(p * count / 100))) - 1] for p in points
+        )
+
+
+class Tracer:
+    """
+    Collects traces into rolling per-milestone histograms.
+
+    Each finished trace adds the time from the hotkey press to every
+    milestone it reached, and is optionally appended to a JSONL file.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        window: int = 200,
+        trace_file: Optional[str] = None
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled: When False, begin() returns a no-op trace
+            window: Samples kept per histogram
+            trace_file: Path of a JSONL file to append finished traces to
+        """
+        self.enabled = enabled
+        self.trace_file = trace_file
+
+        self._window = window
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.count = 0
+
+    def begin(self, start: Optional[float] = None) -> Trace:
+        """
+        Start a trace at the hotkey press.
+
+        Args:
+            start: time.perf_counter() of the press (defaults to now)
+
+        Returns:
+            Trace, or NULL_TRACE when disabled
+        """
+        if not self.enabled:
+            return NULL_TRACE
+        with self._lock:
+            trace_id = self._next_id
+            self._next_id += 1
+        return Trace(trace_id, start)
+
+    def finish(self, trace: Trace) -> None:
+        """
+        Record a completed trace.
+
+        Args:
+            trace: Trace returned by begin()
+        """
+        if not self.enabled or trace is NULL_TRACE:
+            return
+
+        offsets = trace.offsets()
+        with self._lock:
+            self.count += 1
+            for name, offset in offsets.items():
+                if name == HOTKEY_RECEIVED:
+                    continue
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = RollingHistogram(self._window)
+                histogram.add(offset)
+
+        if self.trace_file:
+            self._append(trace, offsets)
+
+    def _append(self, trace: Trace, offsets: Dict[str, float]) -> None:
+        """Append one trace as a JSON line."""
+        record = {
+            "id": trace.trace_id,
+            "time": time.time(),
+            "ms": {name: round(value, 3) for name, value in offsets.items()},
+        }
+        try:
+            with open(self.trace_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Failed to write trace: {e}")
+
+    def summary(self) -> Dict[str, Tuple[float, float, float, int]]:
+        """
+        Get p50/p95/p99 per milestone, in milliseconds since the hotkey.
+
+        Returns:
+            Mapping of milestone to (p50, p95, p99, sample count)
+        """
+        with self._lock:
+            names = [name for name in MILESTONES if name in self._histograms]
+            names += sorted(set(self._histograms) - set(names))
+            return {
+                name: self._histograms[name].percentiles(50, 95, 99)
+                + (len(self._histograms[name]),)
+                for name in names
+            }
+
+    def summary_lines(self) -> List[str]:
+        """Get the summary as short human-readable lines."""
+        if not self.enabled:
+            return ["Tracing disabled"]
+        summary = self.summary()
+        if not summary:
+            return ["No captures yet"]
+        return [
+            f"{name.replace('_', ' ')}: p50 {p50:.0f} / p95 {p95:.0f} / p99 {p99:.0f} ms"
+            for name, (p50, p95, p99, _) in summary.items()
+        ]
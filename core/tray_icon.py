@@ -3,7 +3,8 @@
 import os
 import sys
 import threading
-from typing import Callable, Optional
+import time
+from typing import Any, Callable, Iterator, List, Optional
 
 from PIL import Image, ImageDraw
 import pystray
@@ -53,15 +54,37 @@ class TrayIcon:
 
     def __init__(
         self,
-        on_quit: Optional[Callable[[], None]] = None
+        on_quit: Optional[Callable[[], None]] = None,
+        history: Optional[Any] = None,
+        on_history_select: Optional[Callable[[int], None]] = None,
+        stats_provider: Optional[Callable[[], List[str]]] = None,
+        on_watch_toggle: Optional[Callable[[], None]] = None,
+        watch_active: Optional[Callable[[], bool]] = None,
+        on_record_toggle: Optional[Callable[[], None]] = None,
+        record_active: Optional[Callable[[], bool]] = None
     ):
         """
         Initialize the tray icon.
 
         Args:
             on_quit: Callback when quit is selected
+            history: CaptureHistory listed in the "Recent Captures" submenu
+            on_history_select: Callback with the entry id to re-copy
+            stats_provider: Returns the lines shown in the "Stats" submenu
+            on_watch_toggle: Callback when "Watch Region" is clicked
+            watch_active: Returns whether a region is being watched, shown
+                          as the item's check mark
+            on_record_toggle: Callback when "Record Region" is clicked
+            record_active: Returns whether a region is being recorded
         """
         self._on_quit = on_quit
+        self._history = history
+        self._on_history_select = on_history_select
+        self._stats_provider = stats_provider
+        self._on_watch_toggle = on_watch_toggle
+        self._watch_active = watch_active
+        self._on_record_toggle = on_record_toggle
+        self._record_active = record_active
         self._icon: Optional[pystray.Icon] = None
         self._thread: Optional[threading.Thread] = None
 
@@ -82,8 +105,18 @@ class TrayIcon:
                 pass
         return create_default_icon()
 
-    def start(self, hotkey: str) -> None:
-        """Start the tray icon in a background thread."""
+    def start(
+        self,
+        hotkey: str,
+        on_ready: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Start the tray icon in a background thread.
+
+        Args:
+            hotkey: Hotkey shown in the menu
+            on_ready: Callback once the icon is shown
+        """
         menu = pystray.Menu(
             pystray.MenuItem(
                 f"SwiftClip",
@@ -96,6 +129,28 @@ class TrayIcon:
                 enabled=False
             ),
             pystray.Menu.SEPARATOR,
+            pystray.MenuItem(
+                "Recent Captures",
+                pystray.Menu(self._history_items),
+                visible=self._history is not None
+            ),
+            pystray.MenuItem(
+                "Watch Region",
+                self._watch_clicked,
+                checked=lambda item: bool(self._watch_active and self._watch_active()),
+                visible=self._on_watch_toggle is not None
+            ),
+            pystray.MenuItem(
+                "Record Region",
+                self._record_clicked,
+                checked=lambda item: bool(self._record_active and self._record_active()),
+                visible=self._on_record_toggle is not None
+            ),
+            pystray.MenuItem(
+                "Stats",
+                pystray.Menu(self._stats_items),
+                visible=self._stats_provider is not None
+            ),
             pystray.MenuItem("Exit", self._quit)
         )
 
@@ -106,7 +161,14 @@ class TrayIcon:
             menu=menu
         )
 
-        self._thread = threading.Thread(target=self._icon.run, daemon=True)
+        def setup(icon: pystray.Icon) -> None:
+            icon.visible = True
+            if on_ready is not None:
+                on_ready()
+
+        self._thread = threading.Thread(
+            target=self._icon.run, args=(setup,), daemon=True
+        )
         self._thread.start()
 
     def stop(self) -> None:
@@ -115,6 +177,48 @@ class TrayIcon:
             self._icon.stop()
             self._icon = None
 
+    def refresh_menu(self) -> None:
+        """Rebuild dynamic menu items such as the capture history."""
+        if self._icon:
+            self._icon.update_menu()
+
+    def _history_items(self) -> Iterator[pystray.MenuItem]:
+        """Generate one menu item per history entry, newest first."""
+        entries = self._history.entries() if self._history is not None else []
+        if not entries:
+            yield pystray.MenuItem("(empty)", lambda: None, enabled=False)
+            return
+
+        for entry in entries:
+            label = (
+                f"{time.strftime('%H:%M:%S', time.localtime(entry.timestamp))}"
+                f"  {entry.width}\u00d7{entry.height}"
+            )
+            yield pystray.MenuItem(label, self._make_history_action(entry.id))
+
+    def _stats_items(self) -> Iterator[pystray.MenuItem]:
+        """Generate one disabled menu item per stats line."""
+        lines = self._stats_provider() if self._stats_provider else []
+        for line in lines or ["No stats yet"]:
+            yield pystray.MenuItem(line, lambda: None, enabled=False)
+
+    def _watch_clicked(self) -> None:
+        """Handle the "Watch Region" menu item."""
+        if self._on_watch_toggle:
+            self._on_watch_toggle()
+
+    def _record_clicked(self) -> None:
+        """Handle the "Record Region" menu item."""
+        if self._on_record_toggle:
+            self._on_record_toggle()
+
+    def _make_history_action(self, entry_id: int) -> Callable[[], None]:
+        """Create a menu action that re-copies one history entry."""
+        def action() -> None:
+            if self._on_history_select:
+                self._on_history_select(entry_id)
+        return action
+
     def notify(self, title: str, message: str) -> None:
         """Show a notification from the tray icon."""
         if self._icon:
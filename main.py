@@ -11,40 +11,185 @@ Usage:
     4. Drag to select the area you want to translate
     5. Google Lens opens - press Ctrl+V to paste the image
     6. Right-click tray icon and select Exit to quit
+
+Run with a subcommand (capture, frames, monitors) for headless captures,
+see cli.py. Run with --profile-startup to print the import cost of every
+module and the time until the tray icon is shown.
 """
 
 import sys
 import threading
 import time
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+# Subcommands run the headless CLI, without the tray, hotkey or overlay
+if __name__ == "__main__" and len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+    import cli
+    sys.exit(cli.main(sys.argv[1:]))
+
+# Time every import below when profiling startup
+from core.startup import ImportProfiler, preload_modules
+_import_profiler: Optional[ImportProfiler] = None
+if "--profile-startup" in sys.argv:
+    _import_profiler = ImportProfiler()
+    _import_profiler.install()
+
+from concurrent.futures import ThreadPoolExecutor
 
 # Set DPI awareness before importing Tkinter
 from core.screenshot_capture import set_dpi_awareness
 set_dpi_awareness()
 
 import config
+from core.browser_resolver import BrowserResolver
+from core.capture_history import CaptureHistory
+from core.dedup_cache import DedupCache
+from core.dispatcher import CaptureRequest, CaptureScheduler, Dispatcher
+from core.encoder import encode_image, sniff_mime_type
+from core.frame import Frame, stack_frames
 from core.hotkey_manager import HotkeyManager
-from core.overlay_selector import OverlaySelector
-from core.screenshot_capture import capture_region
 from core.lens_integration import open_google_lens
+from core.ipc_server import IpcServer, capture_handlers
+from core.overlay_selector import OverlayService
+from core.pipeline import Pipeline, StageFailed
+from core.preprocess import available as preprocess_available, preprocess
+from core.recorder import Recorder, open_writer, recording_path
+from core.region_watch import RegionWatcher
+from core.screenshot_capture import CaptureSession, get_cursor_pos
+from core.snapping import Snapper, Win32WindowProvider
+from core.tracing import (
+    BROWSER_LAUNCHED,
+    CAPTURE_DONE,
+    CLIPBOARD_WRITTEN,
+    NULL_TRACE,
+    OVERLAY_VISIBLE,
+    SELECTION_CONFIRMED,
+    Trace,
+    Tracer,
+)
 from core.tray_icon import TrayIcon
-from utils.clipboard import copy_image_to_clipboard
+from utils.clipboard import (
+    CF_DIB,
+    clipboard_history_enabled,
+    close_default_backend,
+    copy_dib_to_clipboard,
+    copy_frame_to_clipboard,
+    copy_image_to_clipboard,
+)
+from utils.dib import frame_dib_rows, frame_to_dib, stack_dibs
+
+if TYPE_CHECKING:
+    from core.lens_upload import LensUploader
+
+
+# Pipeline stages whose completion marks a trace milestone
+_STAGE_MILESTONES = (
+    ("capture", CAPTURE_DONE),
+    ("clipboard", CLIPBOARD_WRITTEN),
+    ("browser", BROWSER_LAUNCHED),
+)
 
 
 class SwiftClip:
     """Main application class for SwiftClip."""
 
-    def __init__(self):
-        """Initialize the SwiftClip application."""
+    def __init__(self, import_profiler: Optional[ImportProfiler] = None):
+        """
+        Initialize the SwiftClip application.
+
+        Args:
+            import_profiler: Profiler reported once the tray icon is shown
+        """
+        self.import_profiler = import_profiler
+        self.tray_ready_at: Optional[float] = None
         self.hotkey_manager = HotkeyManager()
-        self.tray_icon = TrayIcon(on_quit=self._on_quit)
-        self._is_selecting = False
-        self._running = True
+        self.capture_session = CaptureSession()
+        self.overlay_service = OverlayService(
+            alpha=config.OVERLAY_ALPHA,
+            selection_color=config.SELECTION_COLOR,
+            border_width=config.SELECTION_BORDER_WIDTH,
+            max_fps=config.OVERLAY_MAX_FPS,
+            show_readout=config.SHOW_SELECTION_READOUT
+        )
+        self.history: Optional[CaptureHistory] = None
+        if config.HISTORY_MAX_BYTES > 0:
+            self.history = CaptureHistory(
+                config.HISTORY_MAX_BYTES,
+                format=config.HISTORY_FORMAT,
+                on_change=self._on_history_change
+            )
+        self.dedup: Optional[DedupCache] = None
+        if config.DEDUP_ENABLED:
+            self.dedup = DedupCache(
+                max_entries=config.DEDUP_MAX_ENTRIES,
+                max_bytes=config.DEDUP_MAX_BYTES
+            )
+        if config.PREPROCESS_ENABLED and not preprocess_available():
+            print("Preprocessing needs NumPy (pip install numpy), captures are copied unchanged")
+        self.tracer = Tracer(
+            enabled=config.TRACE_ENABLED,
+            window=config.TRACE_WINDOW,
+            trace_file=config.TRACE_FILE
+        )
+        self.browser_resolver = BrowserResolver()
+        self.uploader: Optional["LensUploader"] = None
+        if config.LENS_DIRECT_UPLOAD:
+            # Imported here so http.client only loads when direct upload is on
+            from core.lens_upload import LensUploader
+            self.uploader = LensUploader(config.LENS_UPLOAD_URL)
+        self.watcher: Optional[RegionWatcher] = None
+        self.recorder: Optional[Recorder] = None
+        self.ipc_server: Optional[IpcServer] = None
+        if config.IPC_ENABLED:
+            self.ipc_server = IpcServer(
+                capture_handlers(self.capture_session, output_dir=config.IPC_OUTPUT_DIR),
+                address=config.IPC_ADDRESS,
+                authkey=config.IPC_AUTHKEY.encode() if config.IPC_AUTHKEY else None
+            )
+        self.tray_icon = TrayIcon(
+            on_quit=self._on_quit,
+            history=self.history,
+            on_history_select=self._on_history_select,
+            stats_provider=self._stats_lines,
+            on_watch_toggle=self._on_watch_toggle,
+            watch_active=lambda: self.watcher is not None,
+            on_record_toggle=self._on_record_toggle,
+            record_active=lambda: self.recorder is not None
+        )
+
+        # All captures run on one dispatcher thread, one at a time
+        self.dispatcher = Dispatcher("CaptureDispatcher")
+        self.scheduler = CaptureScheduler(
+            self.dispatcher,
+            self._start_selection,
+            on_cancel=self.overlay_service.cancel,
+            policy=config.HOTKEY_BUSY_POLICY
+        )
+
+        # Independent post-selection stages run concurrently on this pool
+        self.executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="Pipeline"
+        )
+        self._stopped = threading.Event()
 
     def start(self) -> None:
         """Start the application."""
         # Start tray icon
-        self.tray_icon.start(config.HOTKEY)
+        self.tray_icon.start(config.HOTKEY, on_ready=self._on_tray_ready)
+
+        # Find the browser to launch while nothing else is happening
+        self.browser_resolver.start()
+
+        # Build the overlay once so hotkey presses only have to show it
+        if not self.overlay_service.start():
+            self.tray_icon.notify("Error", "Failed to create selection overlay")
+            sys.exit(1)
+
+        self.dispatcher.start()
+
+        # Let other programs request captures; the app works without it
+        if self.ipc_server is not None and not self.ipc_server.start():
+            self.ipc_server = None
 
         # Register hotkey
         if not self.hotkey_manager.register(config.HOTKEY, self._on_hotkey):
@@ -57,18 +202,46 @@ class SwiftClip:
             f"Press {config.HOTKEY.upper()} to select region"
         )
 
-        # Keep running
+        # Block until stop() without waking up while idle
         try:
-            while self._running:
-                time.sleep(0.1)
+            self._stopped.wait()
         except KeyboardInterrupt:
             self.stop()
 
     def stop(self) -> None:
         """Stop the application."""
-        self._running = False
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
         self.hotkey_manager.unregister()
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.recorder is not None:
+            self.recorder.stop()
+        if self.ipc_server is not None:
+            self.ipc_server.stop()
+        self.scheduler.cancel()
+        self.dispatcher.stop()
+        self.executor.shutdown(wait=False)
         self.tray_icon.stop()
+        self.overlay_service.stop()
+        self.capture_session.close()
+        close_default_backend()
+        if self.history is not None:
+            self.history.close()
+        if self.uploader is not None:
+            self.uploader.close()
+
+    def _on_tray_ready(self) -> None:
+        """Load what the first capture needs once the tray icon is shown."""
+        self.tray_ready_at = time.perf_counter()
+
+        if config.PRELOAD_AFTER_TRAY:
+            preload_modules()
+
+        if self.import_profiler is not None:
+            self.import_profiler.uninstall()
+            print(self.import_profiler.report(self.tray_ready_at))
 
     def _on_quit(self) -> None:
         """Handle quit from tray menu."""
@@ -77,78 +250,678 @@ class SwiftClip:
 
     def _on_hotkey(self) -> None:
         """Handle hotkey press."""
-        if self._is_selecting:
+        # Hand the press to the dispatcher so the keyboard listener is
+        # never blocked; presses during a selection follow the busy policy
+        trace = self.tracer.begin()
+        request = self.scheduler.trigger(trace=trace)
+        if request is None:
             return  # Already selecting
 
-        self._is_selecting = True
+        # Open the upload connection while the user is still dragging
+        if self.uploader is not None:
+            self.uploader.prewarm()
 
-        # Run selection in a new thread to avoid blocking keyboard listener
-        thread = threading.Thread(target=self._start_selection)
-        thread.start()
+    def _freeze_screen(self) -> Optional[Frame]:
+        """
+        Grab the monitor under the cursor before the overlay appears.
 
-    def _start_selection(self) -> None:
-        """Start the screen region selection process."""
-        try:
-            # Create and show overlay
-            overlay = OverlaySelector(
-                alpha=config.OVERLAY_ALPHA,
-                selection_color=config.SELECTION_COLOR,
-                border_width=config.SELECTION_BORDER_WIDTH
+        Returns:
+            Frozen frame to crop the selection from, or None if disabled
+        """
+        if not config.FREEZE_FRAME:
+            return None
+
+        cursor = get_cursor_pos() or (0, 0)
+        return self.capture_session.grab_monitor_at(*cursor)
+
+    def _build_snapper(self, frozen: Optional[Frame]) -> Optional[Snapper]:
+        """
+        Index the edges the selection snaps to.
+
+        Window edges are read right away; the frozen frame's edges are
+        found on a pipeline worker and join the index once ready.
+
+        Args:
+            frozen: Frame grabbed at hotkey time, if any
+
+        Returns:
+            Snapper for the overlay, or None if snapping is disabled
+        """
+        if not config.SNAP_ENABLED:
+            return None
+
+        snapper = Snapper.from_windows(
+            Win32WindowProvider(), tolerance=config.SNAP_DISTANCE
+        )
+        if frozen is not None:
+            self.executor.submit(snapper.add_frame, frozen)
+        return snapper
+
+    def _start_selection(self, request: CaptureRequest) -> None:
+        """
+        Start the screen region selection process.
+
+        Args:
+            request: Capture request from the scheduler
+        """
+        trace = request.trace or NULL_TRACE
+
+        # Freeze the screen as it was when the hotkey was pressed
+        frozen = self._freeze_screen()
+        snapper = self._build_snapper(frozen)
+
+        # Show the warm overlay and wait for the selection
+        regions = self.overlay_service.select(
+            requested_at=request.requested_at,
+            cancelled=request.cancelled,
+            on_visible=lambda at: trace.mark(OVERLAY_VISIBLE, at),
+            snapper=snapper
+        )
+
+        if not regions or request.is_cancelled:
+            return  # Cancelled
+
+        trace.mark(SELECTION_CONFIRMED)
+        self._process_selection(regions, frozen, trace)
+
+    def _process_selection(
+        self,
+        regions: List[Tuple[int, int, int, int]],
+        frozen: Optional[Frame] = None,
+        trace: Trace = NULL_TRACE
+    ) -> None:
+        """
+        Process the selected regions.
+
+        Args:
+            regions: Selection coordinates, each as (x1, y1, x2, y2)
+            frozen: Frame grabbed at hotkey time to crop the selection from
+            trace: Latency trace of this capture
+        """
+        sequence = len(regions) > 1 and config.MULTI_REGION_MODE == "sequence"
+        # Without clipboard history every write replaces the previous one,
+        # so the regions are stitched and kept separately in the tray history
+        fallback = sequence and not clipboard_history_enabled()
+        if fallback:
+            print("Clipboard history is off, stitching the regions instead")
+            sequence = False
+        if sequence:
+            pipeline = self._build_sequence_pipeline(regions, frozen)
+        elif len(regions) > 1:
+            pipeline = self._build_stitch_pipeline(regions, frozen, keep_regions=fallback)
+        else:
+            pipeline = self._build_pipeline(
+                lambda: self._capture_regions(regions, frozen)[0]
+            )
+        result = pipeline.run(self.executor)
+
+        # Stage end times become the trace milestones
+        for stage, milestone in _STAGE_MILESTONES:
+            if stage in result.results:
+                trace.mark(milestone, result.timings[stage][1])
+        self.tracer.finish(trace)
+        self.tray_icon.refresh_menu()
+
+        message = result.message()
+        if message is not None:
+            self.tray_icon.notify("Error", message)
+        elif result.results.get("browser"):
+            self.tray_icon.notify("Google Lens", "Capture uploaded to Google Lens")
+        elif sequence:
+            self.tray_icon.notify(
+                "Screenshots Copied",
+                f"{len(regions)} captures copied, press Win+V for the earlier ones"
+            )
+        elif fallback:
+            self.tray_icon.notify(
+                "Screenshots Copied",
+                f"{len(regions)} captures stitched into one image; turn on "
+                "clipboard history (Win+V) to copy them one by one"
+            )
+        else:
+            self.tray_icon.notify(
+                "Screenshot Copied",
+                "Press Ctrl+V in Google Lens to paste"
             )
 
-            # Use a simple callback mechanism
-            result = {"coords": None}
+    def _build_pipeline(
+        self,
+        capture: Callable[[], Frame],
+        open_browser: bool = True,
+        dedup: bool = True
+    ) -> Pipeline:
+        """
+        Build the post-selection stages.
 
-            def on_selection(coords: Optional[Tuple[int, int, int, int]]) -> None:
-                result["coords"] = coords
+        The browser launch does not depend on the image stages, so in paste
+        mode it starts right away while capture and DIB conversion run.
+        With preprocessing on, the clipboard and upload get the processed
+        frame while history keeps the capture as taken.
 
-            overlay.show(on_selection)
+        Args:
+            capture: Returns the frame to process
+            open_browser: Open Google Lens once the capture is ready
+            dedup: Reuse payloads cached for an identical capture
 
-            # Process the selection
-            coords = result["coords"]
+        Returns:
+            Pipeline ready to run
+        """
+        pipeline = Pipeline()
+        pipeline.stage("capture", capture)
+        self._add_output_stages(pipeline, open_browser, dedup=dedup)
+        return pipeline
+
+    def _build_stitch_pipeline(
+        self,
+        regions: List[Tuple[int, int, int, int]],
+        frozen: Optional[Frame] = None,
+        keep_regions: bool = False
+    ) -> Pipeline:
+        """
+        Build the stages copying several regions stacked into one image.
 
-            if coords is None:
-                return  # Cancelled
+        The CF_DIB rows of every region are converted concurrently and
+        joined into the stitched CF_DIB, while the regions are stacked into
+        the frame the other formats, history and upload use. With
+        preprocessing on, the clipboard renders from the processed frame.
 
-            self._process_selection(coords)
+        Args:
+            regions: Selection coordinates, each as (x1, y1, x2, y2)
+            frozen: Frame grabbed at hotkey time to crop the selection from
+            keep_regions: Also add every region to the tray history
 
-        finally:
-            self._is_selecting = False
+        Returns:
+            Pipeline ready to run
+        """
+        gap = config.MULTI_REGION_GAP
+        pipeline = Pipeline()
+        pipeline.stage("regions", lambda: self._capture_regions(regions, frozen))
+        pipeline.stage(
+            "capture", lambda frames: stack_frames(frames, gap=gap), requires=("regions",)
+        )
 
-    def _process_selection(self, coords: Tuple[int, int, int, int]) -> None:
+        dib = None
+        if not config.PREPROCESS_ENABLED:
+            conversions = []
+            for index in range(len(regions)):
+                name = f"dib{index}"
+                pipeline.stage(
+                    name,
+                    lambda frames, index=index: frame_dib_rows(
+                        frames[index], max(frame.width for frame in frames)
+                    ),
+                    requires=("regions",)
+                )
+                conversions.append(name)
+            pipeline.stage(
+                "dib",
+                lambda frames, *rows: stack_dibs(
+                    rows, max(frame.width for frame in frames), gap=gap
+                ),
+                requires=("regions",) + tuple(conversions)
+            )
+            dib = "dib"
+
+        self._add_output_stages(pipeline, dib=dib)
+        if keep_regions and self.history is not None:
+            pipeline.stage(
+                "region_history",
+                lambda frames: [self.history.add(frame) for frame in frames],
+                requires=("regions",)
+            )
+        return pipeline
+
+    def _add_output_stages(
+        self,
+        pipeline: Pipeline,
+        open_browser: bool = True,
+        dib: Optional[str] = None,
+        dedup: bool = True
+    ) -> None:
+        """
+        Add the stages after the "capture" stage of a pipeline.
+
+        Args:
+            pipeline: Pipeline with a stage named "capture" giving the frame
+            open_browser: Open Google Lens once the capture is ready
+            dib: Stage giving the CF_DIB of the frame, if one builds it
+            dedup: Reuse payloads cached for an identical capture
+        """
+        source = "capture"
+        if config.PREPROCESS_ENABLED:
+            pipeline.stage("preprocess", self._preprocess, requires=("capture",))
+            source = "preprocess"
+        if dedup:
+            pipeline.stage("dedup", self._lookup_dedup, requires=(source,))
+        else:
+            pipeline.stage("dedup", lambda frame: (None, None), requires=(source,))
+        pipeline.stage(
+            "clipboard",
+            self._copy_to_clipboard,
+            requires=(source, "dedup") + ((dib,) if dib is not None else ())
+        )
+        if self.history is not None:
+            pipeline.stage("history", self.history.add, requires=("capture",))
+
+        if self.uploader is not None:
+            pipeline.stage("upload", self._upload, requires=(source, "dedup"))
+            if open_browser:
+                pipeline.stage("browser", self._open_lens, requires=("upload",))
+        elif open_browser:
+            pipeline.stage("browser", self._open_lens)
+
+    def _build_sequence_pipeline(
+        self,
+        regions: List[Tuple[int, int, int, int]],
+        frozen: Optional[Frame] = None
+    ) -> Pipeline:
         """
-        Process the selected region.
+        Build the stages copying several regions one after another.
+
+        Every region is converted to a DIB concurrently; the clipboard
+        writes then happen in selection order, so the last region ends up
+        on the clipboard and the others in the clipboard and tray history.
 
         Args:
-            coords: Selection coordinates (x1, y1, x2, y2)
+            regions: Selection coordinates, each as (x1, y1, x2, y2)
+            frozen: Frame grabbed at hotkey time to crop the selection from
+
+        Returns:
+            Pipeline ready to run
         """
-        x1, y1, x2, y2 = coords
+        pipeline = Pipeline()
+        pipeline.stage("capture", lambda: self._capture_regions(regions, frozen))
+
+        conversions = []
+        for index in range(len(regions)):
+            name = f"dib{index}"
+            pipeline.stage(
+                name,
+                lambda frames, index=index: frame_to_dib(frames[index]),
+                requires=("capture",)
+            )
+            conversions.append(name)
+
+        pipeline.stage("clipboard", self._copy_sequence, requires=tuple(conversions))
+        if self.history is not None:
+            pipeline.stage(
+                "history",
+                lambda frames: [self.history.add(frame) for frame in frames],
+                requires=("capture",)
+            )
+        pipeline.stage("browser", self._open_lens)
 
-        # Capture screenshot
-        image = capture_region(x1, y1, x2, y2)
+        return pipeline
 
-        if image is None:
+    def _capture_regions(
+        self,
+        regions: List[Tuple[int, int, int, int]],
+        frozen: Optional[Frame] = None
+    ) -> List[Frame]:
+        """
+        Get each selected region as a frame, all from a single grab.
+
+        Crops from the frozen frame, or from one live grab of the box
+        around every region if it does not cover them all.
+
+        Args:
+            regions: Selection coordinates, each as (x1, y1, x2, y2)
+            frozen: Frame grabbed at hotkey time
+
+        Returns:
+            Frame of each region, in selection order
+        """
+        source = frozen
+        if len(regions) > 1 and (
+                source is None or not all(source.contains(*r) for r in regions)):
+            x1 = min(r[0] for r in regions)
+            y1 = min(r[1] for r in regions)
+            x2 = max(r[2] for r in regions)
+            y2 = max(r[3] for r in regions)
+            source = self.capture_session.grab_frame(x1, y1, x2, y2)
+
+            # A grab stitched across monitors at another DPI cannot be
+            # cropped by screen coordinates
+            if source is not None and source.size != (x2 - x1, y2 - y1):
+                source = None
+
+        frames = []
+        for region in regions:
+            frame = source.crop(*region) if source is not None else None
+            if frame is None:
+                frame = self.capture_session.grab_frame(*region)
+            if frame is None:
+                raise StageFailed("Failed to capture screenshot")
+            frames.append(frame)
+        return frames
+
+    def _preprocess(self, frame: Frame) -> Frame:
+        """
+        Prepare a capture for recognition.
+
+        Args:
+            frame: Captured frame
+
+        Returns:
+            Trimmed, colour-reduced and enlarged frame as configured
+        """
+        return preprocess(
+            frame,
+            trim=config.PREPROCESS_TRIM,
+            max_scale=config.PREPROCESS_MAX_SCALE,
+            colors=config.PREPROCESS_COLORS,
+            max_pixels=config.PREPROCESS_MAX_PIXELS
+        )
+
+    def _lookup_dedup(self, frame: Frame) -> Tuple[Optional[tuple], Optional[dict]]:
+        """
+        Look up payloads already encoded for an identical capture.
+
+        Args:
+            frame: Captured frame
+
+        Returns:
+            Tuple of (dedup cache key, cached payloads or None)
+        """
+        if self.dedup is None:
+            return None, None
+        key = self.dedup.key(frame)
+        return key, self.dedup.lookup(key)
+
+    def _copy_to_clipboard(
+        self,
+        frame: Frame,
+        dedup: Tuple[Optional[tuple], Optional[dict]],
+        dib: Optional[bytes] = None
+    ) -> None:
+        """
+        Copy a capture to the clipboard.
+
+        The formats are only announced here and rendered when pasted; a
+        repeated capture's cached CF_DIB is offered as already rendered, and
+        a freshly rendered one is cached for the next repeat.
+
+        Args:
+            frame: Captured frame
+            dedup: Result of _lookup_dedup
+            dib: CF_DIB already built for the frame, if any
+        """
+        key, cached = dedup
+        on_render = None
+        if cached is not None and "dib" in cached:
+            dib = cached["dib"]
+        elif dib is not None:
+            if key is not None:
+                self.dedup.add_payload(key, "dib", dib)
+        elif key is not None:
+            def on_render(fmt: int, data: bytes) -> None:
+                if fmt == CF_DIB:
+                    self.dedup.add_payload(key, "dib", data)
+
+        if not copy_frame_to_clipboard(frame, dib=dib, on_render=on_render):
+            raise StageFailed("Failed to copy to clipboard")
+
+    def _copy_sequence(self, *dibs: bytes) -> None:
+        """
+        Copy several DIBs to the clipboard one after another.
+
+        Args:
+            dibs: DIB of each region, in selection order
+        """
+        for dib in dibs:
+            if not copy_dib_to_clipboard(dib):
+                raise StageFailed("Failed to copy to clipboard")
+
+    def _upload(
+        self,
+        frame: Frame,
+        dedup: Tuple[Optional[tuple], Optional[dict]]
+    ) -> Optional[str]:
+        """
+        Upload a capture to Lens, reusing a repeated capture's encoding.
+
+        Args:
+            frame: Captured frame
+            dedup: Result of _lookup_dedup
+
+        Returns:
+            Results page URL, or None on failure
+        """
+        key, cached = dedup
+        if cached is not None and "upload" in cached:
+            data = cached["upload"]
+        else:
+            try:
+                data = encode_image(
+                    frame.to_image(), max_pixels=config.UPLOAD_MAX_PIXELS
+                ).data
+            except Exception as e:
+                print(f"Failed to encode capture for upload: {e}")
+                return None
+            if key is not None:
+                self.dedup.add_payload(key, "upload", data)
+
+        return self.uploader.upload(data, sniff_mime_type(data))
+
+    def _open_lens(self, results_url: Optional[str] = None) -> bool:
+        """
+        Open Google Lens, on the upload results page if there is one.
+
+        Args:
+            results_url: Results page of a direct upload
+
+        Returns:
+            True if the results page was opened, False for the paste page
+        """
+        if results_url and open_google_lens(results_url, self.browser_resolver):
+            return True
+        if self.uploader is not None:
+            print("Direct upload failed, falling back to paste")
+
+        if not open_google_lens(resolver=self.browser_resolver):
+            raise StageFailed("Failed to open browser")
+        return False
+
+    def _on_watch_toggle(self) -> None:
+        """Start watching a newly selected region, or stop watching."""
+        watcher, self.watcher = self.watcher, None
+        if watcher is not None:
+            # Don't block the tray thread on a grab in progress
+            watcher.request_stop()
+            self.tray_icon.refresh_menu()
+            self.tray_icon.notify("SwiftClip", "Stopped watching region")
+            return
+
+        # Select through the scheduler so it follows the busy policy and
+        # can be cancelled like a hotkey selection
+        self.scheduler.trigger(run=self._select_watch_region)
+
+    def _select_watch_region(self, request: CaptureRequest) -> None:
+        """
+        Let the user pin a region and start watching it.
+
+        Args:
+            request: Capture request from the scheduler
+        """
+        regions = self.overlay_service.select(
+            requested_at=request.requested_at, cancelled=request.cancelled
+        )
+        if not regions or request.is_cancelled:
+            return  # Cancelled
+
+        # Several regions are watched as the box around all of them
+        region = (
+            min(r[0] for r in regions), min(r[1] for r in regions),
+            max(r[2] for r in regions), max(r[3] for r in regions),
+        )
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.watcher = RegionWatcher(
+            self.capture_session.grab_frame,
+            region,
+            self._on_watch_change,
+            interval=config.WATCH_INTERVAL,
+            max_interval=config.WATCH_MAX_INTERVAL,
+            threshold=config.WATCH_CHANGE_THRESHOLD,
+            tile_size=config.WATCH_TILE_SIZE
+        )
+        self.watcher.start()
+        self.tray_icon.refresh_menu()
+        self.tray_icon.notify(
+            "SwiftClip", "Watching region, it is copied again whenever it changes"
+        )
+
+    def _on_watch_change(self, frame: Frame) -> None:
+        """
+        Copy a watched region that changed, without opening the browser.
+
+        The region only fires on a change, so its frames are never looked up
+        in or added to the dedup cache.
+
+        Args:
+            frame: New frame of the watched region
+        """
+        pipeline = self._build_pipeline(lambda: frame, open_browser=False, dedup=False)
+        result = pipeline.run(self.executor)
+        self.tray_icon.refresh_menu()
+
+        message = result.message()
+        if message is not None:
+            self.tray_icon.notify("Error", message)
+
+    def _on_record_toggle(self) -> None:
+        """Start recording a newly selected region, or stop recording."""
+        recorder = self.recorder
+        if recorder is not None:
+            # Runs on the tray thread, so only signal; _on_record_finish
+            # reports the result once the queued frames are written
+            recorder.request_stop()
+            return
+
+        # Select through the scheduler so it follows the busy policy and
+        # can be cancelled like a hotkey selection
+        self.scheduler.trigger(run=self._select_record_region)
+
+    def _select_record_region(self, request: CaptureRequest) -> None:
+        """
+        Let the user pick a region and start recording it.
+
+        Args:
+            request: Capture request from the scheduler
+        """
+        regions = self.overlay_service.select(
+            requested_at=request.requested_at, cancelled=request.cancelled
+        )
+        if not regions or request.is_cancelled or self.recorder is not None:
+            return  # Cancelled
+
+        # Several regions are recorded as the box around all of them
+        region = (
+            min(r[0] for r in regions), min(r[1] for r in regions),
+            max(r[2] for r in regions), max(r[3] for r in regions),
+        )
+
+        # The first grab gives the clip size, which differs from the region
+        # when it spans monitors with different scale factors
+        frame = self.capture_session.grab_frame(*region)
+        if frame is None:
             self.tray_icon.notify("Error", "Failed to capture screenshot")
             return
 
-        # Copy to clipboard
-        if not copy_image_to_clipboard(image):
-            self.tray_icon.notify("Error", "Failed to copy to clipboard")
+        path = recording_path(config.RECORD_DIR, config.RECORD_FORMAT)
+        try:
+            writer = open_writer(path, frame.size)
+        except (OSError, ValueError) as e:
+            self.tray_icon.notify("Error", f"Failed to start recording: {e}")
             return
 
-        # Open Google Lens
-        if open_google_lens():
-            self.tray_icon.notify(
-                "Screenshot Copied",
-                "Press Ctrl+V in Google Lens to paste"
+        self.recorder = Recorder(
+            self.capture_session.grab_frame,
+            region,
+            writer,
+            fps=config.RECORD_FPS,
+            max_queue=config.RECORD_QUEUE_FRAMES,
+            max_duration=config.RECORD_MAX_SECONDS,
+            on_finish=lambda recorder: self._on_record_finish(recorder, path)
+        )
+        self.recorder.start()
+        self.tray_icon.refresh_menu()
+        self.tray_icon.notify(
+            "SwiftClip", "Recording region, choose Record Region again to stop"
+        )
+
+    def _on_record_finish(self, recorder: Recorder, path: str) -> None:
+        """
+        Report a finished recording.
+
+        Args:
+            recorder: Recorder that finished
+            path: File the recording was written to
+        """
+        if self.recorder is recorder:
+            self.recorder = None
+        self.tray_icon.refresh_menu()
+
+        if recorder.error is not None:
+            self.tray_icon.notify("Error", f"Recording failed: {recorder.error}")
+            return
+        print(f"Recorded {path}: {recorder.summary()}")
+        self.tray_icon.notify("Recording Saved", f"{path}\n{recorder.summary()}")
+
+    def _stats_lines(self) -> List[str]:
+        """Get the lines shown in the tray "Stats" submenu."""
+        lines = self.tracer.summary_lines()
+        if self.overlay_service.last_show_latency is not None:
+            lines.append(
+                f"last overlay show: {self.overlay_service.last_show_latency * 1000:.0f} ms"
+            )
+        if self.dedup is not None:
+            stats = self.dedup.stats
+            lines.append(
+                f"dedup: {stats['hits']} hits / {stats['misses']} misses"
+            )
+        watcher = self.watcher
+        if watcher is not None:
+            lines.append(
+                f"watch: {watcher.changes} changes in {watcher.polls} polls, "
+                f"next in {watcher.current_interval:.1f} s"
             )
+        recorder = self.recorder
+        if recorder is not None:
+            lines.append(f"recording: {recorder.summary()}")
+        return lines
+
+    def _on_history_change(self) -> None:
+        """Refresh the tray history submenu."""
+        self.tray_icon.refresh_menu()
+
+    def _on_history_select(self, entry_id: int) -> None:
+        """
+        Copy a capture from the history back to the clipboard.
+
+        Args:
+            entry_id: History entry id
+        """
+        entry = self.history.get(entry_id)
+        if entry is None:
+            self.tray_icon.notify("Error", "Capture is no longer in history")
+            return
+
+        frame = entry.frame
+        if frame is not None:
+            copied = copy_frame_to_clipboard(frame)
         else:
-            self.tray_icon.notify("Error", "Failed to open browser")
+            copied = copy_image_to_clipboard(entry.to_image())
+
+        if copied:
+            self.tray_icon.notify("Screenshot Copied", "Capture copied from history")
+        else:
+            self.tray_icon.notify("Error", "Failed to copy to clipboard")
 
 
 def main():
     """Main entry point."""
-    app = SwiftClip()
+    app = SwiftClip(import_profiler=_import_profiler)
     app.start()
 
 
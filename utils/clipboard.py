@@ -1,41 +1,510 @@
-"""Clipboard utilities for copying images."""
+"""
+Clipboard utilities for copying images.
+
+Images are offered as CF_DIB, CF_DIBV5 (32-bit with alpha) and the
+registered "PNG" format using delayed rendering: publishing only announces
+the formats, and each one is encoded the first time a program pastes it.
+Encoded formats are cached, so repeated pastes cost nothing.
+"""
+
+import sys
+import threading
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
 
-import io
 from PIL import Image
 
+from core.frame import Frame
+from core.png_writer import encode_png
+from utils.dib import (
+    BITMAPINFOHEADER_SIZE,
+    dib_header,
+    dib_stride,
+    frame_to_dib,
+    frame_to_dibv5,
+    image_to_dib,
+    image_to_dibv5,
+)
+
+
+# Standard clipboard format identifiers for device-independent bitmaps
+CF_DIB = 8
+CF_DIBV5 = 17
+
+# Name of the registered format browsers and Office paste PNG data from
+PNG_FORMAT_NAME = "PNG"
+
+# zlib level of the clipboard PNG; pasting waits for it, so favour speed
+PNG_COMPRESS_LEVEL = 1
+
+# First identifier Windows hands out for registered formats
+_FIRST_REGISTERED_FORMAT = 0xC000
+
+# Window messages used for delayed rendering
+WM_CLOSE = 0x0010
+WM_DESTROY = 0x0002
+WM_RENDERFORMAT = 0x0305
+WM_RENDERALLFORMATS = 0x0306
+WM_DESTROYCLIPBOARD = 0x0307
+WM_APP = 0x8000
+_WM_PUBLISH = WM_APP + 1
+
+# Parent handle that makes a window message-only
+HWND_MESSAGE = -3
 
-def copy_image_to_clipboard(image: Image.Image) -> bool:
+
+class ClipboardData:
     """
-    Copy a PIL Image to the Windows clipboard.
+    Formats offered for one clipboard write, each rendered on demand.
+
+    Rendering is thread-safe and happens at most once per format.
+    """
+
+    def __init__(
+        self,
+        renderers: Dict[int, Callable[[], bytes]],
+        rendered: Optional[Dict[int, bytes]] = None,
+        on_render: Optional[Callable[[int, bytes], None]] = None
+    ):
+        """
+        Initialize the data.
+
+        Args:
+            renderers: Function building the data of each offered format
+            rendered: Data already built for some formats
+            on_render: Called with the format and data after each render
+        """
+        self._renderers = dict(renderers)
+        self._rendered: Dict[int, bytes] = dict(rendered or {})
+        self._on_render = on_render
+        self._lock = threading.Lock()
+        self.render_count = 0
+
+    @property
+    def formats(self) -> List[int]:
+        """Offered format identifiers, in order of preference."""
+        formats = list(self._renderers)
+        formats += [fmt for fmt in self._rendered if fmt not in self._renderers]
+        return formats
+
+    def is_rendered(self, fmt: int) -> bool:
+        """Whether a format's data has been built."""
+        return fmt in self._rendered
+
+    def render(self, fmt: int) -> bytes:
+        """
+        Get a format's data, building it on first use.
+
+        Args:
+            fmt: Offered format identifier
+
+        Returns:
+            The format's data
+        """
+        with self._lock:
+            data = self._rendered.get(fmt)
+            if data is None:
+                data = self._renderers[fmt]()
+                self._rendered[fmt] = data
+                self.render_count += 1
+                if self._on_render is not None:
+                    self._on_render(fmt, data)
+            return data
+
+
+class ClipboardBackend(ABC):
+    """Interface for publishing raw data to the clipboard."""
+
+    @abstractmethod
+    def set_formats(self, formats: Dict[int, bytes]) -> None:
+        """
+        Replace the clipboard contents.
+
+        Args:
+            formats: Mapping of clipboard format identifier to data
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def register_format(self, name: str) -> int:
+        """
+        Get the identifier of a named clipboard format.
+
+        Args:
+            name: Format name, e.g. "PNG"
+
+        Returns:
+            The same identifier for the same name
+        """
+        raise NotImplementedError
+
+    def publish(self, data: ClipboardData) -> None:
+        """
+        Replace the clipboard contents with formats rendered on demand.
+
+        Backends without delayed rendering render every format up front.
+
+        Args:
+            data: Offered formats
+        """
+        self.set_formats({fmt: data.render(fmt) for fmt in data.formats})
+
+    def close(self) -> None:
+        """Release the backend, keeping published data pasteable if possible."""
+
+
+class Win32ClipboardBackend(ClipboardBackend):
+    """
+    Clipboard backend using pywin32.
+
+    Delayed rendering needs a clipboard owner window, so a hidden
+    message-only window runs on its own thread. Windows sends it
+    WM_RENDERFORMAT when a program pastes a format that is not rendered
+    yet, and WM_RENDERALLFORMATS when it is destroyed while owning the
+    clipboard, so published data stays pasteable after SwiftClip exits.
+    """
+
+    def __init__(self):
+        """Initialize the backend, raising ImportError without pywin32."""
+        import win32clipboard
+        self._clipboard = win32clipboard
+        self._content: Optional[ClipboardData] = None
+        self._hwnd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._publish_lock = threading.Lock()
+        self._pending: Optional[ClipboardData] = None
+        self._published = threading.Event()
+        self._publish_error: Optional[Exception] = None
+
+    def set_formats(self, formats: Dict[int, bytes]) -> None:
+        """Replace the Windows clipboard contents."""
+        clipboard = self._clipboard
+        clipboard.OpenClipboard()
+        try:
+            clipboard.EmptyClipboard()
+            for fmt, data in formats.items():
+                clipboard.SetClipboardData(fmt, data)
+        finally:
+            clipboard.CloseClipboard()
+
+    def register_format(self, name: str) -> int:
+        """Register (or look up) a named Windows clipboard format."""
+        return self._clipboard.RegisterClipboardFormat(name)
+
+    def publish(self, data: ClipboardData) -> None:
+        """Offer formats for delayed rendering by the owner window."""
+        hwnd = self._ensure_owner()
+        import win32gui
+
+        with self._publish_lock:
+            self._pending = data
+            self._publish_error = None
+            self._published.clear()
+            win32gui.PostMessage(hwnd, _WM_PUBLISH, 0, 0)
+            if not self._published.wait(5.0):
+                raise RuntimeError("Clipboard owner window is not responding")
+            if self._publish_error is not None:
+                raise self._publish_error
+
+    def close(self) -> None:
+        """Destroy the owner window, rendering what is still on the clipboard."""
+        if self._hwnd is None:
+            return
+        import win32gui
+        win32gui.PostMessage(self._hwnd, WM_CLOSE, 0, 0)
+        self._thread.join(timeout=5.0)
+        self._hwnd = None
+        self._thread = None
+
+    def _ensure_owner(self) -> int:
+        """Start the owner window thread on first use."""
+        if self._hwnd is None:
+            self._ready.clear()
+            self._thread = threading.Thread(
+                target=self._run_owner, name="ClipboardOwner", daemon=True
+            )
+            self._thread.start()
+            if not self._ready.wait(5.0) or self._hwnd is None:
+                raise RuntimeError("Failed to create clipboard owner window")
+        return self._hwnd
+
+    def _run_owner(self) -> None:
+        """Owner thread body: create the window and pump its messages."""
+        import win32api
+        import win32gui
+
+        window_class = win32gui.WNDCLASS()
+        window_class.lpszClassName = "SwiftClipClipboardOwner"
+        window_class.hInstance = win32api.GetModuleHandle(None)
+        window_class.lpfnWndProc = {
+            _WM_PUBLISH: self._on_publish,
+            WM_RENDERFORMAT: self._on_render_format,
+            WM_RENDERALLFORMATS: self._on_render_all_formats,
+            WM_DESTROYCLIPBOARD: self._on_destroy_clipboard,
+            WM_DESTROY: lambda hwnd, msg, wparam, lparam: win32gui.PostQuitMessage(0),
+        }
+        try:
+            try:
+                win32gui.RegisterClass(window_class)
+            except win32gui.error:
+                pass  # Registered by an earlier owner thread
+            self._hwnd = win32gui.CreateWindow(
+                window_class.lpszClassName, "SwiftClip Clipboard", 0,
+                0, 0, 0, 0, HWND_MESSAGE, 0, window_class.hInstance, None
+            )
+        except Exception as e:
+            print(f"Failed to create clipboard owner window: {e}")
+            self._ready.set()
+            return
+
+        self._ready.set()
+        win32gui.PumpMessages()
+
+    def _on_publish(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        """Take clipboard ownership and announce the pending formats."""
+        data, self._pending = self._pending, None
+        clipboard = self._clipboard
+        try:
+            clipboard.OpenClipboard(hwnd)
+            try:
+                # Emptying sends WM_DESTROYCLIPBOARD, so set the content after
+                clipboard.EmptyClipboard()
+                self._content = data
+                for fmt in data.formats:
+                    # A null handle asks for WM_RENDERFORMAT on first paste
+                    clipboard.SetClipboardData(
+                        fmt, data.render(fmt) if data.is_rendered(fmt) else 0
+                    )
+            finally:
+                clipboard.CloseClipboard()
+        except Exception as e:
+            self._publish_error = e
+        self._published.set()
+        return 0
+
+    def _on_render_format(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        """Render one format a program is pasting; the clipboard is open."""
+        content = self._content
+        if content is not None and wparam in content.formats:
+            try:
+                self._clipboard.SetClipboardData(wparam, content.render(wparam))
+            except Exception as e:
+                print(f"Failed to render clipboard format {wparam}: {e}")
+        return 0
+
+    def _on_render_all_formats(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        """Render every format before the owner window goes away."""
+        content = self._content
+        if content is None:
+            return 0
+        clipboard = self._clipboard
+        try:
+            clipboard.OpenClipboard(hwnd)
+            try:
+                if clipboard.GetClipboardOwner() == hwnd:
+                    for fmt in content.formats:
+                        clipboard.SetClipboardData(fmt, content.render(fmt))
+            finally:
+                clipboard.CloseClipboard()
+        except Exception as e:
+            print(f"Failed to render clipboard formats: {e}")
+        return 0
+
+    def _on_destroy_clipboard(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        """Drop the content once another program takes the clipboard."""
+        self._content = None
+        return 0
+
+
+class MemoryClipboardBackend(ClipboardBackend):
+    """
+    In-memory clipboard backend for headless use and tests.
+
+    Published formats are rendered only when get() asks for them, the way
+    a paste into another program would.
+    """
+
+    def __init__(self):
+        """Initialize an empty clipboard."""
+        self.formats: Dict[int, bytes] = {}
+        self.content: Optional[ClipboardData] = None
+        self.write_count = 0
+        self._registered: Dict[str, int] = {}
+
+    def set_formats(self, formats: Dict[int, bytes]) -> None:
+        """Replace the in-memory clipboard contents."""
+        self.formats = dict(formats)
+        self.content = None
+        self.write_count += 1
+
+    def register_format(self, name: str) -> int:
+        """Hand out identifiers from the registered format range."""
+        return self._registered.setdefault(
+            name, _FIRST_REGISTERED_FORMAT + len(self._registered)
+        )
+
+    def publish(self, data: ClipboardData) -> None:
+        """Offer formats without rendering any of them."""
+        self.formats = {}
+        self.content = data
+        self.write_count += 1
+
+    def available(self) -> List[int]:
+        """Get the identifiers of every format on the clipboard."""
+        if self.content is not None:
+            return self.content.formats
+        return list(self.formats)
+
+    def get(self, fmt: int) -> Optional[bytes]:
+        """Get the data of a clipboard format, rendering it if needed."""
+        if self.content is not None:
+            if fmt not in self.content.formats:
+                return None
+            return self.content.render(fmt)
+        return self.formats.get(fmt)
+
+
+_default_backend: Optional[ClipboardBackend] = None
+
+
+def get_default_backend() -> ClipboardBackend:
+    """Get the platform clipboard backend, creating it on first use."""
+    global _default_backend
+    if _default_backend is None:
+        _default_backend = Win32ClipboardBackend()
+    return _default_backend
+
+
+def close_default_backend() -> None:
+    """Close the platform backend if it was used, e.g. at exit."""
+    global _default_backend
+    if _default_backend is not None:
+        _default_backend.close()
+        _default_backend = None
+
+
+def clipboard_history_enabled() -> bool:
+    """
+    Check whether Windows clipboard history (Win+V) keeps earlier entries.
+
+    It is off by default and can be turned off by policy; without it every
+    clipboard write replaces the previous one.
+
+    Returns:
+        True if history is on, False if it is off or cannot be read
+    """
+    if sys.platform != "win32":
+        return False
+    import winreg
+
+    def read(root: int, path: str, name: str) -> Optional[int]:
+        try:
+            with winreg.OpenKey(root, path) as key:
+                return winreg.QueryValueEx(key, name)[0]
+        except OSError:
+            return None
+
+    policy = read(
+        winreg.HKEY_LOCAL_MACHINE,
+        r"SOFTWARE\Policies\Microsoft\Windows\System",
+        "AllowClipboardHistory"
+    )
+    if policy == 0:
+        return False
+    return bool(read(
+        winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Clipboard", "EnableClipboardHistory"
+    ))
+
+
+def _encode_png(image: Image.Image) -> bytes:
+    """Encode an image as PNG for the clipboard."""
+    buffer = BytesIO()
+    image.save(buffer, "PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+def _dib_matches(dib: bytes, frame: Frame) -> bool:
+    """Whether a CF_DIB has the header and size frame_to_dib() gives the frame."""
+    size = BITMAPINFOHEADER_SIZE + dib_stride(frame.width) * frame.height
+    return (
+        len(dib) == size
+        and dib[:BITMAPINFOHEADER_SIZE] == dib_header(frame.width, frame.height)
+    )
+
+
+def frame_clipboard_data(
+    frame: Frame,
+    backend: ClipboardBackend,
+    dib: Optional[bytes] = None,
+    on_render: Optional[Callable[[int, bytes], None]] = None
+) -> ClipboardData:
+    """
+    Offer a raw BGRA frame as CF_DIB, CF_DIBV5 and PNG.
+
+    A frame that is a view into a larger grab is copied first, so the
+    clipboard does not keep the whole grab alive.
+
+    A prebuilt dib is offered as is next to the other formats, which are
+    rendered from the frame, so it must hold exactly the frame's pixels,
+    e.g. from frame_to_dib() or a cache keyed on the pixel content. One
+    whose header or size does not match the frame is ignored.
 
     Args:
-        image: PIL Image object to copy
+        frame: Frame to offer
+        backend: Backend the PNG format is registered with
+        dib: CF_DIB already built from the frame's pixels, if any
+        on_render: Called with the format and data after each render
 
     Returns:
-        True if successful, False otherwise
+        ClipboardData rendering each format on demand
     """
-    try:
-        import win32clipboard
-        from io import BytesIO
+    if dib is not None and not _dib_matches(dib, frame):
+        print("Ignoring a prebuilt CF_DIB that does not match the frame")
+        dib = None
+
+    if memoryview(frame.buffer).nbytes > frame.width * frame.height * 4:
+        frame = Frame(frame.tobytes(), frame.left, frame.top, frame.width, frame.height)
+
+    return ClipboardData(
+        {
+            CF_DIB: lambda: frame_to_dib(frame),
+            CF_DIBV5: lambda: frame_to_dibv5(frame),
+            backend.register_format(PNG_FORMAT_NAME): lambda: encode_png(frame, PNG_COMPRESS_LEVEL),
+        },
+        rendered={CF_DIB: dib} if dib is not None else None,
+        on_render=on_render
+    )
 
-        # Convert to BMP format for clipboard
-        output = BytesIO()
 
-        # Convert to RGB if necessary (clipboard doesn't support alpha)
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+def image_clipboard_data(image: Image.Image, backend: ClipboardBackend) -> ClipboardData:
+    """
+    Offer a PIL Image as CF_DIB, CF_DIBV5 and PNG, keeping its alpha.
 
-        # Save as BMP
-        image.save(output, format='BMP')
-        bmp_data = output.getvalue()[14:]  # Remove BMP file header (14 bytes)
-        output.close()
+    Args:
+        image: Image to offer
+        backend: Backend the PNG format is registered with
 
-        # Copy to clipboard
-        win32clipboard.OpenClipboard()
-        win32clipboard.EmptyClipboard()
-        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, bmp_data)
-        win32clipboard.CloseClipboard()
+    Returns:
+        ClipboardData rendering each format on demand
+    """
+    return ClipboardData({
+        CF_DIB: lambda: image_to_dib(image),
+        CF_DIBV5: lambda: image_to_dibv5(image),
+        backend.register_format(PNG_FORMAT_NAME): lambda: _encode_png(image),
+    })
 
+
+def _publish(
+    build_data: Callable[[ClipboardBackend], ClipboardData],
+    backend: Optional[ClipboardBackend]
+) -> bool:
+    """Build clipboard data and publish it, reporting failures."""
+    try:
+        if backend is None:
+            backend = get_default_backend()
+        backend.publish(build_data(backend))
         return True
 
     except ImportError:
@@ -44,3 +513,63 @@ def copy_image_to_clipboard(image: Image.Image) -> bool:
     except Exception as e:
         print(f"Failed to copy to clipboard: {e}")
         return False
+
+
+def copy_image_to_clipboard(
+    image: Image.Image,
+    backend: Optional[ClipboardBackend] = None
+) -> bool:
+    """
+    Copy a PIL Image to the Windows clipboard.
+
+    Args:
+        image: PIL Image object to copy
+        backend: Clipboard backend (defaults to the Windows clipboard)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return _publish(lambda b: image_clipboard_data(image, b), backend)
+
+
+def copy_dib_to_clipboard(
+    dib: bytes,
+    backend: Optional[ClipboardBackend] = None
+) -> bool:
+    """
+    Copy an already built CF_DIB to the Windows clipboard.
+
+    Args:
+        dib: BITMAPINFOHEADER followed by the pixel rows
+        backend: Clipboard backend (defaults to the Windows clipboard)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return _publish(lambda b: ClipboardData({}, rendered={CF_DIB: dib}), backend)
+
+
+def copy_frame_to_clipboard(
+    frame: Frame,
+    backend: Optional[ClipboardBackend] = None,
+    dib: Optional[bytes] = None,
+    on_render: Optional[Callable[[int, bytes], None]] = None
+) -> bool:
+    """
+    Copy a raw BGRA frame to the Windows clipboard.
+
+    The formats are built straight from the frame buffer, without going
+    through a PIL image for the DIBs, and only when pasted.
+
+    Args:
+        frame: Frame to copy
+        backend: Clipboard backend (defaults to the Windows clipboard)
+        dib: CF_DIB already built for the frame, if any
+        on_render: Called with the format and data after each render
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return _publish(
+        lambda b: frame_clipboard_data(frame, b, dib, on_render), backend
+    )
@@ -0,0 +1,294 @@
+"""Device-independent bitmap (CF_DIB and CF_DIBV5) builders."""
+
+import struct
+from typing import Sequence, Tuple
+
+from PIL import Image
+
+from core.frame import Frame
+from core.startup import optional_module
+
+# NumPy is optional, fall back to slice copies; imported on first use
+np = optional_module("numpy")
+
+
+BITMAPINFOHEADER_SIZE = 40
+BITMAPV5HEADER_SIZE = 124
+
+# BITMAPV5HEADER fields for 32-bit sRGB pixels with straight alpha
+BI_BITFIELDS = 3
+LCS_SRGB = 0x73524742  # 'sRGB'
+LCS_GM_IMAGES = 4
+BGRA_MASKS = (0x00FF0000, 0x0000FF00, 0x000000FF, 0xFF000000)
+
+# 96 DPI in pixels per metre, the same default PIL's BMP encoder writes
+DEFAULT_DPI = (96, 96)
+
+
+def dib_stride(width: int, bits: int = 24) -> int:
+    """Get the 4-byte aligned size of one DIB row in bytes."""
+    return ((width * bits + 7) // 8 + 3) & ~3
+
+
+def dib_header(
+    width: int,
+    height: int,
+    bits: int = 24,
+    dpi: Tuple[float, float] = DEFAULT_DPI
+) -> bytes:
+    """
+    Build a BITMAPINFOHEADER for a bottom-up, uncompressed DIB.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        bits: Bits per pixel
+        dpi: Horizontal and vertical resolution
+
+    Returns:
+        The 40-byte header
+    """
+    ppm = tuple(int(x * 39.3701 + 0.5) for x in dpi)
+    return struct.pack(
+        "<IiiHHIIiiII",
+        BITMAPINFOHEADER_SIZE,
+        width,
+        height,
+        1,  # planes
+        bits,
+        0,  # BI_RGB
+        dib_stride(width, bits) * height,
+        ppm[0],
+        ppm[1],
+        0,  # colors used
+        0   # colors important
+    )
+
+
+def dibv5_header(
+    width: int,
+    height: int,
+    dpi: Tuple[float, float] = DEFAULT_DPI
+) -> bytes:
+    """
+    Build a BITMAPV5HEADER for a bottom-up, 32-bit BGRA DIB with alpha.
+
+    Args:
+        width: Image width in pixels
+        height: Image height in pixels
+        dpi: Horizontal and vertical resolution
+
+    Returns:
+        The 124-byte header
+    """
+    ppm = tuple(int(x * 39.3701 + 0.5) for x in dpi)
+    return struct.pack(
+        "<IiiHHIIiiII4II36x3I4I",
+        BITMAPV5HEADER_SIZE,
+        width,
+        height,
+        1,  # planes
+        32,
+        BI_BITFIELDS,
+        width * 4 * height,
+        ppm[0],
+        ppm[1],
+        0,  # colors used
+        0,  # colors important
+        *BGRA_MASKS,
+        LCS_SRGB,
+        0, 0, 0,  # gamma, unused for sRGB
+        LCS_GM_IMAGES,
+        0,  # profile data
+        0,  # profile size
+        0   # reserved
+    )
+
+
+def frame_to_dib(frame: Frame) -> bytes:
+    """
+    Build a 24-bit CF_DIB directly from a raw BGRA frame.
+
+    Rows are written bottom-up straight into the output buffer with NumPy,
+    skipping the PIL image and BMP file round trip. Without NumPy, PIL's
+    raw codecs do the flip and channel swap without a BMP file.
+
+    Args:
+        frame: Frame to convert
+
+    Returns:
+        BITMAPINFOHEADER followed by the pixel rows
+    """
+    width, height = frame.width, frame.height
+    stride = dib_stride(width)
+
+    if np is None:
+        # Decode bottom-up so the rows come out in DIB order
+        image = Image.frombuffer(
+            "RGB", (width, height), memoryview(frame.buffer)[frame.offset:],
+            "raw", "BGRX", frame.stride, -1
+        )
+        return dib_header(width, height) + image.tobytes("raw", "BGR", stride, 1)
+
+    out = bytearray(BITMAPINFOHEADER_SIZE + stride * height)
+    out[:BITMAPINFOHEADER_SIZE] = dib_header(width, height)
+    _fill_rows_numpy(frame, out, stride, BITMAPINFOHEADER_SIZE)
+    return out
+
+
+def frame_dib_rows(frame: Frame, width: int, background: int = 0xFF) -> bytes:
+    """
+    Build the bottom-up 24-bit DIB rows of a frame inside a wider image.
+
+    Args:
+        frame: Frame to convert
+        width: Width of the image the rows belong to, at least frame.width
+        background: Byte value of every channel right of the frame
+
+    Returns:
+        dib_stride(width) * frame.height bytes, without a header
+    """
+    stride = dib_stride(width)
+
+    if np is None:
+        image = Image.frombuffer(
+            "RGB", frame.size, memoryview(frame.buffer)[frame.offset:],
+            "raw", "BGRX", frame.stride, -1
+        )
+        if frame.width < width:
+            canvas = Image.new("RGB", (width, frame.height), (background,) * 3)
+            canvas.paste(image, (0, 0))
+            image = canvas
+        return image.tobytes("raw", "BGR", stride, 1)
+
+    out = bytearray(stride * frame.height)
+    if frame.width < width:
+        rows = np.frombuffer(out, dtype=np.uint8).reshape(frame.height, stride)
+        rows[:, frame.width * 3:width * 3] = background
+    _fill_rows_numpy(frame, out, stride, 0)
+    return out
+
+
+def stack_dibs(
+    parts: Sequence[bytes],
+    width: int,
+    gap: int = 0,
+    background: int = 0xFF
+) -> bytes:
+    """
+    Build a CF_DIB of row blocks stacked top to bottom, like stack_frames.
+
+    The blocks can be converted concurrently with frame_dib_rows; joining
+    them is a single copy.
+
+    Args:
+        parts: Rows of each block from frame_dib_rows, top block first
+        width: Image width the blocks were built for
+        gap: Rows of background between two blocks
+        background: Byte value of every channel of the gap rows
+
+    Returns:
+        BITMAPINFOHEADER followed by the pixel rows
+    """
+    stride = dib_stride(width)
+    gap_row = bytes([background]) * (width * 3) + bytes(stride - width * 3)
+    height = sum(len(part) for part in parts) // stride + gap * (len(parts) - 1)
+    # DIB rows run bottom-up, so the last block comes first
+    return dib_header(width, height) + (gap_row * gap).join(reversed(parts))
+
+
+def _fill_rows_numpy(frame: Frame, out: bytearray, stride: int, offset: int) -> None:
+    """Copy BGRA rows into bottom-up BGR DIB rows with NumPy strided views."""
+    width, height = frame.width, frame.height
+    as_strided = np.lib.stride_tricks.as_strided
+
+    src = np.frombuffer(
+        frame.buffer, dtype=np.uint8,
+        count=frame.stride * (height - 1) + width * 4,
+        offset=frame.offset
+    )
+    src = as_strided(src, (height, width, 4), (frame.stride, 4, 1))[::-1]
+
+    dst = np.frombuffer(out, dtype=np.uint8, offset=offset)
+    dst = as_strided(dst, (height, width, 3), (stride, 3, 1))
+
+    # One strided copy per channel is several times faster than copying
+    # (height, width, 3) blocks, where NumPy's inner loop is only 3 long
+    for channel in range(3):
+        dst[:, :, channel] = src[:, :, channel]
+
+
+def frame_to_dibv5(frame: Frame) -> bytes:
+    """
+    Build a 32-bit CF_DIBV5 directly from a raw BGRA frame.
+
+    Screen grabs carry no meaningful alpha, so every pixel is made opaque.
+
+    Args:
+        frame: Frame to convert
+
+    Returns:
+        BITMAPV5HEADER followed by the pixel rows
+    """
+    width, height = frame.width, frame.height
+
+    if np is None:
+        image = Image.frombuffer(
+            "RGB", (width, height), memoryview(frame.buffer)[frame.offset:],
+            "raw", "BGRX", frame.stride, -1
+        )
+        return dibv5_header(width, height) + image.convert("RGBA").tobytes("raw", "BGRA")
+
+    out = bytearray(BITMAPV5HEADER_SIZE + width * 4 * height)
+    out[:BITMAPV5HEADER_SIZE] = dibv5_header(width, height)
+
+    src = np.frombuffer(
+        frame.buffer, dtype=np.uint32,
+        count=(frame.stride // 4) * (height - 1) + width,
+        offset=frame.offset
+    )
+    src = np.lib.stride_tricks.as_strided(
+        src, (height, width), (frame.stride, 4)
+    )[::-1]
+    dst = np.frombuffer(out, dtype=np.uint32, offset=BITMAPV5HEADER_SIZE)
+    np.bitwise_or(src, np.uint32(0xFF000000), out=dst.reshape(height, width))
+    return out
+
+
+def image_to_dibv5(image: Image.Image) -> bytes:
+    """
+    Build a 32-bit CF_DIBV5 from a PIL Image, keeping its transparency.
+
+    Args:
+        image: PIL Image object
+
+    Returns:
+        BITMAPV5HEADER followed by the pixel rows
+    """
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+
+    width, height = image.size
+    header = dibv5_header(width, height, dpi=image.info.get("dpi", DEFAULT_DPI))
+    return header + image.tobytes("raw", "BGRA", 0, -1)
+
+
+def image_to_dib(image: Image.Image) -> bytes:
+    """
+    Build a 24-bit CF_DIB from a PIL Image.
+
+    Uses PIL's raw encoder with a padded stride and bottom-up orientation,
+    producing the same bytes as a saved BMP minus its 14-byte file header.
+
+    Args:
+        image: PIL Image object
+
+    Returns:
+        BITMAPINFOHEADER followed by the pixel rows
+    """
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    width, height = image.size
+    header = dib_header(width, height, dpi=image.info.get("dpi", DEFAULT_DPI))
+    return header + image.tobytes("raw", "BGR", dib_stride(width), -1)